@@ -0,0 +1,86 @@
+"""
+이미지 검사 벤치마크 - 기존 3회 파싱 경로 vs 단일 파싱 검사기
+
+12MP(4032x3024) 휴대폰 사진과 비슷한 EXIF/GPS 포함 JPEG를 만들어
+  - legacy: validate_image_content(verify) + extract_exif_data + process_image_metadata
+  - inspect: inspect_image (헤더 1회 파싱)
+  - pil_exif: Image.open + _getexif  vs  read_exif: 마커 스캔 헤더 전용 리더
+를 전체 파일과 스트리밍 업로드의 헤더 버퍼(UPLOAD_HEAD_BYTES)에 대해 비교합니다.
+
+    cd api && python -m benchmarks.image_inspection [iterations]
+"""
+import io
+import sys
+import time
+
+from PIL import Image
+
+from config import settings
+from utils.exif_processor import exif_processor
+from utils.exif_reader import read_exif
+from utils.image_inspector import inspect_image
+from utils.validators import validate_image_content
+
+WIDTH, HEIGHT = 4032, 3024
+
+
+def phone_jpeg() -> bytes:
+    # 그라디언트 + 노이즈로 실제 사진과 비슷한 압축률(수 MB)을 만듦
+    gradient = Image.linear_gradient('L').resize((WIDTH, HEIGHT))
+    noise = Image.effect_noise((WIDTH, HEIGHT), 24)
+    image = Image.merge('RGB', (gradient, noise, Image.blend(gradient, noise, 0.5)))
+
+    exif = Image.Exif()
+    exif[0x010F] = 'samsung'
+    exif[0x0110] = 'SM-S918N'
+    exif[0x0112] = 6
+    exif[0x0132] = '2024:05:01 14:32:10'
+    exif[0x8769] = {0x829A: 1 / 120, 0x829D: 1.8, 0x8827: 50}
+    exif[0x8825] = {1: 'N', 2: (37.0, 34.0, 46.56), 3: 'E', 4: (126.0, 58.0, 37.2)}
+
+    buffer = io.BytesIO()
+    image.save(buffer, 'JPEG', quality=90, exif=exif.tobytes())
+    return buffer.getvalue()
+
+
+def legacy(data: bytes) -> None:
+    validate_image_content(data)
+    exif_processor.extract_exif_data(data)
+    exif_processor.process_image_metadata(data)
+
+
+def pil_exif(data: bytes) -> None:
+    Image.open(io.BytesIO(data))._getexif()
+
+
+def measure(name: str, call, data: bytes, iterations: int) -> float:
+    call(data)
+    start = time.perf_counter()
+    for _ in range(iterations):
+        call(data)
+    elapsed = (time.perf_counter() - start) / iterations * 1000
+    print(f"{name:<18} {len(data) / 1024:9.0f} KB {elapsed:9.3f} ms/image")
+    return elapsed
+
+
+def main(iterations: int) -> None:
+    data = phone_jpeg()
+    head = data[:settings.UPLOAD_HEAD_BYTES]
+
+    inspection = inspect_image(data)
+    print(f"{inspection['width']}x{inspection['height']} orientation={inspection['orientation']} "
+          f"gps={inspection['gps_coordinates']}")
+
+    for label, payload in (('full', data), ('head', head)):
+        before = measure(f"legacy/{label}", legacy, payload, iterations) if label == 'full' else None
+        after = measure(f"inspect/{label}", inspect_image, payload, iterations)
+        if before:
+            print(f"{'':<18} {before / after:.1f}x faster")
+
+    before = measure("pil_exif/full", pil_exif, data, iterations)
+    after = measure("read_exif/full", read_exif, data, iterations)
+    print(f"{'':<18} {before / after:.1f}x faster")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
@@ -0,0 +1,105 @@
+"""
+업스트림 호출 동시성 벤치마크
+
+Naver/Kakao/Google Vision 클라이언트를 고정 지연(기본 100ms)을 가진 가짜 업스트림에 연결하고
+동시 요청 수를 늘려가며 처리량을 측정합니다. 논블로킹 클라이언트라면 처리량이
+동시 요청 수에 비례해 증가해야 합니다. (동기 호출이라면 동시 요청 수와 무관하게 ~10 req/s)
+업스트림 거버너의 쿼터/동시성 한도는 커넥션 풀 처리량만 측정하도록 충분히 크게 바꿉니다.
+
+    cd api && python -m benchmarks.upstream_concurrency [latency_ms]
+"""
+import asyncio
+import io
+import sys
+import time
+
+import httpx
+from PIL import Image
+
+from services.http_client_service import http_clients
+from services.kakao_service import kakao_service
+from services.naver_service import naver_service
+from services.upstream_governor_service import UpstreamPolicy, upstream_governor
+from services.vision_service import GoogleVisionService
+
+NAVER_REVERSE = {
+    'status': {'code': 0, 'name': 'ok'},
+    'results': [{
+        'name': 'roadaddr',
+        'region': {'area1': {'name': '서울특별시'}, 'area2': {'name': '종로구'}, 'area3': {'name': '세종로'}},
+        'land': {'name': '사직로', 'number1': '161'}
+    }]
+}
+NAVER_SEARCH = {'items': [{'title': '<b>경복궁</b>', 'address': '서울특별시 종로구 세종로 1-1', 'category': '고궁'}]}
+KAKAO_ADDRESS = {'documents': [{'address': {'address_name': '서울 종로구 세종로 1-1', 'region_3depth_name': '세종로'}}]}
+KAKAO_SEARCH = {'documents': [{'place_name': '경복궁', 'address_name': '서울 종로구 세종로 1-1', 'category_name': '고궁'}]}
+VISION = {'responses': [{'textAnnotations': [{'description': 'all'}, {'description': '경복궁'}]}]}
+
+
+def sample_jpeg() -> bytes:
+    """비전 API 파생본 생성이 통과하는 작은 JPEG (이미 제공자 한도 이내라 재인코딩 없음)"""
+    buffer = io.BytesIO()
+    Image.new('RGB', (640, 480), (200, 200, 200)).save(buffer, 'JPEG')
+    return buffer.getvalue()
+
+
+def fake_upstream(latency: float) -> httpx.MockTransport:
+    async def handler(request: httpx.Request) -> httpx.Response:
+        await asyncio.sleep(latency)
+        path = request.url.path
+
+        if 'reversegeocode' in path:
+            return httpx.Response(200, json=NAVER_REVERSE)
+        if 'search/local' in path:
+            return httpx.Response(200, json=NAVER_SEARCH)
+        if 'coord2address' in path:
+            return httpx.Response(200, json=KAKAO_ADDRESS)
+        if '/search/' in path:
+            return httpx.Response(200, json=KAKAO_SEARCH)
+        if 'images:annotate' in path:
+            return httpx.Response(200, json=VISION)
+        return httpx.Response(404)
+
+    return httpx.MockTransport(handler)
+
+
+async def measure(name: str, call, concurrency: int, total: int) -> None:
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def one():
+        async with semaphore:
+            await call()
+
+    start = time.perf_counter()
+    await asyncio.gather(*(one() for _ in range(total)))
+    elapsed = time.perf_counter() - start
+
+    print(f"{name:<14} concurrency={concurrency:<4} {total / elapsed:8.1f} req/s ({elapsed:.2f}s)")
+
+
+async def main(latency_ms: float) -> None:
+    transport = fake_upstream(latency_ms / 1000)
+    for upstream in ('naver_maps', 'naver_search', 'kakao_local', 'google_vision'):
+        http_clients._clients[upstream] = httpx.AsyncClient(transport=transport)
+    for name in upstream_governor.policies:
+        upstream_governor.policies[name] = UpstreamPolicy(
+            name, {'rate': 1e6, 'burst': 1e6, 'max_concurrency': 1024, 'latency_target': 60.0}
+        )
+
+    vision = GoogleVisionService(api_key='benchmark')
+    image = sample_jpeg()
+    calls = {
+        'naver': lambda: naver_service.get_place_by_coordinates(37.5796, 126.9770),
+        'kakao': lambda: kakao_service.get_place_by_coordinates(37.5796, 126.9770),
+        'google_vision': lambda: vision.extract_korean_text(image),
+    }
+
+    for name, call in calls.items():
+        for concurrency in (1, 8, 32, 128):
+            await measure(name, call, concurrency, total=max(concurrency * 4, 16))
+
+    await http_clients.close()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 100))
@@ -0,0 +1,292 @@
+"""
+업스트림 대역(stand-in) 서버 - 오프라인 부하 테스트용 녹화/재생
+
+services/ 에서 호출하는 모든 업스트림(Naver, Kakao, CHA, KTO, OpenRestroom, Google Vision)을
+한 프로세스에서 흉내냅니다. 요청 경로는 "/{원래 호스트}/{원래 경로}" 형식이며,
+UPSTREAM_STANDIN_URL 설정 시 HTTP 클라이언트 레지스트리가 URL을 이 형식으로 바꿔 보냅니다.
+
+  - 재생(기본): fixtures 에 녹화된 응답 -> 없으면 내장 기본 응답을 반환
+  - 녹화(--record): 실제 업스트림으로 프록시하고 응답을 fixtures 에 저장
+  - 프로필(--profile): 호스트별 지연 분포(로그정규), 오류율, 초당 허용 요청 수(초과 시 429)
+
+    cd api && python -m benchmarks.upstream_standin [--port 9100] [--record] [--profile profile.json]
+    UPSTREAM_STANDIN_URL=http://127.0.0.1:9100 uvicorn main:app
+
+프로필 예시:
+    {"default": {"latency_ms": 80, "latency_sigma": 0.5, "error_rate": 0.0, "rate_limit": 0},
+     "dapi.kakao.com": {"latency_ms": 40, "rate_limit": 30}}
+"""
+import argparse
+import asyncio
+import hashlib
+import json
+import logging
+import math
+import os
+import random
+import time
+from collections import defaultdict
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+from fastapi import FastAPI, Request, Response
+
+logger = logging.getLogger(__name__)
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'fixtures')
+
+# 녹화 시 https가 아닌 업스트림
+HTTP_ONLY_HOSTS = {'www.cha.go.kr'}
+
+# 녹화 키와 fixtures 에서 제외할 인증 파라미터
+SECRET_PARAMS = {'key', 'serviceKey', 'client_id', 'client_secret'}
+
+DEFAULT_PROFILE = {'latency_ms': 80.0, 'latency_sigma': 0.5, 'error_rate': 0.0, 'rate_limit': 0}
+
+# 녹화된 응답이 없을 때 사용하는 경로별 기본 응답 (content_type, body)
+DEFAULT_RESPONSES: Dict[str, Tuple[str, str]] = {
+    'map-reversegeocode/v2/gc': ('application/json', json.dumps({
+        'status': {'code': 0, 'name': 'ok'},
+        'results': [{
+            'name': 'roadaddr',
+            'region': {'area1': {'name': '서울특별시'}, 'area2': {'name': '종로구'}, 'area3': {'name': '세종로'}},
+            'land': {'name': '사직로', 'number1': '161'}
+        }]
+    }, ensure_ascii=False)),
+    'map-geocode/v2/geocode': ('application/json', json.dumps({
+        'status': 'OK',
+        'addresses': [{'roadAddress': '서울특별시 종로구 사직로 161', 'x': '126.9770', 'y': '37.5796'}]
+    }, ensure_ascii=False)),
+    'v1/search/local.json': ('application/json', json.dumps({
+        'items': [{
+            'title': '<b>경복궁</b>', 'address': '서울특별시 종로구 세종로 1-1',
+            'roadAddress': '서울특별시 종로구 사직로 161', 'category': '고궁',
+            'mapx': '1269770000', 'mapy': '375796000'
+        }]
+    }, ensure_ascii=False)),
+    'v2/local/geo/coord2address.json': ('application/json', json.dumps({
+        'documents': [{'address': {'address_name': '서울 종로구 세종로 1-1', 'region_3depth_name': '세종로'}}]
+    }, ensure_ascii=False)),
+    'v2/local/search/': ('application/json', json.dumps({
+        'documents': [{
+            'place_name': '경복궁', 'address_name': '서울 종로구 세종로 1-1', 'category_name': '고궁',
+            'x': '126.9770', 'y': '37.5796', 'distance': '120'
+        }]
+    }, ensure_ascii=False)),
+    'cha/SearchKindOpenapiList.do': ('application/xml', (
+        '<?xml version="1.0" encoding="UTF-8"?><result><item>'
+        '<ccbaMnm1>경복궁</ccbaMnm1><ccbaLcad>서울특별시 종로구 사직로 161</ccbaLcad>'
+        '<ccbaAsdt>19630121</ccbaAsdt><ccmaName>사적</ccmaName>'
+        '</item></result>'
+    )),
+    'B551011/KorService1/': ('application/json', json.dumps({
+        'response': {'body': {'items': {'item': [{'title': '경복궁', 'overview': '조선 왕조의 법궁'}]}}}
+    }, ensure_ascii=False)),
+    'api/v1/restrooms': ('application/json', json.dumps([{
+        'id': 1, 'name': '광화문광장 공중화장실', 'street': '세종대로 172',
+        'latitude': 37.5720, 'longitude': 126.9769, 'accessible': True, 'unisex': True,
+        'changing_table': False
+    }], ensure_ascii=False)),
+    'v1/images:annotate': ('application/json', json.dumps({
+        'responses': [{'textAnnotations': [{'description': '경복궁'}, {'description': '경복궁'}]}]
+    }, ensure_ascii=False)),
+}
+
+
+class FixtureStore:
+    """
+    (호스트, 경로)별 JSON 파일에 요청 키 -> 응답을 보관
+    """
+
+    def __init__(self, root: str):
+        self.root = root
+        self._files: Dict[Tuple[str, str], Dict[str, Any]] = {}
+
+    @staticmethod
+    def request_key(method: str, params: Dict[str, str], body: bytes) -> str:
+        public = sorted((k, v) for k, v in params.items() if k not in SECRET_PARAMS)
+        digest = hashlib.sha1(f"{method} {public}".encode('utf-8'))
+        digest.update(body)
+        return digest.hexdigest()[:16]
+
+    def _path(self, host: str, path: str) -> str:
+        slug = path.strip('/').replace('/', '__').replace(':', '_') or 'root'
+        if not slug.endswith('.json'):
+            slug += '.json'
+        return os.path.join(self.root, host, slug)
+
+    def _entries(self, host: str, path: str) -> Dict[str, Any]:
+        if (host, path) not in self._files:
+            file_path = self._path(host, path)
+            entries = {}
+            if os.path.exists(file_path):
+                with open(file_path, 'r', encoding='utf-8') as f:
+                    entries = json.load(f)
+            self._files[(host, path)] = entries
+        return self._files[(host, path)]
+
+    def lookup(self, host: str, path: str, key: str) -> Optional[Dict[str, Any]]:
+        entries = self._entries(host, path)
+        # 정확히 같은 요청이 없으면 같은 경로의 아무 녹화본이나 사용
+        return entries.get(key) or next(iter(entries.values()), None)
+
+    def save(self, host: str, path: str, key: str, entry: Dict[str, Any]) -> None:
+        entries = self._entries(host, path)
+        entries[key] = entry
+
+        file_path = self._path(host, path)
+        os.makedirs(os.path.dirname(file_path), exist_ok=True)
+        with open(file_path, 'w', encoding='utf-8') as f:
+            json.dump(entries, f, ensure_ascii=False, indent=2)
+
+
+class HostBehaviour:
+    """
+    호스트별 지연/오류/스로틀 시뮬레이션
+    """
+
+    def __init__(self, profile: Dict[str, Any]):
+        self.latency = float(profile.get('latency_ms', DEFAULT_PROFILE['latency_ms'])) / 1000
+        self.sigma = float(profile.get('latency_sigma', DEFAULT_PROFILE['latency_sigma']))
+        self.error_rate = float(profile.get('error_rate', DEFAULT_PROFILE['error_rate']))
+        self.rate_limit = int(profile.get('rate_limit', DEFAULT_PROFILE['rate_limit']))
+        self._window = 0
+        self._window_count = 0
+
+    def sample_latency(self) -> float:
+        # 중앙값이 latency 인 로그정규 분포 (sigma가 클수록 꼬리 지연이 길어짐)
+        return self.latency * math.exp(self.sigma * random.gauss(0, 1))
+
+    def throttled(self) -> bool:
+        if self.rate_limit <= 0:
+            return False
+
+        window = int(time.monotonic())
+        if window != self._window:
+            self._window = window
+            self._window_count = 0
+
+        self._window_count += 1
+        return self._window_count > self.rate_limit
+
+    def failed(self) -> bool:
+        return random.random() < self.error_rate
+
+
+def _default_response(path: str) -> Optional[Tuple[str, str]]:
+    for pattern, response in DEFAULT_RESPONSES.items():
+        if pattern in path:
+            return response
+    return None
+
+
+def create_app(fixtures_dir: str = FIXTURES_DIR, profile: Optional[Dict[str, Any]] = None,
+               record: bool = False) -> FastAPI:
+    profile = profile or {}
+    default_profile = {**DEFAULT_PROFILE, **profile.get('default', {})}
+    behaviours: Dict[str, HostBehaviour] = {}
+    store = FixtureStore(fixtures_dir)
+    stats: Dict[str, Dict[str, int]] = defaultdict(lambda: defaultdict(int))
+    app = FastAPI(title="Upstream stand-in")
+    app.state.upstream = httpx.AsyncClient(timeout=30.0) if record else None
+
+    def behaviour_for(host: str) -> HostBehaviour:
+        if host not in behaviours:
+            behaviours[host] = HostBehaviour({**default_profile, **profile.get(host, {})})
+        return behaviours[host]
+
+    @app.get("/_standin/stats")
+    async def standin_stats():
+        return {host: dict(counts) for host, counts in stats.items()}
+
+    @app.api_route("/{host}/{path:path}", methods=["GET", "POST"])
+    async def replay(host: str, path: str, request: Request):
+        body = await request.body()
+        params = dict(request.query_params)
+        key = store.request_key(request.method, params, body)
+        stats[host]['requests'] += 1
+
+        if record:
+            return await _record(host, path, key, request, body)
+
+        behaviour = behaviour_for(host)
+        if behaviour.throttled():
+            stats[host]['throttled'] += 1
+            return Response(status_code=429, content='{"error": "rate limited"}', media_type='application/json')
+
+        await asyncio.sleep(behaviour.sample_latency())
+
+        if behaviour.failed():
+            stats[host]['errors'] += 1
+            return Response(status_code=503, content='{"error": "injected failure"}', media_type='application/json')
+
+        entry = store.lookup(host, path, key)
+        if entry is not None:
+            stats[host]['replayed'] += 1
+            return Response(status_code=entry['status'], content=entry['body'], media_type=entry['content_type'])
+
+        default = _default_response(path)
+        if default is not None:
+            stats[host]['defaulted'] += 1
+            return Response(status_code=200, content=default[1], media_type=default[0])
+
+        stats[host]['missing'] += 1
+        return Response(status_code=404, content='{"error": "no fixture"}', media_type='application/json')
+
+    async def _record(host: str, path: str, key: str, request: Request, body: bytes) -> Response:
+        scheme = 'http' if host in HTTP_ONLY_HOSTS else 'https'
+        headers = {
+            name: value for name, value in request.headers.items()
+            if name.lower() not in ('host', 'content-length', 'accept-encoding', 'connection')
+        }
+
+        upstream_response = await app.state.upstream.request(
+            request.method, f"{scheme}://{host}/{path}",
+            params=request.query_params, headers=headers, content=body
+        )
+        content_type = upstream_response.headers.get('content-type', 'application/json').split(';')[0]
+
+        if upstream_response.status_code < 500:
+            store.save(host, path, key, {
+                'status': upstream_response.status_code,
+                'content_type': content_type,
+                'body': upstream_response.text
+            })
+            stats[host]['recorded'] += 1
+
+        return Response(
+            status_code=upstream_response.status_code,
+            content=upstream_response.content,
+            media_type=content_type
+        )
+
+    @app.on_event("shutdown")
+    async def close_upstream():
+        if app.state.upstream is not None:
+            await app.state.upstream.aclose()
+
+    return app
+
+
+def main() -> None:
+    import uvicorn
+
+    parser = argparse.ArgumentParser(description="Upstream record/replay stand-in server")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=9100)
+    parser.add_argument('--fixtures', default=FIXTURES_DIR)
+    parser.add_argument('--profile', help="JSON file with per-host latency/error/throttle settings")
+    parser.add_argument('--record', action='store_true', help="proxy to real upstreams and save fixtures")
+    args = parser.parse_args()
+
+    profile = None
+    if args.profile:
+        with open(args.profile, 'r', encoding='utf-8') as f:
+            profile = json.load(f)
+
+    app = create_app(args.fixtures, profile, record=args.record)
+    uvicorn.run(app, host=args.host, port=args.port, log_level='warning')
+
+
+if __name__ == "__main__":
+    main()
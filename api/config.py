@@ -22,6 +22,41 @@ class Settings:
     # But we keep this for potential future authentication
     OPENRESTROOM_API_KEY = os.getenv("OPENRESTROOM_API_KEY", "")
     
+    # Public restroom catalog (공공데이터포털 전국공중화장실표준데이터, CSV or JSON)
+    RESTROOM_DATA_PATH = os.getenv("RESTROOM_DATA_PATH", "data/restrooms.json")
+    RESTROOM_INDEX_CELL_SIZE = float(os.getenv("RESTROOM_INDEX_CELL_SIZE", "0.01"))  # degrees (~1km)
+    
+    # Geocoding cache
+    GEOCODE_CACHE_PRECISION = int(os.getenv("GEOCODE_CACHE_PRECISION", "4"))  # decimal places (~11m)
+    GEOCODE_CACHE_SIZE = int(os.getenv("GEOCODE_CACHE_SIZE", "10000"))
+    GEOCODE_CACHE_TTL = int(os.getenv("GEOCODE_CACHE_TTL", "86400"))  # seconds
+    GEOCODE_MAX_CONCURRENCY = int(os.getenv("GEOCODE_MAX_CONCURRENCY", "8"))
+    GEOCODE_BATCH_WINDOW_MS = float(os.getenv("GEOCODE_BATCH_WINDOW_MS", "5"))  # micro-batch gather window
+    GEOCODE_BATCH_MAX_SIZE = int(os.getenv("GEOCODE_BATCH_MAX_SIZE", "100"))
+    GEOCODE_STRATEGY = os.getenv("GEOCODE_STRATEGY", "ordered")  # "ordered" (by health/latency) or "race"
+    GEOCODE_PROVIDERS = os.getenv("GEOCODE_PROVIDERS", "naver,kakao")  # tie-break order
+    HERITAGE_MAX_GEOCODES = int(os.getenv("HERITAGE_MAX_GEOCODES", "60"))  # per heritage search, highest-priority categories first
+    
+    # Kakao place search cache (category/keyword, geohash cell, radius)
+    KAKAO_CACHE_GEOHASH_PRECISION = int(os.getenv("KAKAO_CACHE_GEOHASH_PRECISION", "7"))  # ~150m cells
+    KAKAO_CACHE_SIZE = int(os.getenv("KAKAO_CACHE_SIZE", "5000"))
+    KAKAO_CACHE_TTL = int(os.getenv("KAKAO_CACHE_TTL", "86400"))  # seconds
+    
+    # Mock providers for offline load testing ("all" or comma list of kakao,naver,vision,textract,genai)
+    MOCK_PROVIDERS = os.getenv("MOCK_PROVIDERS", "")
+    MOCK_LATENCY_MS = float(os.getenv("MOCK_LATENCY_MS", "50"))
+    MOCK_JITTER_MS = float(os.getenv("MOCK_JITTER_MS", "20"))
+    MOCK_ERROR_RATE = float(os.getenv("MOCK_ERROR_RATE", "0"))
+    MOCK_TIMEOUT_RATE = float(os.getenv("MOCK_TIMEOUT_RATE", "0"))
+    MOCK_TIMEOUT_SECONDS = float(os.getenv("MOCK_TIMEOUT_SECONDS", "10"))
+    MOCK_PLACE_COUNT = int(os.getenv("MOCK_PLACE_COUNT", "100000"))  # synthetic places
+    MOCK_PLACE_SEED = int(os.getenv("MOCK_PLACE_SEED", "42"))
+    MOCK_PROVIDER_PROFILES = os.getenv("MOCK_PROVIDER_PROFILES", "")  # JSON per-provider overrides
+    
+    # Offline region-level reverse geocoding (행정동 경계 GeoJSON)
+    REGION_BOUNDARY_PATH = os.getenv("REGION_BOUNDARY_PATH", "data/admin_boundaries.geojson")
+    REGION_INDEX_CELL_SIZE = float(os.getenv("REGION_INDEX_CELL_SIZE", "0.02"))  # degrees
+    
     # Authentication Settings
     JWT_SECRET_KEY = os.getenv("JWT_SECRET_KEY", "your-super-secret-jwt-key-change-in-production")
     JWT_ALGORITHM = "HS256"
@@ -40,10 +75,51 @@ class Settings:
     APPLE_KEY_ID = os.getenv("APPLE_KEY_ID")
     APPLE_PRIVATE_KEY = os.getenv("APPLE_PRIVATE_KEY")
     
+    # Shared HTTP client pools (per-upstream limits live in services/http_client_service.py)
+    HTTP_MAX_CONNECTIONS = int(os.getenv("HTTP_MAX_CONNECTIONS", "20"))
+    HTTP_KEEPALIVE_EXPIRY = float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30"))  # seconds
+    HTTP_CONNECT_TIMEOUT = float(os.getenv("HTTP_CONNECT_TIMEOUT", "3"))  # seconds
+    HTTP_POOL_TIMEOUT = float(os.getenv("HTTP_POOL_TIMEOUT", "2"))  # seconds waiting for a free connection
+    
+    # Upstream governor (per-provider quotas live in services/upstream_governor_service.py)
+    UPSTREAM_MAX_WAIT = float(os.getenv("UPSTREAM_MAX_WAIT", "2"))  # seconds to wait for quota/concurrency
+    CIRCUIT_FAILURE_THRESHOLD = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_TIMEOUT = float(os.getenv("CIRCUIT_RESET_TIMEOUT", "30"))  # seconds
+    UPSTREAM_STALE_CACHE_SIZE = int(os.getenv("UPSTREAM_STALE_CACHE_SIZE", "2000"))
+    UPSTREAM_STALE_CACHE_TTL = int(os.getenv("UPSTREAM_STALE_CACHE_TTL", "3600"))  # seconds
+    REQUEST_DEADLINE = float(os.getenv("REQUEST_DEADLINE", "8"))  # seconds, per-request time budget
+    REQUEST_DEADLINE_MAX = float(os.getenv("REQUEST_DEADLINE_MAX", "30"))  # cap for X-Request-Timeout
+    HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", "95"))  # hedge after this latency percentile
+    HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", "20"))
+    HEDGE_SAMPLE_SIZE = int(os.getenv("HEDGE_SAMPLE_SIZE", "200"))
+    UPSTREAM_STANDIN_URL = os.getenv("UPSTREAM_STANDIN_URL", "")  # benchmarks.upstream_standin, empty = real upstreams
+    
     # Application Settings
     DEBUG = os.getenv("DEBUG", "False").lower() == "true"
     MAX_FILE_SIZE = int(os.getenv("MAX_FILE_SIZE", "10485760"))  # 10MB
     ALLOWED_IMAGE_TYPES = os.getenv("ALLOWED_IMAGE_TYPES", "image/jpeg,image/png,image/webp").split(",")
+    UPLOAD_CHUNK_SIZE = int(os.getenv("UPLOAD_CHUNK_SIZE", "262144"))  # 256KB per read
+    UPLOAD_HEAD_BYTES = int(os.getenv("UPLOAD_HEAD_BYTES", "262144"))  # leading bytes kept for header/EXIF parsing
+    S3_MULTIPART_PART_SIZE = int(os.getenv("S3_MULTIPART_PART_SIZE", "5242880"))  # 5MB, S3 minimum
+    PHOTO_DEDUP_INDEX_SIZE = int(os.getenv("PHOTO_DEDUP_INDEX_SIZE", "100000"))  # content hash -> analysis entries
+    PHOTO_DEDUP_TTL = int(os.getenv("PHOTO_DEDUP_TTL", "604800"))  # seconds (7 days)
+    PHASH_MAX_DISTANCE = int(os.getenv("PHASH_MAX_DISTANCE", "6"))  # Hamming bits of 64, negative disables near-duplicate reuse
+    PHASH_GEOHASH_PRECISION = int(os.getenv("PHASH_GEOHASH_PRECISION", "7"))  # ~150m cells
+    PHASH_MIN_CONFIDENCE = float(os.getenv("PHASH_MIN_CONFIDENCE", "80"))  # only reuse analyses at least this confident
+    PHASH_INDEX_CELLS = int(os.getenv("PHASH_INDEX_CELLS", "20000"))
+    THUMBNAIL_WIDTHS = [int(w) for w in os.getenv("THUMBNAIL_WIDTHS", "160,320,640,1280").split(",")]  # requested widths snap up to these
+    THUMBNAIL_QUALITY = int(os.getenv("THUMBNAIL_QUALITY", "80"))
+    THUMBNAIL_CACHE_SIZE = int(os.getenv("THUMBNAIL_CACHE_SIZE", "200"))  # in-memory derivatives
+    THUMBNAIL_CACHE_BYTES = int(os.getenv("THUMBNAIL_CACHE_BYTES", str(32 * 1024 * 1024)))  # 메모리 캐시 전체 bytes 한도
+    THUMBNAIL_CACHE_TTL = int(os.getenv("THUMBNAIL_CACHE_TTL", "3600"))  # seconds, 만료 후에는 저장본을 다시 읽음
+    THUMBNAIL_NOT_FOUND_TTL = int(os.getenv("THUMBNAIL_NOT_FOUND_TTL", "60"))  # 없는 원본 키를 기억하는 시간(seconds)
+    THUMBNAIL_MAX_AGE = int(os.getenv("THUMBNAIL_MAX_AGE", "31536000"))  # Cache-Control max-age, seconds
+    CPU_POOL_WORKERS = int(os.getenv("CPU_POOL_WORKERS", "0"))  # image work processes, 0 = CPU count
+    CPU_POOL_SHM_THRESHOLD = int(os.getenv("CPU_POOL_SHM_THRESHOLD", "1048576"))  # pass larger payloads via shared memory
+    IMAGE_DERIVATIVE_PROFILES = os.getenv("IMAGE_DERIVATIVE_PROFILES", "")  # JSON per-provider max_side/quality/max_bytes overrides
+    IMAGE_DERIVATIVE_CACHE_SIZE = int(os.getenv("IMAGE_DERIVATIVE_CACHE_SIZE", "256"))
+    IMAGE_DERIVATIVE_CACHE_TTL = int(os.getenv("IMAGE_DERIVATIVE_CACHE_TTL", "3600"))  # seconds
+    IMAGE_DERIVATIVE_CACHE_BYTES = int(os.getenv("IMAGE_DERIVATIVE_CACHE_BYTES", str(128 * 1024 * 1024)))  # 캐시 전체 bytes 한도
     
     # API Settings
     API_V1_PREFIX = "/api/v1"
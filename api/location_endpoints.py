@@ -5,11 +5,19 @@ import logging
 
 from models import User
 from services.public_facility_service import public_facility_service
+from services.restroom_catalog_service import facility_mask
+from services.geocoding_service import geocoding_service
 from services.heritage_service import heritage_service
 from auth_endpoints import get_current_user_dependency
+from utils.deadline import request_deadline
 
 logger = logging.getLogger(__name__)
-router = APIRouter(prefix="/api/v1/location", tags=["Location Services"])
+# 모든 위치 엔드포인트에 요청 시간 예산 적용 (하위 서비스의 업스트림 호출이 남은 시간 안에서만 동작)
+router = APIRouter(
+    prefix="/api/v1/location",
+    tags=["Location Services"],
+    dependencies=[Depends(request_deadline)]
+)
 security = HTTPBearer()
 
 @router.get("/nearby-restrooms")
@@ -17,6 +25,9 @@ async def get_nearby_restrooms(
     latitude: float = Query(..., description="위도", ge=-90, le=90),
     longitude: float = Query(..., description="경도", ge=-180, le=180),
     radius: int = Query(1000, description="검색 반경 (미터)", ge=100, le=5000),
+    wheelchair_accessible: bool = Query(False, description="장애인용 화장실만"),
+    unisex: bool = Query(False, description="남녀공용 화장실만"),
+    changing_table: bool = Query(False, description="기저귀 교환대 설치 화장실만"),
     current_user: User = Depends(get_current_user_dependency)
 ):
     """
@@ -25,10 +36,17 @@ async def get_nearby_restrooms(
     - **latitude**: 현재 위치의 위도
     - **longitude**: 현재 위치의 경도  
     - **radius**: 검색 반경 (미터, 기본값: 1000m)
+    - **wheelchair_accessible**, **unisex**, **changing_table**: 필요한 편의시설 (모두 만족하는 화장실만 반환)
     """
     try:
+        required_facilities = {
+            'wheelchair_accessible': wheelchair_accessible,
+            'unisex': unisex,
+            'changing_table': changing_table
+        }
+        
         restrooms = await public_facility_service.get_nearby_restrooms(
-            latitude, longitude, radius
+            latitude, longitude, radius, facility_mask(required_facilities)
         )
         
         return {
@@ -37,6 +55,7 @@ async def get_nearby_restrooms(
                 "restrooms": restrooms,
                 "total_count": len(restrooms),
                 "search_radius": radius,
+                "required_facilities": [name for name, required in required_facilities.items() if required],
                 "user_location": {
                     "latitude": latitude,
                     "longitude": longitude
@@ -304,7 +323,7 @@ async def geocode_address(
     current_user: User = Depends(get_current_user_dependency)
 ):
     """
-    주소를 좌표로 변환합니다 (Naver Maps Geocoding)
+    주소를 좌표로 변환합니다 (Naver / Kakao Geocoding)
     
     Request body: {"address": "서울시 종로구 사직로 161"}
     """
@@ -316,15 +335,19 @@ async def geocode_address(
                 detail="Address is required"
             )
         
-        # Use heritage service's geocoding method
-        coordinates = await heritage_service._geocode_address(address)
+        result = await geocoding_service.geocode(address)
         
-        if coordinates:
+        if result:
             return {
                 "status": "success",
                 "data": {
                     "address": address,
-                    "coordinates": coordinates
+                    "normalized_address": result['address'],
+                    "coordinates": {
+                        "latitude": result['latitude'],
+                        "longitude": result['longitude']
+                    },
+                    "provider": result['provider']
                 },
                 "message": "Address geocoded successfully"
             }
@@ -345,13 +368,15 @@ async def geocode_address(
 
 @router.post("/reverse-geocode")
 async def reverse_geocode_coordinates(
-    coordinates_data: Dict[str, float],
+    coordinates_data: Dict[str, Any],
     current_user: User = Depends(get_current_user_dependency)
 ):
     """
     좌표를 주소로 변환합니다 (Naver Maps Reverse Geocoding)
     
-    Request body: {"latitude": 37.5759, "longitude": 126.9769}
+    Request body: {"latitude": 37.5759, "longitude": 126.9769, "level": "street"}
+    
+    - **level**: "street" (도로명 주소, 기본값) 또는 "region" (시/도·시/군/구·읍/면/동, 로컬 조회)
     """
     try:
         latitude = coordinates_data.get('latitude')
@@ -363,8 +388,16 @@ async def reverse_geocode_coordinates(
                 detail="Both latitude and longitude are required"
             )
         
-        # Use public facility service's reverse geocoding method
-        korean_address = await public_facility_service._get_korean_address(latitude, longitude)
+        region = None
+        if coordinates_data.get('level') == 'region':
+            # Region-level lookup from local administrative boundaries (no network call)
+            region = geocoding_service.reverse_geocode_region(latitude, longitude)
+            korean_address = ' '.join(
+                region[area] for area in ('area1', 'area2', 'area3') if region.get(area)
+            ) if region else None
+        else:
+            # Use public facility service's reverse geocoding method
+            korean_address = await public_facility_service._get_korean_address(latitude, longitude)
         
         if korean_address:
             return {
@@ -374,7 +407,8 @@ async def reverse_geocode_coordinates(
                         "latitude": latitude,
                         "longitude": longitude
                     },
-                    "address": korean_address
+                    "address": korean_address,
+                    "region": region
                 },
                 "message": "Coordinates reverse geocoded successfully"
             }
@@ -1,7 +1,8 @@
-from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends
+from fastapi import FastAPI, UploadFile, File, Form, HTTPException, Depends, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse, FileResponse
 from fastapi.staticfiles import StaticFiles
+from contextlib import asynccontextmanager
 import uuid
 import time
 import logging
@@ -14,22 +15,57 @@ from models import (
     GPSCoordinates, PhotoCaptureRequest, AnalysisStatus, 
     ErrorResponse, PlaceInfo, EXIFData, CameraInfo, PhotoAnalysisResponse
 )
-from services.s3_service import s3_service
 from services.sqs_service import sqs_service
+from services.upload_pipeline_service import upload_pipeline
+from services.photo_dedup_service import photo_dedup
+from services.near_duplicate_service import near_duplicates
+from services.image_derivative_service import image_derivatives
+from services.process_pool_service import cpu_pool
+from services.thumbnail_service import UnsupportedImageError, thumbnail_service
 from services.naver_service import naver_service
-from utils.validators import validate_image_file, validate_image_content, validate_gps_coordinates
+from services.restroom_catalog_service import restroom_catalog_service
+from services.region_geocoder_service import region_geocoder_service
+from services.http_client_service import http_clients
+from services.upstream_governor_service import upstream_governor
+from services.geocoding_service import geocoding_service
+from services.kakao_service import kakao_service
+from services.mock_providers import MOCKABLE_PROVIDERS, get_place_dataset, mock_enabled
+from utils.validators import validate_image_file, validate_gps_coordinates
 from utils.responses import create_error_response, create_success_response, APIException
-from utils.exif_processor import exif_processor
+from utils.deadline import request_deadline
 
 # 로깅 설정
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    앱 시작/종료 시 공유 리소스 관리
+    """
+    # 공중화장실 카탈로그 적재 (파일이 없으면 OpenRestroom API로 대체)
+    restroom_catalog_service.load()
+    # 행정구역 경계 적재 (파일이 없으면 역지오코딩은 Naver만 사용)
+    region_geocoder_service.load()
+    # 부하 테스트용 Mock 제공자의 합성 장소 데이터셋 (첫 요청 지연 방지)
+    if any(mock_enabled(provider) for provider in MOCKABLE_PROVIDERS):
+        get_place_dataset()
+    # 업스트림별 공유 커넥션 풀
+    await http_clients.start()
+    # 이미지 검사/변환용 CPU 프로세스 풀
+    await cpu_pool.start()
+    
+    yield
+    
+    await cpu_pool.close()
+    await http_clients.close()
+
 # FastAPI 앱 초기화
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
-    debug=False  # Production mode
+    debug=False,  # Production mode
+    lifespan=lifespan
 )
 
 # CORS 설정
@@ -77,7 +113,32 @@ async def health_check():
         "version": settings.VERSION
     }
 
-@app.post(f"{settings.API_V1_PREFIX}/upload-photo")
+@app.get("/metrics")
+async def metrics():
+    """
+    내부 리소스 사용 현황 (커넥션 풀 등)
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "http_clients": http_clients.metrics(),
+        "upstreams": upstream_governor.metrics(),
+        "geocoding": geocoding_service.metrics(),
+        "uploads": upload_pipeline.metrics(),
+        "photo_dedup": photo_dedup.stats(),
+        "near_duplicates": near_duplicates.stats(),
+        "image_derivatives": image_derivatives.metrics(),
+        "cpu_pool": cpu_pool.metrics(),
+        "thumbnails": thumbnail_service.metrics(),
+        "kakao_search_cache": kakao_service.search_cache.stats() if hasattr(kakao_service, 'search_cache') else None
+    }
+
+# 업로드 파이프라인의 HTTPException 상태 코드 -> 오류 코드
+UPLOAD_ERROR_CODES = {
+    413: "FILE_TOO_LARGE",
+    415: "UNSUPPORTED_MEDIA_TYPE"
+}
+
+@app.post(f"{settings.API_V1_PREFIX}/upload-photo", dependencies=[Depends(request_deadline)])
 async def upload_photo(
     file: UploadFile = File(..., description="분석할 사진 파일"),
     device_latitude: Optional[float] = Form(None, description="디바이스 GPS 위도"),
@@ -98,58 +159,117 @@ async def upload_photo(
                 message="사진 파일이 필요합니다."
             )
         
-        # 파일 검증
+        # 파일 검증 (선언된 Content-Type / 크기)
         validate_image_file(file)
         
-        # 파일 내용 읽기
-        file_content = await file.read()
-        validate_image_content(file_content)
-        
         # GPS 좌표 검증
         if device_latitude is not None and device_longitude is not None:
             validate_gps_coordinates(device_latitude, device_longitude)
         
-        # EXIF 데이터 추출
-        exif_data = exif_processor.extract_exif_data(file_content)
+        # 청크 단위 스트리밍: 형식 판별, 크기 제한, 해시, 중복 확인, S3 업로드, EXIF 추출
+        s3_key = f"photos/{request_id}/{file.filename}"
+        upload = await upload_pipeline.process(file, s3_key, request_id)
+        s3_url = upload['s3_url']
+        exif_metadata = upload['exif_metadata']
+        
+        # 같은 사진이 이미 업로드됨: 기존 분석 결과 재사용 또는 진행 중인 요청에 합류
+        if upload['duplicate_of']:
+            original_id = upload['duplicate_of']
+            original = analysis_status_store.get(original_id, {})
+            processing_time = time.time() - start_time
+            
+            return create_success_response(
+                data={
+                    "request_id": original_id,
+                    "status": original.get("status", "processing"),
+                    "message": "이미 업로드된 사진입니다. 기존 분석 결과를 사용합니다.",
+                    "s3_url": s3_url,
+                    "sha256": upload['sha256'],
+                    "deduplicated": True,
+                    "result": original.get("result"),
+                    "processing_time": round(processing_time, 3)
+                }
+            )
         
         # GPS 좌표 결정 (디바이스 GPS 우선, 없으면 EXIF GPS 사용)
-        final_latitude = device_latitude or exif_data.get('gps_latitude')
-        final_longitude = device_longitude or exif_data.get('gps_longitude')
+        gps_coordinates = None
+        if device_latitude is not None and device_longitude is not None:
+            gps_coordinates = {"latitude": device_latitude, "longitude": device_longitude}
+        elif exif_metadata['gps_coordinates']:
+            gps_coordinates = exif_metadata['gps_coordinates']
         
-        # S3에 파일 업로드
-        s3_key = f"photos/{request_id}/{file.filename}"
-        s3_url = await s3_service.upload_file(
-            file_content=file_content,
-            key=s3_key,
-            content_type=file.content_type
-        )
+        # 같은 장소에서 거의 같은 구도로 찍힌 사진: 이전 고신뢰 분석 결과 재사용 (SQS/분석 생략)
+        near_match = None
+        if gps_coordinates:
+            near_match = near_duplicates.find(
+                upload['phash'], gps_coordinates['latitude'], gps_coordinates['longitude']
+            )
+        original = analysis_status_store.get(near_match[0], {}) if near_match else {}
+        if str(original.get("status", "")).lower() == "completed":
+            analysis_status_store[request_id] = {
+                "status": original["status"],
+                "created_at": datetime.now().isoformat(),
+                "completed_at": datetime.now().isoformat(),
+                "s3_url": s3_url,
+                "filename": file.filename,
+                "sha256": upload['sha256'],
+                "result": original.get("result"),
+                "reused_from": near_match[0]
+            }
+            processing_time = time.time() - start_time
+            
+            return create_success_response(
+                data={
+                    "request_id": request_id,
+                    "status": original["status"],
+                    "message": "같은 장소의 유사한 사진 분석 결과를 사용합니다.",
+                    "s3_url": s3_url,
+                    "sha256": upload['sha256'],
+                    "deduplicated": False,
+                    "near_duplicate_of": near_match[0],
+                    "hamming_distance": near_match[1],
+                    "result": original.get("result"),
+                    "processing_time": round(processing_time, 3)
+                }
+            )
         
         # SQS에 분석 요청 메시지 전송
-        message_data = {
-            "request_id": request_id,
-            "s3_url": s3_url,
+        analysis_data = {
             "s3_key": s3_key,
             "filename": file.filename,
-            "content_type": file.content_type,
-            "file_size": len(file_content),
-            "gps_coordinates": {
-                "latitude": final_latitude,
-                "longitude": final_longitude
-            } if final_latitude and final_longitude else None,
-            "exif_data": exif_data,
-            "timestamp": datetime.now().isoformat()
+            "content_type": upload['content_type'],
+            "file_size": upload['file_size'],
+            "sha256": upload['sha256'],
+            "image_size": {"width": upload['width'], "height": upload['height']},
+            "gps_coordinates": gps_coordinates,
+            "exif_metadata": {
+                "has_exif": exif_metadata['has_exif'],
+                "has_gps": exif_metadata['has_gps'],
+                "gps_coordinates": exif_metadata['gps_coordinates']
+            }
         }
         
-        await sqs_service.send_message(message_data)
-        
-        # 분석 상태 저장
+        # 분석 상태 저장 (중복 업로드가 바로 합류할 수 있도록 전송 전에 등록)
         analysis_status_store[request_id] = {
             "status": "processing",
             "created_at": datetime.now().isoformat(),
             "s3_url": s3_url,
-            "filename": file.filename
+            "filename": file.filename,
+            "sha256": upload['sha256']
         }
         
+        try:
+            await sqs_service.send_analysis_request(s3_url, analysis_data, request_id)
+        except Exception:
+            analysis_status_store.pop(request_id, None)
+            photo_dedup.release(upload['sha256'], request_id)
+            raise
+        
+        if gps_coordinates:
+            near_duplicates.track(
+                request_id, upload['phash'], gps_coordinates['latitude'], gps_coordinates['longitude']
+            )
+        
         processing_time = time.time() - start_time
         
         return create_success_response(
@@ -158,30 +278,34 @@ async def upload_photo(
                 "status": "processing",
                 "message": "사진이 성공적으로 업로드되었습니다. 분석이 진행 중입니다.",
                 "s3_url": s3_url,
+                "sha256": upload['sha256'],
+                "deduplicated": False,
                 "processing_time": round(processing_time, 3)
-            },
-            request_id=request_id
+            }
         )
         
     except APIException as e:
-        processing_time = time.time() - start_time
         logger.error(f"API Exception in upload_photo: {e.message}")
         return create_error_response(
             status_code=e.status_code,
             error=e.error,
             message=e.message,
-            request_id=request_id,
-            processing_time=round(processing_time, 3)
+            request_id=request_id
+        )
+    except HTTPException as e:
+        return create_error_response(
+            status_code=e.status_code,
+            error=UPLOAD_ERROR_CODES.get(e.status_code, "INVALID_IMAGE" if e.status_code < 500 else "UPLOAD_FAILED"),
+            message=str(e.detail),
+            request_id=request_id
         )
     except Exception as e:
-        processing_time = time.time() - start_time
         logger.error(f"Unexpected error in upload_photo: {str(e)}")
         return create_error_response(
             status_code=500,
             error="UPLOAD_FAILED",
             message=f"사진 업로드 중 오류가 발생했습니다: {str(e)}",
-            request_id=request_id,
-            processing_time=round(processing_time, 3)
+            request_id=request_id
         )
 
 @app.get(f"{settings.API_V1_PREFIX}/analysis-status/{{request_id}}")
@@ -212,6 +336,40 @@ async def get_analysis_status(request_id: str):
         logger.error(f"Error getting analysis status: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to get analysis status")
 
+@app.get(f"{settings.API_V1_PREFIX}/photos/{{key:path}}/thumbnail")
+async def get_photo_thumbnail(request: Request, key: str, width: int = 320, format: str = "webp"):
+    """
+    저장된 사진의 썸네일 (첫 요청 시 생성 후 원본 옆에 저장)
+    key: uploads/<파일명> (로컬 저장) 또는 photos/<request_id>/<파일명> (S3)
+    """
+    width = thumbnail_service.snap_width(width)
+    try:
+        fmt = thumbnail_service.validate(key, format.lower())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+    try:
+        found = await thumbnail_service.get(key, width, fmt)
+    except UnsupportedImageError as e:
+        logger.warning(str(e))
+        raise HTTPException(status_code=415, detail="Stored file is not a supported image")
+    except Exception as e:
+        logger.error(f"Thumbnail generation failed for {key}: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to generate thumbnail")
+
+    if found is None:
+        raise HTTPException(status_code=404, detail="Photo not found")
+
+    etag = thumbnail_service.etag(key, width, fmt)
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={settings.THUMBNAIL_MAX_AGE}, immutable"}
+
+    # 반복 조회는 대개 메모리 캐시에서 확인되므로 존재 확인 후 조건부 응답
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers=headers)
+
+    data, content_type = found
+    return Response(content=data, media_type=content_type, headers=headers)
+
 @app.post(f"{settings.API_V1_PREFIX}/analysis-result")
 async def receive_analysis_result(
     request_id: str = Form(...),
@@ -229,6 +387,12 @@ async def receive_analysis_result(
                 "completed_at": datetime.now().isoformat()
             })
             
+            # 실패한 분석은 재사용하지 않음 (같은 사진을 다시 올리면 새로 분석)
+            if status.lower() in ("failed", "error"):
+                photo_dedup.release(analysis_status_store[request_id].get("sha256", ""), request_id)
+            elif status.lower() == "completed":
+                near_duplicates.index_result(request_id, result)
+            
             return {"message": "Analysis result received successfully"}
         else:
             raise HTTPException(status_code=404, detail="Request ID not found")
@@ -0,0 +1,115 @@
+"""
+요청 단위 분석 컨텍스트 - 단계 결과 메모이제이션
+한 장의 사진을 분석하는 동안 전략/대체 분석이 같은 단계(OCR, 상호명, GPS 장소, 키워드 검색 등)를
+다시 요청하면 이미 실행 중이거나 끝난 결과를 그대로 돌려줍니다.
+
+    context = AnalysisContext(image_bytes)
+    texts = await context.texts()
+    place = await context.place_by_coordinates(37.5, 127.0)
+    ...
+    context.close()  # 분석이 끝나면 남은 단계 취소
+"""
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Tuple
+from services.vision_service import google_vision_service
+from services.kakao_service import kakao_service
+from services.image_derivative_service import content_digest, image_derivatives
+
+logger = logging.getLogger(__name__)
+
+class AnalysisContext:
+    """
+    (단계 이름, 입력) -> 태스크
+    결과를 기다리는 쪽이 취소되어도 공유 태스크는 계속 실행되도록 shield 로 감싸서 반환합니다.
+    실패한 단계도 같은 요청 안에서는 다시 호출하지 않으며, 취소된 단계만 새로 실행합니다.
+    """
+
+    def __init__(self, image_bytes: bytes):
+        self.image_bytes = image_bytes
+        self._tasks: Dict[Tuple, asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def memo(self, name: str, factory: Callable[[], Awaitable[Any]], *key: Any) -> Awaitable[Any]:
+        """
+        name + key 로 단계 결과를 메모이제이션합니다. 처음 요청될 때 factory() 를 태스크로 시작합니다.
+        """
+        memo_key = (name,) + key
+        task = self._tasks.get(memo_key)
+        if task is None or task.cancelled():
+            self.misses += 1
+            task = asyncio.create_task(factory())
+            self._tasks[memo_key] = task
+        else:
+            self.hits += 1
+        return asyncio.shield(task)
+
+    @staticmethod
+    def prefetch(*stages: Awaitable[Any]) -> None:
+        """
+        결과를 지금 기다리지 않고 미리 시작한 단계: 실패해도 결과 미확인 경고가 나지 않도록 처리합니다.
+        """
+        for stage in stages:
+            stage.add_done_callback(lambda future: future.cancelled() or future.exception())
+
+    # 공통 단계
+
+    def texts(self) -> Awaitable[List[Dict[str, str]]]:
+        return self.memo('texts', lambda: google_vision_service.extract_korean_text(self.image_bytes))
+
+    def business_names(self) -> Awaitable[List[str]]:
+        async def extract() -> List[str]:
+            texts = await self.texts()
+            return google_vision_service.extract_business_names(texts) if texts else []
+
+        return self.memo('business_names', extract)
+
+    def place_by_coordinates(self, latitude: float, longitude: float) -> Awaitable[Any]:
+        return self.memo(
+            'place_by_coordinates',
+            lambda: kakao_service.get_place_by_coordinates(latitude, longitude),
+            latitude, longitude
+        )
+
+    def place_by_keyword(self, keyword: str, latitude: float, longitude: float) -> Awaitable[Any]:
+        return self.memo(
+            'place_by_keyword',
+            lambda: kakao_service.search_place_by_keyword(keyword, latitude, longitude),
+            keyword, latitude, longitude
+        )
+
+    def content_hash(self) -> Awaitable[str]:
+        return self.memo('content_hash', lambda: asyncio.to_thread(content_digest, self.image_bytes))
+
+    def derivative(self, provider: str) -> Awaitable[bytes]:
+        async def derive() -> bytes:
+            return await image_derivatives.derive(self.image_bytes, provider, await self.content_hash())
+
+        return self.memo('derivative', derive, provider)
+
+    # 수명 관리
+
+    def cancel(self, keep: Iterable[str] = ()) -> List[str]:
+        """
+        keep 에 없는 단계 중 아직 끝나지 않은 단계를 취소합니다. 다시 요청하면 새로 실행합니다.
+        """
+        keep = set(keep)
+        cancelled = []
+        for memo_key, task in list(self._tasks.items()):
+            if memo_key[0] not in keep and not task.done():
+                task.cancel()
+                del self._tasks[memo_key]
+                cancelled.append(memo_key[0])
+        return cancelled
+
+    def close(self) -> None:
+        """분석이 끝난 뒤 백그라운드에 남은 단계를 취소합니다."""
+        self.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'stages': len(self._tasks),
+            'hits': self.hits,
+            'misses': self.misses
+        }
@@ -7,6 +7,7 @@ from fastapi import HTTPException, status
 from passlib.context import CryptContext
 
 from config import settings
+from services.http_client_service import http_clients
 
 logger = logging.getLogger(__name__)
 
@@ -55,27 +56,27 @@ class KakaoAuthService:
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """Get user information from Kakao API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://kapi.kakao.com/v2/user/me",
-                    headers={"Authorization": f"Bearer {access_token}"}
+            client = http_clients.get('oauth')
+            response = await client.get(
+                "https://kapi.kakao.com/v2/user/me",
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid Kakao access token"
                 )
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid Kakao access token"
-                    )
-                
-                user_data = response.json()
-                return {
-                    "provider": "kakao",
-                    "provider_id": str(user_data["id"]),
-                    "email": user_data.get("kakao_account", {}).get("email"),
-                    "name": user_data.get("kakao_account", {}).get("profile", {}).get("nickname"),
-                    "profile_image": user_data.get("kakao_account", {}).get("profile", {}).get("profile_image_url")
-                }
-                
+            
+            user_data = response.json()
+            return {
+                "provider": "kakao",
+                "provider_id": str(user_data["id"]),
+                "email": user_data.get("kakao_account", {}).get("email"),
+                "name": user_data.get("kakao_account", {}).get("profile", {}).get("nickname"),
+                "profile_image": user_data.get("kakao_account", {}).get("profile", {}).get("profile_image_url")
+            }
+            
         except httpx.RequestError as e:
             logger.error(f"Error fetching Kakao user info: {e}")
             raise HTTPException(
@@ -91,27 +92,27 @@ class GoogleAuthService:
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """Get user information from Google API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://www.googleapis.com/oauth2/v2/userinfo",
-                    headers={"Authorization": f"Bearer {access_token}"}
+            client = http_clients.get('oauth')
+            response = await client.get(
+                "https://www.googleapis.com/oauth2/v2/userinfo",
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid Google access token"
                 )
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid Google access token"
-                    )
-                
-                user_data = response.json()
-                return {
-                    "provider": "google",
-                    "provider_id": user_data["id"],
-                    "email": user_data.get("email"),
-                    "name": user_data.get("name"),
-                    "profile_image": user_data.get("picture")
-                }
-                
+            
+            user_data = response.json()
+            return {
+                "provider": "google",
+                "provider_id": user_data["id"],
+                "email": user_data.get("email"),
+                "name": user_data.get("name"),
+                "profile_image": user_data.get("picture")
+            }
+            
         except httpx.RequestError as e:
             logger.error(f"Error fetching Google user info: {e}")
             raise HTTPException(
@@ -127,28 +128,28 @@ class NaverAuthService:
     async def get_user_info(self, access_token: str) -> Dict[str, Any]:
         """Get user information from Naver API"""
         try:
-            async with httpx.AsyncClient() as client:
-                response = await client.get(
-                    "https://openapi.naver.com/v1/nid/me",
-                    headers={"Authorization": f"Bearer {access_token}"}
+            client = http_clients.get('oauth')
+            response = await client.get(
+                "https://openapi.naver.com/v1/nid/me",
+                headers={"Authorization": f"Bearer {access_token}"}
+            )
+            
+            if response.status_code != 200:
+                raise HTTPException(
+                    status_code=status.HTTP_401_UNAUTHORIZED,
+                    detail="Invalid Naver access token"
                 )
-                
-                if response.status_code != 200:
-                    raise HTTPException(
-                        status_code=status.HTTP_401_UNAUTHORIZED,
-                        detail="Invalid Naver access token"
-                    )
-                
-                user_data = response.json()
-                profile = user_data.get("response", {})
-                return {
-                    "provider": "naver",
-                    "provider_id": profile.get("id"),
-                    "email": profile.get("email"),
-                    "name": profile.get("name"),
-                    "profile_image": profile.get("profile_image")
-                }
-                
+            
+            user_data = response.json()
+            profile = user_data.get("response", {})
+            return {
+                "provider": "naver",
+                "provider_id": profile.get("id"),
+                "email": profile.get("email"),
+                "name": profile.get("name"),
+                "profile_image": profile.get("profile_image")
+            }
+            
         except httpx.RequestError as e:
             logger.error(f"Error fetching Naver user info: {e}")
             raise HTTPException(
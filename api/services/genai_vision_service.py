@@ -6,6 +6,9 @@ import requests
 import logging
 from typing import Dict, Any, Optional
 
+from services.image_derivative_service import image_derivatives
+from services.mock_providers import create_genai_mock, mock_enabled
+
 logger = logging.getLogger(__name__)
 
 class GenAIVisionService:
@@ -23,6 +26,9 @@ class GenAIVisionService:
             
             analysis_prompt = self._create_analysis_prompt(gps_info)
             
+            # 방향 보정 + 모델 입력 해상도 파생본
+            image_bytes = await image_derivatives.derive(image_bytes, 'genai')
+            
             # Mock GenAI 응답 (실제로는 API 호출)
             genai_response = await self._mock_genai_analysis(image_bytes, analysis_prompt)
             
@@ -165,5 +171,8 @@ class GenAIVisionService:
         
         return "기존 Vision API 결과를 활용하여 구조화된 정보를 추출하세요."
 
-# GenAI Vision 서비스 인스턴스
-genai_vision_service = GenAIVisionService()
+# GenAI Vision 서비스 인스턴스 (MOCK_PROVIDERS 에 genai 가 포함되면 지연/오류 주입)
+if mock_enabled('genai'):
+    genai_vision_service = create_genai_mock()
+else:
+    genai_vision_service = GenAIVisionService()
@@ -0,0 +1,365 @@
+"""
+지오코딩 서비스 - 좌표 양자화 캐시 + 동시 조회
+Naver / Kakao 제공자를 경쟁(race) 또는 지연/상태 순으로 시도하고 정규화된 결과를 공유 캐시에 저장
+"""
+import asyncio
+import logging
+import re
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from config import settings
+from services.http_client_service import http_clients
+from services.region_geocoder_service import region_geocoder_service
+from services.upstream_governor_service import upstream_governor
+from utils.batcher import MicroBatcher
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+
+class GeocodingService:
+    def __init__(self):
+        self.naver_client_id = settings.NAVER_CLIENT_ID
+        self.naver_client_secret = settings.NAVER_CLIENT_SECRET
+        self.naver_reverse_geocoding_url = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
+        self.naver_geocoding_url = "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode"
+        self.kakao_api_key = settings.KAKAO_REST_API_KEY
+        self.kakao_base_url = "https://dapi.kakao.com/v2/local"
+
+        # 'race': 모든 제공자에 동시에 요청해 먼저 온 유효한 응답 사용
+        # 'ordered': 서킷 상태와 관측 지연(p50) 순으로 하나씩 시도
+        self.strategy = settings.GEOCODE_STRATEGY
+        self.providers = [name.strip() for name in settings.GEOCODE_PROVIDERS.split(',') if name.strip()]
+
+        # 소수점 4자리 ≈ 11m: 같은 건물/입구 수준의 좌표는 하나의 키로 모임
+        self.precision = settings.GEOCODE_CACHE_PRECISION
+        self.reverse_cache = TTLCache(
+            maxsize=settings.GEOCODE_CACHE_SIZE,
+            ttl=settings.GEOCODE_CACHE_TTL
+        )
+        self.max_concurrency = settings.GEOCODE_MAX_CONCURRENCY
+
+        # 주소 -> 좌표 (공백/대소문자 정규화한 주소 키)
+        self.forward_cache = TTLCache(
+            maxsize=settings.GEOCODE_CACHE_SIZE,
+            ttl=settings.GEOCODE_CACHE_TTL
+        )
+
+        # 수 ms 동안 들어온 조회를 모아 중복 제거 후 max_concurrency 한도로 병렬 처리
+        # (처리 중인 키는 요청 간에도 공유)
+        batch_window = settings.GEOCODE_BATCH_WINDOW_MS / 1000
+        self.forward_batcher = MicroBatcher(
+            self._resolve_forward, window=batch_window,
+            max_batch=settings.GEOCODE_BATCH_MAX_SIZE, max_concurrency=self.max_concurrency
+        )
+        self.reverse_batcher = MicroBatcher(
+            self._resolve_reverse, window=batch_window,
+            max_batch=settings.GEOCODE_BATCH_MAX_SIZE, max_concurrency=self.max_concurrency
+        )
+        self.provider_stats: Dict[str, Dict[str, int]] = {
+            name: {'wins': 0, 'empty': 0, 'errors': 0} for name in ('naver', 'kakao')
+        }
+
+    def _coordinate_key(self, lat: float, lng: float) -> Tuple[float, float]:
+        return (round(lat, self.precision), round(lng, self.precision))
+
+    @staticmethod
+    def _address_key(address: str) -> str:
+        return re.sub(r'\s+', ' ', address).strip().lower()
+
+    async def geocode(self, address: str) -> Optional[Dict[str, Any]]:
+        """
+        주소를 좌표로 변환합니다. (캐시 우선, 캐시 미스는 배처에서 중복 제거 후 호출)
+        {'latitude', 'longitude', 'address': 정규화된 주소, 'provider'} 를 반환합니다.
+        """
+        key = self._address_key(address)
+        if not key:
+            return None
+
+        cached = self.forward_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            return await self.forward_batcher.submit(key, address)
+        except asyncio.TimeoutError:
+            # 이 요청의 데드라인 초과 (배치 조회는 계속 진행되어 캐시에 반영됨)
+            logger.warning(f"Geocoding deadline exceeded: {address}")
+            return None
+
+    async def geocode_many(self, addresses: List[str]) -> List[Optional[Dict[str, Any]]]:
+        """
+        여러 주소를 동시에 변환합니다. (배처가 중복 제거 및 병렬도 제한)
+        """
+        return await asyncio.gather(*(self.geocode(address) for address in addresses))
+
+    async def _resolve_forward(self, key: str, address: str) -> Optional[Dict[str, Any]]:
+        result = None
+        try:
+            result = await self._run_providers('forward', {
+                'naver': lambda: self._naver_geocode(address),
+                'kakao': lambda: self._kakao_geocode(address),
+            })
+            if result:
+                self.forward_cache.set(key, result)
+                # 같은 좌표의 역지오코딩도 캐시에서 바로 응답
+                coordinate_key = self._coordinate_key(result['latitude'], result['longitude'])
+                if result.get('address') and self.reverse_cache.get(coordinate_key, _count=False) is None:
+                    self.reverse_cache.set(coordinate_key, result['address'])
+        except Exception as e:
+            logger.warning(f"Error geocoding {address}: {str(e)}")
+
+        return result
+
+    async def _run_providers(self, kind: str,
+                             calls: Dict[str, Callable[[], Awaitable[Optional[Any]]]]) -> Optional[Any]:
+        """
+        설정된 전략으로 제공자들을 호출해 첫 번째 유효한 결과를 반환합니다.
+        """
+        names = [name for name in self._provider_order(kind) if name in calls]
+        if not names:
+            return None
+
+        if self.strategy == 'race' and len(names) > 1:
+            return await self._race(names, calls)
+
+        for name in names:
+            result = await self._call_provider(name, calls[name])
+            if result:
+                return result
+
+        return None
+
+    async def _race(self, names: List[str],
+                    calls: Dict[str, Callable[[], Awaitable[Optional[Any]]]]) -> Optional[Any]:
+        tasks = [asyncio.ensure_future(self._call_provider(name, calls[name])) for name in names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                result = await next_done
+                if result:
+                    return result
+            return None
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def _call_provider(self, name: str, call: Callable[[], Awaitable[Optional[Any]]]) -> Optional[Any]:
+        stats = self.provider_stats[name]
+        try:
+            result = await call()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            stats['errors'] += 1
+            logger.warning(f"{name} geocoding failed: {str(e)}")
+            return None
+
+        stats['wins' if result else 'empty'] += 1
+        return result
+
+    def _provider_order(self, kind: str) -> List[str]:
+        """
+        키가 설정된 제공자를 (서킷 열림 여부, 관측 지연 p50, 설정 순서) 로 정렬합니다.
+        """
+        policies = {
+            'naver': 'naver_geocode' if kind == 'forward' else 'naver_reverse',
+            'kakao': 'kakao_local',
+        }
+        configured = {'naver': bool(self.naver_client_id), 'kakao': bool(self.kakao_api_key)}
+
+        def health(item: Tuple[int, str]) -> Tuple[bool, float, int]:
+            index, name = item
+            policy = upstream_governor.policies.get(policies[name])
+            if policy is None:
+                return (False, float('inf'), index)
+            # 지연 표본이 없는 제공자는 측정된 정상 제공자 뒤에서 설정 순서대로
+            latency = policy.latency_percentile(50)
+            return (policy.breaker.state == 'open', latency if latency is not None else float('inf'), index)
+
+        candidates = [
+            (index, name) for index, name in enumerate(self.providers)
+            if name in policies and configured.get(name)
+        ]
+        return [name for _, name in sorted(candidates, key=health)]
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            'strategy': self.strategy,
+            'provider_order': {kind: self._provider_order(kind) for kind in ('forward', 'reverse')},
+            'providers': self.provider_stats,
+            'forward_cache': self.forward_cache.stats(),
+            'reverse_cache': self.reverse_cache.stats(),
+            'forward_batcher': self.forward_batcher.stats(),
+            'reverse_batcher': self.reverse_batcher.stats(),
+        }
+
+    def reverse_geocode_region(self, lat: float, lng: float) -> Optional[Dict[str, str]]:
+        """
+        행정구역 수준(시/도, 시/군/구, 읍/면/동) 역지오코딩 - 로컬 경계 데이터만 사용
+        """
+        return region_geocoder_service.lookup(lat, lng)
+
+    async def reverse_geocode(self, lat: float, lng: float) -> Optional[str]:
+        """
+        좌표를 한글 주소로 변환합니다. (캐시 우선, 캐시 미스는 배처에서 중복 제거 후 호출)
+        도로명 주소를 얻지 못하면 로컬 행정구역 주소로 대체합니다.
+        """
+        key = self._coordinate_key(lat, lng)
+
+        cached = self.reverse_cache.get(key)
+        if cached is not None:
+            return cached
+
+        try:
+            return await self.reverse_batcher.submit(key)
+        except asyncio.TimeoutError:
+            logger.warning(f"Reverse geocoding deadline exceeded: {lat}, {lng}")
+            return region_geocoder_service.lookup_address(key[0], key[1])
+
+    async def reverse_geocode_many(self, coordinates: List[Tuple[float, float]]) -> List[Optional[str]]:
+        """
+        여러 좌표를 동시에 변환합니다. 캐시 미스만 배처를 거쳐 max_concurrency 한도 내에서 병렬 호출됩니다.
+        """
+        return await asyncio.gather(*(self.reverse_geocode(lat, lng) for lat, lng in coordinates))
+
+    async def _resolve_reverse(self, key: Tuple[float, float], _payload: Any = None) -> Optional[str]:
+        address = None
+        try:
+            address = await self._run_providers('reverse', {
+                'naver': lambda: self._naver_reverse_geocode(key[0], key[1]),
+                'kakao': lambda: self._kakao_reverse_geocode(key[0], key[1]),
+            })
+            if address:
+                self.reverse_cache.set(key, address)
+        except Exception as e:
+            logger.warning(f"Error reverse geocoding {key[0]}, {key[1]}: {str(e)}")
+
+        if not address:
+            address = region_geocoder_service.lookup_address(key[0], key[1])
+
+        return address
+
+    async def _naver_reverse_geocode(self, lat: float, lng: float) -> Optional[str]:
+        """
+        Get Korean address using Naver Maps Reverse Geocoding API
+        """
+        headers = self._naver_headers()
+
+        params = {
+            'coords': f"{lng},{lat}",
+            'sourcecrs': 'epsg:4326',
+            'targetcrs': 'epsg:4326',
+            'orders': 'roadaddr,addr'
+        }
+
+        response = await http_clients.request('naver_reverse', 'GET',
+            self.naver_reverse_geocoding_url,
+            headers=headers,
+            params=params
+        )
+
+        if response.status_code != 200:
+            return None
+
+        # Prefer road address over land address
+        for result in response.json().get('results', []):
+            if result.get('name') == 'roadaddr':
+                region = result.get('region', {})
+                land = result.get('land', {})
+
+                # Build Korean address
+                address_parts = []
+                for area in ('area1', 'area2', 'area3'):
+                    if region.get(area, {}).get('name'):
+                        address_parts.append(region[area]['name'])
+                if land.get('name'):
+                    address_parts.append(land['name'])
+                if land.get('number1'):
+                    address_parts.append(land['number1'])
+
+                return ' '.join(address_parts)
+
+        return None
+
+    async def _kakao_reverse_geocode(self, lat: float, lng: float) -> Optional[str]:
+        """
+        Get Korean address using Kakao Local coord2address API
+        """
+        response = await http_clients.request('kakao_local', 'GET',
+            f"{self.kakao_base_url}/geo/coord2address.json",
+            headers=self._kakao_headers(),
+            params={'x': lng, 'y': lat, 'input_coord': 'WGS84'}
+        )
+
+        if response.status_code != 200:
+            return None
+
+        for document in response.json().get('documents', []):
+            road_address = document.get('road_address') or {}
+            address = document.get('address') or {}
+            return road_address.get('address_name') or address.get('address_name') or None
+
+        return None
+
+    async def _naver_geocode(self, address: str) -> Optional[Dict[str, Any]]:
+        """
+        Convert address to coordinates using Naver Maps Geocoding API
+        """
+        response = await http_clients.request('naver_geocode', 'GET',
+            self.naver_geocoding_url,
+            headers=self._naver_headers(),
+            params={'query': address}
+        )
+
+        if response.status_code != 200:
+            return None
+
+        for result in response.json().get('addresses', []):
+            if result.get('x') and result.get('y'):
+                return {
+                    'latitude': float(result['y']),
+                    'longitude': float(result['x']),
+                    'address': result.get('roadAddress') or result.get('jibunAddress') or address,
+                    'provider': 'naver'
+                }
+
+        return None
+
+    async def _kakao_geocode(self, address: str) -> Optional[Dict[str, Any]]:
+        """
+        Convert address to coordinates using Kakao Local address search API
+        """
+        response = await http_clients.request('kakao_local', 'GET',
+            f"{self.kakao_base_url}/search/address.json",
+            headers=self._kakao_headers(),
+            params={'query': address}
+        )
+
+        if response.status_code != 200:
+            return None
+
+        for document in response.json().get('documents', []):
+            if document.get('x') and document.get('y'):
+                road_address = document.get('road_address') or {}
+                return {
+                    'latitude': float(document['y']),
+                    'longitude': float(document['x']),
+                    'address': road_address.get('address_name') or document.get('address_name') or address,
+                    'provider': 'kakao'
+                }
+
+        return None
+
+    def _naver_headers(self) -> Dict[str, str]:
+        return {
+            'X-NCP-APIGW-API-KEY-ID': self.naver_client_id or '',
+            'X-NCP-APIGW-API-KEY': self.naver_client_secret or ''
+        }
+
+    def _kakao_headers(self) -> Dict[str, str]:
+        return {'Authorization': f"KakaoAK {self.kakao_api_key}"}
+
+
+# Service instance
+geocoding_service = GeocodingService()
@@ -1,4 +1,4 @@
-import httpx
+import asyncio
 import logging
 from typing import List, Dict, Any, Optional
 from datetime import datetime
@@ -6,6 +6,9 @@ import math
 import json
 
 from config import settings
+from services.http_client_service import http_clients
+from services.geocoding_service import geocoding_service
+from services.region_geocoder_service import region_geocoder_service
 from models import User
 
 logger = logging.getLogger(__name__)
@@ -19,7 +22,6 @@ class HeritageService:
         # Naver Maps API for enhanced location services
         self.naver_client_id = settings.NAVER_CLIENT_ID
         self.naver_client_secret = settings.NAVER_CLIENT_SECRET
-        self.naver_geocoding_url = "https://naveropenapi.apigw.ntruss.com/map-geocode/v2/geocode"
         self.naver_reverse_geocoding_url = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
         self.naver_search_url = "https://openapi.naver.com/v1/search/local.json"
         
@@ -36,6 +38,13 @@ class HeritageService:
             '시도무형문화재': {'priority': 5, 'description': '지방 전통 기술이나 예능', 'code': '22'},
             '문화재자료': {'priority': 4, 'description': '향토문화 보존상 필요한 자료', 'code': '23'}
         }
+        
+        # Cultural Property API region codes (ccbaCtcd) by short province name
+        self.region_codes = {
+            '서울': '11', '부산': '21', '대구': '22', '인천': '23', '광주': '24', '대전': '25',
+            '울산': '26', '세종': '45', '경기': '31', '강원': '32', '충북': '33', '충남': '34',
+            '전북': '35', '전남': '36', '경북': '37', '경남': '38', '제주': '50'
+        }
     
     async def get_heritage_recommendations(self, latitude: float, longitude: float,
                                          radius: int = 5000, user: Optional[User] = None,
@@ -73,37 +82,62 @@ class HeritageService:
         Get heritage sites from Cultural Property API
         """
         try:
-            sites = []
-            
-            async with httpx.AsyncClient(timeout=15.0) as client:
-                # Search for different heritage categories
-                for category_name, category_info in self.heritage_categories.items():
-                    try:
-                        params = {
-                            'serviceKey': self.cultural_property_api_key,
-                            'ccbaCpno': category_info['code'],
-                            'pageUnit': 100,
-                            'pageIndex': 1,
-                            'ccbaCtcd': '',  # All regions
-                            'ccbaAsno': '',  # All designation numbers
-                            'ccbaCncl': 'N'  # Not cancelled
-                        }
-                        
-                        response = await client.get(self.cultural_property_base_url, params=params)
-                        
-                        if response.status_code == 200:
-                            # Parse XML response
-                            sites_data = await self._parse_cultural_property_xml(response.text, category_name)
-                            
-                            # Filter by distance and enhance with coordinates
-                            for site in sites_data:
-                                enhanced_site = await self._enhance_site_with_coordinates(site, lat, lng, radius)
-                                if enhanced_site:
-                                    sites.append(enhanced_site)
-                                    
-                    except Exception as e:
-                        logger.warning(f"Error fetching {category_name} sites: {str(e)}")
-                        continue
+            async def fetch_category(category_name: str, category_info: Dict[str, Any]) -> List[Dict[str, Any]]:
+                try:
+                    params = {
+                        'serviceKey': self.cultural_property_api_key,
+                        'ccbaCpno': category_info['code'],
+                        'pageUnit': 100,
+                        'pageIndex': 1,
+                        'ccbaCtcd': '',  # All regions
+                        'ccbaAsno': '',  # All designation numbers
+                        'ccbaCncl': 'N'  # Not cancelled
+                    }
+                    
+                    response = await http_clients.request('cha', 'GET', self.cultural_property_base_url, params=params)
+                    
+                    if response.status_code != 200:
+                        return []
+                    
+                    # Parse XML response
+                    return await self._parse_cultural_property_xml(response.text, category_name)
+                    
+                except Exception as e:
+                    logger.warning(f"Error fetching {category_name} sites: {str(e)}")
+                    return []
+            
+            # Search for different heritage categories concurrently
+            category_sites = await asyncio.gather(*(
+                fetch_category(category_name, category_info)
+                for category_name, category_info in self.heritage_categories.items()
+            ))
+            candidates = [site for sites_in_category in category_sites for site in sites_in_category]
+            
+            # Geocode at most HERITAGE_MAX_GEOCODES sites (up to 10 categories x 100 items nationwide
+            # would far exceed the geocoding quota and request deadline). Sites in the user's
+            # city/district come first, then the user's province, then category priority;
+            # the remaining sites are dropped without being geocoded.
+            if len(candidates) > settings.HERITAGE_MAX_GEOCODES:
+                region = region_geocoder_service.lookup(lat, lng)
+                candidates.sort(
+                    key=lambda site: (
+                        self._region_match(site, region),
+                        self.heritage_categories[site['category']]['priority']
+                    ),
+                    reverse=True
+                )
+                logger.info(
+                    f"Geocoding {settings.HERITAGE_MAX_GEOCODES} of {len(candidates)} heritage sites "
+                    f"near {region_geocoder_service.lookup_address(lat, lng) or 'unknown region'}"
+                )
+                candidates = candidates[:settings.HERITAGE_MAX_GEOCODES]
+            
+            # Filter by distance and enhance with coordinates
+            # (geocoding lookups are micro-batched and deduplicated by geocoding_service)
+            enhanced_sites = await asyncio.gather(*(
+                self._enhance_site_with_coordinates(site, lat, lng, radius) for site in candidates
+            ))
+            sites = [site for site in enhanced_sites if site]
             
             return sites
             
@@ -111,6 +145,29 @@ class HeritageService:
             logger.error(f"Error fetching Cultural Property sites: {str(e)}")
             return []
     
+    def _region_match(self, site: Dict[str, Any], region: Optional[Dict[str, str]]) -> int:
+        """
+        How closely a site's region matches the user's: 2 = same city/district, 1 = same province, 0 = other
+        """
+        if not region or not region.get('area1'):
+            return 0
+        
+        area1 = region['area1']
+        # 서울특별시 -> 서울, 충청북도 -> 충북, 전북특별자치도 -> 전북
+        short_name = area1[0] + area1[2] if len(area1) > 2 and area1[1] in '청라상' else area1[:2]
+        address = site.get('address', '')
+        
+        same_province = (
+            site.get('ccba_ctcd') == self.region_codes.get(short_name)
+            or address.startswith((area1, short_name))
+        )
+        if not same_province:
+            return 0
+        
+        # "수원시 장안구" -> "수원시"
+        district = region.get('area2', '').split(' ')[0]
+        return 2 if district and district in address else 1
+    
     async def _parse_cultural_property_xml(self, xml_content: str, category: str) -> List[Dict[str, Any]]:
         """
         Parse XML response from Cultural Property API
@@ -233,75 +290,49 @@ class HeritageService:
         Search for location information using Naver Local Search API
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {
-                    'X-Naver-Client-Id': self.naver_client_id,
-                    'X-Naver-Client-Secret': self.naver_client_secret
-                }
-                
-                # Combine query with address for better results
-                search_query = f"{query} {address}".strip()
-                
-                params = {
-                    'query': search_query,
-                    'display': 5,
-                    'start': 1,
-                    'sort': 'random'
-                }
-                
-                response = await client.get(self.naver_search_url, headers=headers, params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    items = data.get('items', [])
-                    
-                    if items:
-                        # Return the first (most relevant) result
-                        return items[0]
-                
-                return None
+            headers = {
+                'X-Naver-Client-Id': self.naver_client_id,
+                'X-Naver-Client-Secret': self.naver_client_secret
+            }
+            
+            # Combine query with address for better results
+            search_query = f"{query} {address}".strip()
+            
+            params = {
+                'query': search_query,
+                'display': 5,
+                'start': 1,
+                'sort': 'random'
+            }
+            
+            response = await http_clients.request('naver_search', 'GET', self.naver_search_url, headers=headers, params=params)
+            
+            if response.status_code == 200:
+                data = response.json()
+                items = data.get('items', [])
                 
+                if items:
+                    # Return the first (most relevant) result
+                    return items[0]
+            
+            return None
+            
         except Exception as e:
             logger.warning(f"Error searching Naver local: {str(e)}")
             return None
     
     async def _geocode_address(self, address: str) -> Optional[Dict[str, float]]:
         """
-        Convert address to coordinates using Naver Maps Geocoding API
+        Convert address to coordinates (Naver/Kakao geocoding facade, cached)
         """
-        try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                headers = {
-                    'X-NCP-APIGW-API-KEY-ID': self.naver_client_id,
-                    'X-NCP-APIGW-API-KEY': self.naver_client_secret
-                }
-                
-                params = {
-                    'query': address
-                }
-                
-                response = await client.get(
-                    self.naver_geocoding_url,
-                    headers=headers,
-                    params=params
-                )
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    addresses = data.get('addresses', [])
-                    
-                    if addresses:
-                        first_result = addresses[0]
-                        return {
-                            'latitude': float(first_result.get('y', 0)),
-                            'longitude': float(first_result.get('x', 0))
-                        }
-                
-                return None
-                
-        except Exception as e:
-            logger.error(f"Error geocoding address: {str(e)}")
+        result = await geocoding_service.geocode(address)
+        if not result:
             return None
+        
+        return {
+            'latitude': result['latitude'],
+            'longitude': result['longitude']
+        }
     
     async def search_heritage_by_name(self, query: str, latitude: float, longitude: float, 
                                     radius: int = 10000) -> List[Dict[str, Any]]:
@@ -334,29 +365,28 @@ class HeritageService:
         Get detailed information for a KTO content item
         """
         try:
-            async with httpx.AsyncClient(timeout=10.0) as client:
-                params = {
-                    'serviceKey': self.kto_api_key,
-                    'contentId': content_id,
-                    'MobileOS': 'ETC',
-                    'MobileApp': 'HistoricalPlaceApp',
-                    '_type': 'json'
-                }
-                
-                # Get common info
-                response = await client.get(f"{self.kto_base_url}/detailCommon1", params=params)
-                
-                if response.status_code == 200:
-                    data = response.json()
-                    item = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
-                    
-                    if isinstance(item, list) and item:
-                        return item[0]
-                    elif isinstance(item, dict):
-                        return item
-                
-                return {}
+            params = {
+                'serviceKey': self.kto_api_key,
+                'contentId': content_id,
+                'MobileOS': 'ETC',
+                'MobileApp': 'HistoricalPlaceApp',
+                '_type': 'json'
+            }
+            
+            # Get common info
+            response = await http_clients.request('kto', 'GET', f"{self.kto_base_url}/detailCommon1", params=params)
+            
+            if response.status_code == 200:
+                data = response.json()
+                item = data.get('response', {}).get('body', {}).get('items', {}).get('item', [])
                 
+                if isinstance(item, list) and item:
+                    return item[0]
+                elif isinstance(item, dict):
+                    return item
+            
+            return {}
+            
         except Exception as e:
             logger.warning(f"Error getting KTO detail info for {content_id}: {str(e)}")
             return {}
@@ -0,0 +1,186 @@
+"""
+공유 HTTP 클라이언트 레지스트리
+업스트림별 커넥션 풀(keep-alive, HTTP/2)을 앱 lifespan 동안 유지
+"""
+import logging
+from typing import Any, Dict
+from urllib.parse import urlsplit
+
+import httpx
+
+from config import settings
+from services.upstream_governor_service import upstream_governor
+from utils.deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+try:
+    import h2  # noqa: F401  (httpx[http2])
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+# 업스트림별 풀/타임아웃 설정
+#   max_connections: 동시 연결 수 상한, timeout: 전체 요청 타임아웃(초), http2: 서버 지원 여부
+UPSTREAMS: Dict[str, Dict[str, Any]] = {
+    'naver_maps': {'max_connections': 50, 'timeout': 5.0, 'http2': True},      # naveropenapi.apigw.ntruss.com
+    'naver_search': {'max_connections': 20, 'timeout': 5.0, 'http2': True},    # openapi.naver.com
+    'kakao_local': {'max_connections': 50, 'timeout': 5.0, 'http2': True},     # dapi.kakao.com
+    'cha': {'max_connections': 10, 'timeout': 15.0, 'http2': False},           # www.cha.go.kr
+    'kto': {'max_connections': 10, 'timeout': 10.0, 'http2': False},           # apis.data.go.kr
+    'openrestroom': {'max_connections': 5, 'timeout': 15.0, 'http2': False},   # www.refugerestrooms.org
+    'google_vision': {'max_connections': 20, 'timeout': 15.0, 'http2': True},  # vision.googleapis.com
+    'oauth': {'max_connections': 20, 'timeout': 10.0, 'http2': True},          # kapi.kakao.com, googleapis, nid
+}
+
+# 같은 커넥션 풀을 쓰지만 쿼터/거버너 정책은 따로 두는 엔드포인트
+ENDPOINT_POOLS: Dict[str, str] = {
+    'naver_geocode': 'naver_maps',
+    'naver_reverse': 'naver_maps',
+}
+
+
+class HTTPClientRegistry:
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+        self._request_counts: Dict[str, int] = {}
+
+    async def start(self) -> None:
+        """
+        모든 업스트림 클라이언트를 생성합니다. (앱 시작 시)
+        """
+        for name in UPSTREAMS:
+            self.get(name)
+
+        logger.info(f"HTTP clients started: {list(self._clients)} (http2={HTTP2_AVAILABLE})")
+
+    async def close(self) -> None:
+        """
+        모든 커넥션 풀을 닫습니다. (앱 종료 시)
+        """
+        for name, client in list(self._clients.items()):
+            try:
+                await client.aclose()
+            except Exception as e:
+                logger.warning(f"Error closing HTTP client {name}: {e}")
+
+        self._clients.clear()
+
+    def get(self, upstream: str) -> httpx.AsyncClient:
+        """
+        업스트림용 공유 클라이언트를 반환합니다. (lifespan 밖에서 호출되면 지연 생성)
+        """
+        client = self._clients.get(upstream)
+        if client is None or client.is_closed:
+            client = self._create_client(upstream)
+            self._clients[upstream] = client
+        return client
+
+    async def request(self, endpoint: str, method: str, url: str, **kwargs) -> httpx.Response:
+        """
+        업스트림 거버너(속도 제한, 적응형 동시성, 서킷 브레이커)를 거쳐 요청합니다.
+        GET 요청은 마지막 정상 응답을 보관해 장애 시 대체 응답으로 사용하고,
+        느린 경우 헤지 요청을 보낼 수 있습니다.
+        요청 데드라인이 설정되어 있으면 타임아웃을 남은 시간 이내로 줄입니다.
+        """
+        upstream = ENDPOINT_POOLS.get(endpoint, endpoint)
+        client = self.get(upstream)
+        idempotent = method.upper() == 'GET'
+
+        cache_key = None
+        if idempotent:
+            params = kwargs.get('params') or {}
+            cache_key = (url, tuple(sorted((str(k), str(v)) for k, v in params.items())))
+
+        url = self._route(url)
+
+        def send():
+            # 헤지/재시도 시점마다 남은 시간으로 다시 계산
+            left = remaining()
+            if left is not None and 'timeout' not in kwargs:
+                return client.request(method, url, timeout=self._bounded_timeout(upstream, left), **kwargs)
+            return client.request(method, url, **kwargs)
+
+        return await upstream_governor.execute(endpoint, send, cache_key=cache_key, idempotent=idempotent)
+
+    def _route(self, url: str) -> str:
+        """
+        UPSTREAM_STANDIN_URL 이 설정되어 있으면 업스트림 URL을 대역 서버 경로
+        ({standin}/{원래 호스트}{원래 경로}) 로 바꿉니다. (오프라인 벤치마크용)
+        """
+        if not settings.UPSTREAM_STANDIN_URL:
+            return url
+
+        parts = urlsplit(url)
+        query = f"?{parts.query}" if parts.query else ''
+        return f"{settings.UPSTREAM_STANDIN_URL.rstrip('/')}/{parts.netloc}{parts.path}{query}"
+
+    def _bounded_timeout(self, upstream: str, left: float) -> httpx.Timeout:
+        left = max(left, 0.001)
+        profile = UPSTREAMS.get(upstream, {})
+        return httpx.Timeout(
+            min(profile.get('timeout', 10.0), left),
+            connect=min(settings.HTTP_CONNECT_TIMEOUT, left),
+            pool=min(settings.HTTP_POOL_TIMEOUT, left)
+        )
+
+    def _create_client(self, upstream: str) -> httpx.AsyncClient:
+        profile = UPSTREAMS.get(upstream, {})
+        max_connections = profile.get('max_connections', settings.HTTP_MAX_CONNECTIONS)
+
+        limits = httpx.Limits(
+            max_connections=max_connections,
+            max_keepalive_connections=max_connections,
+            keepalive_expiry=settings.HTTP_KEEPALIVE_EXPIRY
+        )
+        timeout = httpx.Timeout(
+            profile.get('timeout', 10.0),
+            connect=settings.HTTP_CONNECT_TIMEOUT,
+            pool=settings.HTTP_POOL_TIMEOUT
+        )
+
+        self._request_counts.setdefault(upstream, 0)
+
+        async def count_request(request: httpx.Request) -> None:
+            self._request_counts[upstream] += 1
+
+        return httpx.AsyncClient(
+            limits=limits,
+            timeout=timeout,
+            http2=HTTP2_AVAILABLE and profile.get('http2', False),
+            event_hooks={'request': [count_request]}
+        )
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        """
+        업스트림별 커넥션 풀 사용 현황
+        """
+        result = {}
+
+        for name, client in self._clients.items():
+            profile = UPSTREAMS.get(name, {})
+            connections = self._pool_connections(client)
+            idle = sum(1 for connection in connections if connection.is_idle())
+            max_connections = profile.get('max_connections', settings.HTTP_MAX_CONNECTIONS)
+
+            result[name] = {
+                'max_connections': max_connections,
+                'open_connections': len(connections),
+                'active_connections': len(connections) - idle,
+                'idle_connections': idle,
+                'utilization': round((len(connections) - idle) / max_connections, 3),
+                'requests_total': self._request_counts.get(name, 0),
+                'http2': HTTP2_AVAILABLE and profile.get('http2', False),
+                'closed': client.is_closed
+            }
+
+        return result
+
+    def _pool_connections(self, client: httpx.AsyncClient) -> list:
+        # httpx는 풀 상태를 공개하지 않으므로 httpcore 커넥션 풀을 직접 조회
+        pool = getattr(getattr(client, '_transport', None), '_pool', None)
+        return list(getattr(pool, 'connections', []) or [])
+
+
+# Registry instance
+http_clients = HTTPClientRegistry()
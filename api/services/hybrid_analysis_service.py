@@ -4,6 +4,7 @@ GenAI + 기존 Vision API + 카카오맵 최적 조합
 """
 import logging
 from typing import Dict, List, Any, Optional
+from services.analysis_context import AnalysisContext
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +16,21 @@ class HybridAnalysisService:
             'residential': self._analyze_residential_strategy,
             'traditional': self._analyze_traditional_strategy
         }
+        # 전략별로 사용하는 공통 단계 (GenAI 분류 중 미리 시작한 단계 중 나머지는 취소)
+        self.strategy_stages = {
+            'landmark': ('texts', 'business_names', 'place_by_coordinates'),
+            'commercial': ('texts', 'business_names', 'place_by_coordinates'),
+            'residential': ('place_by_coordinates',),
+            'traditional': ('texts', 'business_names', 'place_by_coordinates')
+        }
+    
+    def _start_shared_stages(self, memo: AnalysisContext, gps_info: Dict) -> None:
+        """
+        전략과 무관하게 필요한 단계(OCR, GPS 위치 조회)를 GenAI 분류와 동시에 시작합니다.
+        """
+        memo.prefetch(memo.texts())
+        if gps_info:
+            memo.prefetch(memo.place_by_coordinates(gps_info['latitude'], gps_info['longitude']))
     
     async def analyze_with_optimal_strategy(
         self, 
@@ -24,24 +40,31 @@ class HybridAnalysisService:
         """
         최적 전략으로 이미지 분석
         """
+        # 요청 단위 단계 메모: 전략/대체 분석이 같은 단계를 다시 실행하지 않음
+        memo = AnalysisContext(image_bytes)
+        
+        # GenAI 지연 동안 공통 단계를 먼저 실행 (GenAI 가 임계 경로에서 빠짐)
+        self._start_shared_stages(memo, gps_info)
         try:
             # 1단계: GenAI로 장소 유형 및 맥락 파악
             from services.genai_vision_service import genai_vision_service
             context_analysis = await genai_vision_service.analyze_place_context(image_bytes, gps_info)
             
             if not context_analysis.get('success'):
-                return await self._fallback_analysis(image_bytes, gps_info)
+                return await self._fallback_analysis(image_bytes, gps_info, memo)
             
             place_analysis = context_analysis['place_analysis']
             place_category = place_analysis.get('place_category', 'commercial')
+            if place_category not in self.analysis_strategies:
+                place_category = 'commercial'
             
-            # 2단계: 장소 유형에 따른 최적 분석 전략 선택
-            strategy_func = self.analysis_strategies.get(
-                place_category, 
-                self._analyze_commercial_strategy
-            )
+            # 2단계: 장소 유형에 따른 최적 분석 전략 선택, 필요 없는 단계는 취소
+            strategy_func = self.analysis_strategies[place_category]
+            cancelled = memo.cancel(keep=self.strategy_stages[place_category])
+            if cancelled:
+                logger.info(f"전략 '{place_category}': 미리 시작한 단계 취소 {cancelled}")
             
-            detailed_analysis = await strategy_func(image_bytes, gps_info, place_analysis)
+            detailed_analysis = await strategy_func(image_bytes, gps_info, place_analysis, memo)
             
             return {
                 'success': True,
@@ -50,24 +73,36 @@ class HybridAnalysisService:
                 'detailed_analysis': detailed_analysis,
                 'final_recommendation': self._generate_final_recommendation(
                     place_analysis, detailed_analysis
-                )
+                ),
+                'stage_memo': memo.stats()
             }
             
         except Exception as e:
             logger.error(f"하이브리드 분석 실패: {e}")
-            return await self._fallback_analysis(image_bytes, gps_info)
+            return await self._fallback_analysis(image_bytes, gps_info, memo)
+        finally:
+            # 전략이 기다리지 않은 단계가 백그라운드에 남지 않도록
+            memo.close()
+    
+    def _comprehensive(self, image_bytes: bytes, gps_info: Dict, memo: AnalysisContext):
+        """통합 분석 결과 (랜드마크/전통 전략과 대체 분석이 공유)"""
+        from services.integrated_analysis_service import integrated_analysis_service
+        
+        return memo.memo(
+            'comprehensive',
+            lambda: integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info, memo)
+        )
     
     async def _analyze_landmark_strategy(
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        memo: AnalysisContext
     ) -> Dict[str, Any]:
         """랜드마크 분석 전략"""
         # AWS Rekognition 중심 + GPS 보조
-        from services.integrated_analysis_service import integrated_analysis_service
-        
-        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info)
+        result = await self._comprehensive(image_bytes, gps_info, memo)
         
         return {
             'strategy': 'landmark_focused',
@@ -81,29 +116,25 @@ class HybridAnalysisService:
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        memo: AnalysisContext
     ) -> Dict[str, Any]:
         """상업지역 분석 전략 (상가거리, 쇼핑몰 등)"""
         # 텍스트 추출 + 카카오맵 검색 중심
-        from services.vision_service import google_vision_service
-        from services.kakao_service import kakao_service
-        
-        # 1. 텍스트 추출
-        texts = await google_vision_service.extract_korean_text(image_bytes)
-        business_names = google_vision_service.extract_business_names(texts)
+        # 1. 텍스트 추출 (미리 시작한 단계)
+        texts = await memo.texts()
+        business_names = await memo.business_names()
         
         # 2. GPS 기반 위치 정보
         location_info = None
         if gps_info:
-            location_info = await kakao_service.get_place_by_coordinates(
-                gps_info['latitude'], gps_info['longitude']
-            )
+            location_info = await memo.place_by_coordinates(gps_info['latitude'], gps_info['longitude'])
         
         # 3. 텍스트 기반 장소 검색
         text_based_places = []
         if business_names and gps_info:
             for name in business_names[:3]:
-                place = await kakao_service.search_place_by_keyword(
+                place = await memo.place_by_keyword(
                     name, gps_info['latitude'], gps_info['longitude']
                 )
                 if place:
@@ -127,25 +158,22 @@ class HybridAnalysisService:
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        memo: AnalysisContext
     ) -> Dict[str, Any]:
         """주거지역 분석 전략"""
         # GPS 중심 + 주변 시설 검색
-        from services.kakao_service import kakao_service
-        
         location_info = None
         nearby_facilities = []
         
         if gps_info:
-            # 기본 위치 정보
-            location_info = await kakao_service.get_place_by_coordinates(
-                gps_info['latitude'], gps_info['longitude']
-            )
+            # 기본 위치 정보 (미리 시작한 단계)
+            location_info = await memo.place_by_coordinates(gps_info['latitude'], gps_info['longitude'])
             
             # 주변 편의시설 검색
             facility_keywords = ['편의점', '마트', '병원', '학교', '공원']
             for keyword in facility_keywords:
-                facility = await kakao_service.search_place_by_keyword(
+                facility = await memo.place_by_keyword(
                     keyword, gps_info['latitude'], gps_info['longitude']
                 )
                 if facility:
@@ -167,13 +195,12 @@ class HybridAnalysisService:
         self, 
         image_bytes: bytes, 
         gps_info: Dict, 
-        context: Dict
+        context: Dict,
+        memo: AnalysisContext
     ) -> Dict[str, Any]:
         """전통시장/문화재 분석 전략"""
         # 통합 분석 (모든 방법 조합)
-        from services.integrated_analysis_service import integrated_analysis_service
-        
-        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info)
+        result = await self._comprehensive(image_bytes, gps_info, memo)
         
         return {
             'strategy': 'traditional_comprehensive',
@@ -182,11 +209,14 @@ class HybridAnalysisService:
             'result': result
         }
     
-    async def _fallback_analysis(self, image_bytes: bytes, gps_info: Dict) -> Dict[str, Any]:
+    async def _fallback_analysis(
+        self, 
+        image_bytes: bytes, 
+        gps_info: Dict, 
+        memo: AnalysisContext
+    ) -> Dict[str, Any]:
         """GenAI 실패 시 대체 분석"""
-        from services.integrated_analysis_service import integrated_analysis_service
-        
-        result = await integrated_analysis_service.analyze_image_comprehensive(image_bytes, gps_info)
+        result = await self._comprehensive(image_bytes, gps_info, memo)
         
         return {
             'success': True,
@@ -0,0 +1,159 @@
+"""
+비전 API 전송용 이미지 파생본 생성
+EXIF 방향을 적용하고 제공자별 최적 해상도로 축소/재인코딩한 결과를 콘텐츠 해시별로 캐시합니다.
+원본(수 MB, 12MP)을 그대로 보내지 않으므로 업로드 바이트, 제공자 지연, 페이로드 크기 오류가 줄어듭니다.
+
+제공자 프로필은 IMAGE_DERIVATIVE_PROFILES(JSON)로 덮어쓸 수 있습니다.
+    IMAGE_DERIVATIVE_PROFILES='{"google_vision": {"max_side": 2048}}'
+"""
+import asyncio
+import hashlib
+import io
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+from PIL import Image, ImageOps
+from config import settings
+from services.process_pool_service import cpu_pool
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+# 파생본이 원본과 같을 때(통과/변환 실패) 원본 bytes 대신 캐시하는 표시값
+_USE_ORIGINAL = object()
+
+# 제공자별 긴 변 최대 픽셀 / JPEG 품질 / 요청 본문 한도
+DEFAULT_PROFILES: Dict[str, Dict[str, Any]] = {
+    # TEXT_DETECTION 은 1024x768 이상이면 충분, 작은 간판 글자를 위해 여유
+    'google_vision': {'max_side': 1600, 'quality': 85, 'max_bytes': 10 * 1024 * 1024},
+    # Textract 동기 API 는 Bytes 5MB 제한
+    'textract': {'max_side': 2000, 'quality': 85, 'max_bytes': 5 * 1024 * 1024},
+    'rekognition': {'max_side': 1920, 'quality': 85, 'max_bytes': 5 * 1024 * 1024},
+    'genai': {'max_side': 1568, 'quality': 85, 'max_bytes': 5 * 1024 * 1024}
+}
+
+def _load_profiles() -> Dict[str, Dict[str, Any]]:
+    profiles = {name: dict(profile) for name, profile in DEFAULT_PROFILES.items()}
+    if not settings.IMAGE_DERIVATIVE_PROFILES:
+        return profiles
+    try:
+        for name, overrides in json.loads(settings.IMAGE_DERIVATIVE_PROFILES).items():
+            profiles.setdefault(name, dict(DEFAULT_PROFILES['google_vision'])).update(overrides)
+    except (ValueError, AttributeError):
+        logger.warning("Invalid IMAGE_DERIVATIVE_PROFILES, using defaults")
+    return profiles
+
+def render_derivative(image_bytes: bytes, max_side: int, quality: int, max_bytes: int) -> Tuple[bytes, bool]:
+    """
+    (파생본, 재인코딩 여부)를 반환합니다. 이미 조건을 만족하는 JPEG 는 그대로 사용합니다.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    orientation = image.getexif().get(0x0112, 1)
+
+    if (image.format == 'JPEG' and orientation == 1 and max(image.size) <= max_side
+            and len(image_bytes) <= max_bytes):
+        return image_bytes, False
+
+    # JPEG 는 DCT 축소 디코딩으로 목표 크기 이상만 디코딩 (12MP -> 1/2, 1/4 ...)
+    image.draft('RGB', (max_side, max_side))
+    image = ImageOps.exif_transpose(image)
+    if image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+
+    # 한도를 넘으면 품질을 낮춰 재시도
+    while True:
+        buffer = io.BytesIO()
+        image.save(buffer, 'JPEG', quality=quality)
+        if buffer.tell() <= max_bytes or quality <= 50:
+            return buffer.getvalue(), True
+        quality -= 10
+
+def render_thumbnail(image_bytes: bytes, width: int, image_format: str, quality: int) -> bytes:
+    """
+    EXIF 방향을 적용하고 가로 width 이하로 축소해 WEBP/JPEG 로 인코딩합니다.
+    """
+    image = Image.open(io.BytesIO(image_bytes))
+    image.draft('RGB', (width, width))
+    image = ImageOps.exif_transpose(image)
+    if image_format == 'JPEG' and image.mode not in ('RGB', 'L'):
+        image = image.convert('RGB')
+    elif image.mode not in ('RGB', 'RGBA', 'L'):
+        image = image.convert('RGBA' if 'A' in image.getbands() else 'RGB')
+    image.thumbnail((width, image.height), Image.Resampling.LANCZOS)
+
+    buffer = io.BytesIO()
+    image.save(buffer, image_format, quality=quality)
+    return buffer.getvalue()
+
+def content_digest(image_bytes: bytes) -> str:
+    return hashlib.sha256(image_bytes).hexdigest()
+
+class ImageDerivativeService:
+    """
+    (콘텐츠 해시, 제공자) -> 파생본 캐시
+    """
+
+    def __init__(self):
+        self.profiles = _load_profiles()
+        self.cache = TTLCache(
+            maxsize=settings.IMAGE_DERIVATIVE_CACHE_SIZE,
+            ttl=settings.IMAGE_DERIVATIVE_CACHE_TTL,
+            max_bytes=settings.IMAGE_DERIVATIVE_CACHE_BYTES
+        )
+        self._inflight: Dict[Tuple[str, str], asyncio.Future] = {}
+        self.stats = {'rendered': 0, 'passthrough': 0, 'failed': 0, 'bytes_in': 0, 'bytes_out': 0}
+
+    async def derive(self, image_bytes: bytes, provider: str, content_hash: Optional[str] = None) -> bytes:
+        """
+        제공자용 파생본을 반환합니다. 변환에 실패하면 원본을 그대로 반환합니다.
+        """
+        profile = self.profiles.get(provider)
+        if profile is None or not image_bytes:
+            return image_bytes
+
+        # 원본 전체 해시는 이벤트 루프 밖에서 (hashlib 은 GIL 을 놓고 계산)
+        if content_hash is None:
+            content_hash = await asyncio.to_thread(content_digest, image_bytes)
+        key = (content_hash, provider)
+        cached = self.cache.get(key)
+        if cached is not None:
+            # 원본을 그대로 쓰는 경우는 원본 대신 표시값만 캐시되어 있음
+            return cached if cached is not _USE_ORIGINAL else image_bytes
+
+        # 같은 이미지를 여러 분석 단계가 동시에 요청하면 변환은 한 번만
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[key] = future
+        derivative = image_bytes
+        try:
+            derivative, rendered = await cpu_pool.run(
+                render_derivative, image_bytes, profile['max_side'], profile['quality'], profile['max_bytes']
+            )
+            self.stats['rendered' if rendered else 'passthrough'] += 1
+            self.stats['bytes_in'] += len(image_bytes)
+            self.stats['bytes_out'] += len(derivative)
+            self.cache.set(key, derivative if rendered else _USE_ORIGINAL)
+        except Exception as e:
+            # 디코딩할 수 없는 이미지는 실패를 기록해 같은 입력으로 반복 시도/로깅하지 않음
+            logger.warning(f"이미지 파생본 생성 실패 ({provider}), 원본 사용: {e}")
+            self.stats['failed'] += 1
+            self.cache.set(key, _USE_ORIGINAL)
+        finally:
+            self._inflight.pop(key, None)
+            # 취소되어도 대기 중인 다른 단계는 원본으로 계속 진행
+            future.set_result(derivative)
+
+        return derivative
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'byte_ratio': round(self.stats['bytes_out'] / self.stats['bytes_in'], 3) if self.stats['bytes_in'] else 0.0,
+            'cache': self.cache.stats()
+        }
+
+# 전역 파생본 서비스 인스턴스
+image_derivatives = ImageDerivativeService()
@@ -4,8 +4,8 @@ Rekognition + Textract + 카카오맵 + Google Vision 결합
 """
 import logging
 from typing import Dict, List, Optional, Any
-from services.vision_service import google_vision_service
-from services.kakao_service import kakao_service
+from services.analysis_context import AnalysisContext
+from utils.task_graph import TaskGraph
 
 logger = logging.getLogger(__name__)
 
@@ -16,11 +16,17 @@ class IntegratedAnalysisService:
     async def analyze_image_comprehensive(
         self, 
         image_bytes: bytes, 
-        gps_coords: Dict[str, float] = None
+        gps_coords: Dict[str, float] = None,
+        context: Optional[AnalysisContext] = None
     ) -> Dict[str, Any]:
         """
         종합적인 이미지 분석
+        context: 요청 단위 분석 컨텍스트 - 같은 요청에서 이미 실행한 단계는 다시 호출하지 않음
         """
+        owns_context = context is None
+        if owns_context:
+            context = AnalysisContext(image_bytes)
+        
         analysis_result = {
             'landmarks': [],
             'objects': [],
@@ -31,56 +37,79 @@ class IntegratedAnalysisService:
         }
         
         try:
-            # 1. AWS Rekognition으로 랜드마크 및 객체 인식
-            landmarks = await self._detect_landmarks_mock(image_bytes)
-            if landmarks:
-                analysis_result['landmarks'] = landmarks
+            # 독립 단계(Rekognition, OCR, GPS 조회)는 동시에 실행하고
+            # 텍스트 기반 장소 검색만 OCR 결과가 준비되면 시작
+            graph = TaskGraph()
+            
+            # 1. AWS Rekognition으로 랜드마크 및 객체 인식 (방향 보정 + 축소 파생본)
+            graph.add('rekognition_image', lambda: context.derivative('rekognition'))
+            graph.add('landmarks', lambda image: context.memo(
+                'landmarks', lambda: self._detect_landmarks_mock(image)
+            ), deps=('rekognition_image',))
+            graph.add('objects', lambda image: context.memo(
+                'objects', lambda: self._detect_objects_mock(image)
+            ), deps=('rekognition_image',))
+            
+            # 2. 텍스트 추출 (Google Vision 우선, Textract 보조)
+            graph.add('texts', context.texts)
+            graph.add('business_names', lambda texts: context.business_names(), deps=('texts',))
+            
+            # 3. GPS 기반 위치 정보
+            if gps_coords:
+                graph.add('location_info', lambda: context.place_by_coordinates(
+                    gps_coords['latitude'], 
+                    gps_coords['longitude']
+                ))
+            
+                # 4. 텍스트 기반 장소 검색 (상호명이 있는 경우)
+                async def search_text_places(business_names):
+                    if not business_names:
+                        return []
+                    return await self._search_places_by_text(business_names, gps_coords, context)
+                
+                graph.add('text_based_places', search_text_places, deps=('business_names',))
+            
+            stages = await graph.run()
+            
+            if stages['landmarks']:
+                analysis_result['landmarks'] = stages['landmarks']
                 analysis_result['analysis_methods'].append('rekognition_landmarks')
             
-            objects = await self._detect_objects_mock(image_bytes)
-            if objects:
-                analysis_result['objects'] = objects
+            if stages['objects']:
+                analysis_result['objects'] = stages['objects']
                 analysis_result['analysis_methods'].append('rekognition_objects')
             
-            # 2. 텍스트 추출 (Google Vision 우선, Textract 보조)
-            texts = await google_vision_service.extract_korean_text(image_bytes)
+            texts = stages['texts']
             if texts:
                 analysis_result['texts'] = texts
                 analysis_result['analysis_methods'].append('google_vision_text')
                 
                 # 상호명 추출
-                business_names = google_vision_service.extract_business_names(texts)
-                analysis_result['business_names'] = business_names
+                analysis_result['business_names'] = stages['business_names'] or []
             
-            # 3. GPS 기반 위치 정보
-            if gps_coords:
-                location_info = await kakao_service.get_place_by_coordinates(
-                    gps_coords['latitude'], 
-                    gps_coords['longitude']
-                )
-                if location_info:
-                    analysis_result['location_info'] = location_info.dict()
-                    analysis_result['analysis_methods'].append('kakao_gps')
+            location_info = stages.get('location_info')
+            if location_info:
+                analysis_result['location_info'] = location_info.dict()
+                analysis_result['analysis_methods'].append('kakao_gps')
             
-            # 4. 텍스트 기반 장소 검색 (상호명이 있는 경우)
-            if analysis_result['business_names'] and gps_coords:
-                text_based_places = await self._search_places_by_text(
-                    analysis_result['business_names'], 
-                    gps_coords
-                )
-                if text_based_places:
-                    analysis_result['text_based_places'] = text_based_places
-                    analysis_result['analysis_methods'].append('kakao_text_search')
+            text_based_places = stages.get('text_based_places')
+            if text_based_places:
+                analysis_result['text_based_places'] = text_based_places
+                analysis_result['analysis_methods'].append('kakao_text_search')
             
             # 5. 종합 결과 생성
             final_result = self._generate_comprehensive_result(analysis_result)
+            final_result['stage_timings'] = graph.timings
             
-            logger.info(f"통합 분석 완료: {analysis_result['analysis_methods']}")
+            logger.info(f"통합 분석 완료: {analysis_result['analysis_methods']} {graph.timings}")
             return final_result
             
         except Exception as e:
             logger.error(f"통합 이미지 분석 실패: {e}")
             return {'error': str(e), 'analysis_methods': []}
+        finally:
+            if owns_context:
+                context.close()
     
     async def _detect_landmarks_mock(self, image_bytes: bytes) -> List[Dict[str, Any]]:
         """Mock 랜드마크 인식 (실제로는 AWS Rekognition 사용)"""
@@ -101,14 +130,15 @@ class IntegratedAnalysisService:
     async def _search_places_by_text(
         self, 
         business_names: List[str], 
-        gps_coords: Dict[str, float]
+        gps_coords: Dict[str, float],
+        context: AnalysisContext
     ) -> List[Dict[str, Any]]:
         """텍스트 기반 장소 검색"""
         places = []
         
         for name in business_names[:3]:  # 최대 3개까지만
             try:
-                place_info = await kakao_service.search_place_by_keyword(
+                place_info = await context.place_by_keyword(
                     name, 
                     gps_coords['latitude'], 
                     gps_coords['longitude']
@@ -1,8 +1,15 @@
-import requests
+import asyncio
+import httpx
 import logging
-from typing import Optional
+from typing import List, Optional
 from config import settings
 from models import PlaceInfo
+from services.region_geocoder_service import region_geocoder_service
+from services.http_client_service import http_clients
+from services.upstream_governor_service import UpstreamUnavailableError
+from services.mock_providers import mock_enabled
+from utils.cache import TTLCache
+from utils.geo import geohash_encode
 
 logger = logging.getLogger(__name__)
 
@@ -13,11 +20,22 @@ class KakaoMapService:
         self.headers = {
             "Authorization": f"KakaoAK {self.api_key}"
         }
+        
+        # 검색 결과 캐시 (geohash 7자리 ≈ 150m 셀)
+        self.cache_precision = settings.KAKAO_CACHE_GEOHASH_PRECISION
+        self.search_cache = TTLCache(
+            maxsize=settings.KAKAO_CACHE_SIZE,
+            ttl=settings.KAKAO_CACHE_TTL
+        )
 
     async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
         """
         GPS 좌표를 기반으로 장소 정보를 조회합니다.
+        행정구역은 로컬 인덱스에서 먼저 조회하고, Kakao 주소 변환 실패 시 이를 사용합니다.
         """
+        # 행정구역 (네트워크 호출 없음)
+        region = region_geocoder_service.lookup(latitude, longitude)
+        
         try:
             # 좌표 -> 주소 변환
             coord_to_address_url = f"{self.base_url}/geo/coord2address.json"
@@ -27,14 +45,14 @@ class KakaoMapService:
                 "input_coord": "WGS84"
             }
             
-            response = requests.get(coord_to_address_url, headers=self.headers, params=params)
+            response = await http_clients.request('kakao_local', 'GET', coord_to_address_url, headers=self.headers, params=params)
             response.raise_for_status()
             
             address_data = response.json()
             
             if not address_data.get('documents'):
                 logger.warning(f"No address found for coordinates: {latitude}, {longitude}")
-                return None
+                return self._region_place_info(region)
             
             # 주소 정보 추출
             address_info = address_data['documents'][0]
@@ -53,56 +71,66 @@ class KakaoMapService:
             
             # 주변 장소가 없으면 기본 정보 반환
             return PlaceInfo(
-                place_name=address.get('region_3depth_name', '알 수 없는 장소'),
+                place_name=address.get('region_3depth_name') or (region or {}).get('area3') or '알 수 없는 장소',
                 address=full_address,
                 category="일반"
             )
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, UpstreamUnavailableError) as e:
             logger.error(f"Kakao API request failed: {e}")
-            return None
+            return self._region_place_info(region)
         except Exception as e:
             logger.error(f"Error getting place info: {e}")
             return None
 
+    def _region_place_info(self, region: Optional[dict]) -> Optional[PlaceInfo]:
+        """
+        Kakao 조회 실패 시 로컬 행정구역 정보만으로 기본 장소 정보를 만듭니다.
+        """
+        if not region:
+            return None
+        
+        return PlaceInfo(
+            place_name=region.get('area3') or '알 수 없는 장소',
+            address=' '.join(region[area] for area in ('area1', 'area2', 'area3') if region.get(area)),
+            category="일반"
+        )
+
     async def _search_nearby_places(self, latitude: float, longitude: float, radius: int = 500) -> Optional[PlaceInfo]:
         """
         주변 관심 장소를 검색합니다.
+        카테고리별 검색을 동시에 실행하고 우선순위가 가장 높은 카테고리의 가장 가까운 장소를 반환합니다.
         """
-        try:
-            search_url = f"{self.base_url}/search/category.json"
-            
-            # 관광명소, 문화시설 등을 우선 검색
-            categories = ["AT4", "CT1", "PK6"]  # 관광명소, 문화시설, 주차장
-            
-            for category in categories:
-                params = {
-                    "category_group_code": category,
-                    "x": longitude,
-                    "y": latitude,
-                    "radius": radius,
-                    "sort": "distance"
-                }
-                
-                response = requests.get(search_url, headers=self.headers, params=params)
-                response.raise_for_status()
-                
-                data = response.json()
-                documents = data.get('documents', [])
-                
-                if documents:
-                    place = documents[0]  # 가장 가까운 장소
-                    return PlaceInfo(
-                        place_name=place.get('place_name', ''),
-                        address=place.get('address_name', ''),
-                        category=place.get('category_name', '')
-                    )
-            
-            return None
+        search_url = f"{self.base_url}/search/category.json"
+        
+        # 관광명소, 문화시설 등을 우선 검색
+        categories = ["AT4", "CT1", "PK6"]  # 관광명소, 문화시설, 주차장
+        
+        results = await asyncio.gather(*(
+            self._cached_search(search_url, 'category', category, latitude, longitude, radius, {
+                "category_group_code": category,
+                "x": longitude,
+                "y": latitude,
+                "radius": radius,
+                "sort": "distance"
+            })
+            for category in categories
+        ), return_exceptions=True)
+        
+        for category, documents in zip(categories, results):
+            if isinstance(documents, BaseException):
+                logger.error(f"Error searching nearby places ({category}): {documents}")
+                continue
             
-        except Exception as e:
-            logger.error(f"Error searching nearby places: {e}")
-            return None
+            if documents:
+                place = documents[0]  # 가장 가까운 장소
+                return PlaceInfo(
+                    place_name=place.get('place_name', ''),
+                    address=place.get('address_name', ''),
+                    category=place.get('category_name', '')
+                )
+        
+        return None
 
     async def search_place_by_keyword(self, keyword: str, latitude: float = None, longitude: float = None) -> Optional[PlaceInfo]:
         """
@@ -122,18 +150,15 @@ class KakaoMapService:
                 longitude = 126.9780  # 서울시청 경도
                 logger.info(f"위치 미지정으로 서울 중심부 기본 좌표 사용: {latitude}, {longitude}")
             
+            radius = 20000  # 20km 반경으로 확장
             params.update({
                 "x": longitude,
                 "y": latitude,
-                "radius": 20000,  # 20km 반경으로 확장
+                "radius": radius,
                 "sort": "distance"
             })
             
-            response = requests.get(search_url, headers=self.headers, params=params)
-            response.raise_for_status()
-            
-            data = response.json()
-            documents = data.get('documents', [])
+            documents = await self._cached_search(search_url, 'keyword', keyword, latitude, longitude, radius, params)
             
             if documents:
                 place = documents[0]
@@ -149,4 +174,27 @@ class KakaoMapService:
             logger.error(f"Error searching place by keyword: {e}")
             return None
 
-kakao_service = KakaoMapService()
+    async def _cached_search(self, url: str, kind: str, term: str, latitude: float, longitude: float,
+                             radius: int, params: dict) -> List[dict]:
+        """
+        Kakao 검색 결과(documents)를 (카테고리/키워드, geohash 셀, 반경) 단위로 캐시합니다.
+        같은 지점에서 찍은 사진을 반복 분석해도 Kakao를 다시 호출하지 않습니다. (빈 결과도 캐시)
+        """
+        key = (kind, term, geohash_encode(latitude, longitude, self.cache_precision), radius)
+        
+        cached = self.search_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        response = await http_clients.request('kakao_local', 'GET', url, headers=self.headers, params=params)
+        response.raise_for_status()
+        
+        documents = response.json().get('documents', [])
+        self.search_cache.set(key, documents)
+        return documents
+
+# 서비스 인스턴스 (MOCK_PROVIDERS 에 kakao 가 포함되면 부하 테스트용 Mock 사용)
+if mock_enabled('kakao'):
+    from services.kakao_service_mock import kakao_service_mock as kakao_service
+else:
+    kakao_service = KakaoMapService()
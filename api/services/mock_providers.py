@@ -0,0 +1,329 @@
+"""
+부하 테스트용 Mock 제공자 계층
+Kakao / Naver / Google Vision / Textract / GenAI 를 오프라인으로 대체합니다.
+
+  - 대규모 합성 장소 데이터셋 + 격자 공간 인덱스 (좌표/키워드 조회)
+  - 제공자별 지연(기본값 ± 지터), 오류율, 타임아웃 주입
+  - MOCK_PROVIDERS 설정("kakao,naver,vision,textract,genai" 또는 "all")으로 선택
+
+예)
+    MOCK_PROVIDERS=all MOCK_LATENCY_MS=80 MOCK_JITTER_MS=40 MOCK_ERROR_RATE=0.02 uvicorn main:app
+    MOCK_PROVIDER_PROFILES='{"kakao": {"latency_ms": 40, "timeout_rate": 0.01}}'
+"""
+import asyncio
+import hashlib
+import json
+import logging
+import random
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+from models import PlaceInfo
+from utils.deadline import remaining
+from utils.geo import GridIndex
+
+logger = logging.getLogger(__name__)
+
+MOCKABLE_PROVIDERS = ('kakao', 'naver', 'vision', 'textract', 'genai')
+
+# 합성 데이터 생성용 도시 중심 좌표 (위도, 경도, 분포 반경(도), 가중치)
+CITY_CENTERS = [
+    ('서울특별시', 37.5665, 126.9780, 0.12, 0.45),
+    ('부산광역시', 35.1796, 129.0756, 0.10, 0.15),
+    ('인천광역시', 37.4563, 126.7052, 0.08, 0.10),
+    ('대구광역시', 35.8714, 128.6014, 0.08, 0.10),
+    ('대전광역시', 36.3504, 127.3845, 0.06, 0.07),
+    ('광주광역시', 35.1595, 126.8526, 0.06, 0.07),
+    ('제주특별자치도', 33.4996, 126.5312, 0.10, 0.06),
+]
+DISTRICTS = ['중구', '동구', '서구', '남구', '북구', '종로구', '강남구', '수성구', '해운대구', '유성구']
+ROADS = ['중앙로', '대학로', '시장길', '역전로', '공원로', '문화로', '해안로', '세종로', '평화로', '한빛로']
+BRANDS = ['행복', '미소', '하늘', '바다', '푸른', '온누리', '새봄', '한결', '가온', '다온', '별빛', '햇살']
+CATEGORIES = [
+    ('카페', '음식점 > 카페'),
+    ('식당', '음식점 > 한식'),
+    ('치킨', '음식점 > 치킨'),
+    ('편의점', '편의점'),
+    ('약국', '의료 > 약국'),
+    ('마트', '가정,생활 > 마트'),
+    ('박물관', '문화시설 > 박물관'),
+    ('공원', '여가시설 > 공원'),
+    ('전통시장', '쇼핑 > 전통시장'),
+    ('미술관', '문화시설 > 미술관'),
+]
+
+# 실제 관광지 (합성 데이터와 함께 색인)
+LANDMARKS = [
+    ('경복궁', '서울특별시 종로구 사직로 161', '관광명소 > 고궁', 37.5796, 126.9770),
+    ('창덕궁', '서울특별시 종로구 율곡로 99', '관광명소 > 고궁', 37.5794, 126.9910),
+    ('N서울타워', '서울특별시 용산구 남산공원길 105', '관광명소 > 전망대', 37.5512, 126.9882),
+    ('한강공원', '서울특별시 영등포구 여의동로 330', '여가시설 > 공원', 37.5284, 126.9327),
+]
+
+
+class MockProviderError(Exception):
+    """주입된 업스트림 오류"""
+
+
+def mock_enabled(provider: str) -> bool:
+    """
+    MOCK_PROVIDERS 설정에 provider가 포함되어 있는지 확인합니다.
+    """
+    names = {name.strip().lower() for name in settings.MOCK_PROVIDERS.split(',') if name.strip()}
+    return 'all' in names or provider in names
+
+
+def _provider_profiles() -> Dict[str, Dict[str, Any]]:
+    if not settings.MOCK_PROVIDER_PROFILES:
+        return {}
+    try:
+        return json.loads(settings.MOCK_PROVIDER_PROFILES)
+    except ValueError:
+        logger.warning("Invalid MOCK_PROVIDER_PROFILES, using defaults")
+        return {}
+
+
+class FaultInjector:
+    """
+    지연(latency ± jitter), 오류, 타임아웃을 주입합니다.
+    타임아웃은 timeout_seconds(또는 남은 요청 시간)만큼 대기한 뒤 asyncio.TimeoutError를 발생시킵니다.
+    """
+
+    def __init__(self, provider: str):
+        profile = _provider_profiles().get(provider, {})
+        self.provider = provider
+        self.latency = float(profile.get('latency_ms', settings.MOCK_LATENCY_MS)) / 1000
+        self.jitter = float(profile.get('jitter_ms', settings.MOCK_JITTER_MS)) / 1000
+        self.error_rate = float(profile.get('error_rate', settings.MOCK_ERROR_RATE))
+        self.timeout_rate = float(profile.get('timeout_rate', settings.MOCK_TIMEOUT_RATE))
+        self.timeout_seconds = float(profile.get('timeout_seconds', settings.MOCK_TIMEOUT_SECONDS))
+        self._random = random.Random()
+        self.stats = {'calls': 0, 'errors': 0, 'timeouts': 0}
+
+    async def inject(self) -> None:
+        self.stats['calls'] += 1
+        roll = self._random.random()
+
+        if roll < self.timeout_rate:
+            self.stats['timeouts'] += 1
+            wait = self.timeout_seconds
+            left = remaining()
+            if left is not None:
+                wait = min(wait, left)
+            await asyncio.sleep(wait)
+            raise asyncio.TimeoutError(f"{self.provider} mock timeout")
+
+        delay = max(0.0, self.latency + self._random.uniform(-self.jitter, self.jitter))
+        if delay:
+            await asyncio.sleep(delay)
+
+        if roll < self.timeout_rate + self.error_rate:
+            self.stats['errors'] += 1
+            raise MockProviderError(f"{self.provider} mock error")
+
+
+class SyntheticPlaceDataset:
+    """
+    결정적(seed 고정) 합성 장소 데이터셋
+    좌표 조회는 GridIndex, 키워드 조회는 장소명/상호(브랜드) 역색인으로 처리합니다.
+    """
+
+    def __init__(self, count: int, seed: int = 42):
+        self.places: List[Dict[str, Any]] = []
+        self.index = GridIndex(cell_size=0.01)
+        self._by_keyword: Dict[str, List[int]] = {}
+
+        for name, address, category, lat, lng in LANDMARKS:
+            self._add(name, address, category, lat, lng, keywords=[name])
+
+        rng = random.Random(seed)
+        weights = [city[4] for city in CITY_CENTERS]
+        for i in range(count):
+            city, center_lat, center_lng, spread, _ = rng.choices(CITY_CENTERS, weights=weights)[0]
+            brand = rng.choice(BRANDS)
+            suffix, category = rng.choice(CATEGORIES)
+            name = f"{brand}{suffix} {i % 97 + 1}호점"
+            address = f"{city} {rng.choice(DISTRICTS)} {rng.choice(ROADS)} {rng.randint(1, 300)}"
+            lat = center_lat + rng.gauss(0, spread / 2)
+            lng = center_lng + rng.gauss(0, spread / 2)
+            self._add(name, address, category, lat, lng, keywords=[name, f"{brand}{suffix}", suffix])
+
+    def __len__(self) -> int:
+        return len(self.places)
+
+    def _add(self, name: str, address: str, category: str, lat: float, lng: float,
+             keywords: List[str]) -> None:
+        place_id = self.index.insert(lat, lng)
+        self.places.append({
+            'name': name, 'address': address, 'category': category,
+            'latitude': lat, 'longitude': lng
+        })
+        for keyword in keywords:
+            self._by_keyword.setdefault(keyword, []).append(place_id)
+
+    def nearest(self, lat: float, lng: float, radius: float = 500) -> Optional[Tuple[Dict[str, Any], float]]:
+        results = self.index.query_radius(lat, lng, radius)
+        if not results:
+            return None
+        place_id, distance = results[0]
+        return self.places[place_id], distance
+
+    def search(self, keyword: str, lat: Optional[float] = None,
+               lng: Optional[float] = None) -> Optional[Dict[str, Any]]:
+        """
+        키워드(장소명, 상호, 업종)와 일치하는 장소 중 기준 좌표에서 가장 가까운 장소
+        """
+        ids = self._by_keyword.get(keyword.strip())
+        if not ids:
+            return None
+        if lat is None or lng is None:
+            return self.places[ids[0]]
+
+        def squared_offset(place_id: int) -> float:
+            place = self.places[place_id]
+            return (place['latitude'] - lat) ** 2 + (place['longitude'] - lng) ** 2
+
+        return self.places[min(ids, key=squared_offset)]
+
+    def sample_names(self, seed_bytes: bytes, count: int = 3) -> List[str]:
+        """이미지 바이트로 결정되는 상호명 샘플 (OCR Mock 용)"""
+        seed = int(hashlib.md5(seed_bytes[:4096]).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        return [
+            self.places[rng.randrange(len(self.places))]['name'].split(' ')[0]
+            for _ in range(count)
+        ]
+
+
+_dataset: Optional[SyntheticPlaceDataset] = None
+
+
+def get_place_dataset() -> SyntheticPlaceDataset:
+    """모든 Mock 제공자가 공유하는 데이터셋 (최초 사용 시 생성)"""
+    global _dataset
+    if _dataset is None:
+        _dataset = SyntheticPlaceDataset(settings.MOCK_PLACE_COUNT, seed=settings.MOCK_PLACE_SEED)
+        logger.info(f"Mock place dataset generated: {len(_dataset)} places")
+    return _dataset
+
+
+def _place_info(place: Dict[str, Any], distance: Optional[float] = None) -> PlaceInfo:
+    return PlaceInfo(
+        place_name=place['name'],
+        address=place['address'],
+        category=place['category'],
+        distance=round(distance, 1) if distance is not None else None
+    )
+
+
+class NaverMapServiceMock:
+    """Naver 지도/검색 API Mock"""
+
+    def __init__(self):
+        self.faults = FaultInjector('naver')
+
+    async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
+        try:
+            await self.faults.inject()
+        except (MockProviderError, asyncio.TimeoutError) as e:
+            logger.error(f"Naver API request failed: {e}")
+            return None
+
+        nearest = get_place_dataset().nearest(latitude, longitude)
+        if nearest is None:
+            return PlaceInfo(place_name='알 수 없는 장소', address=f"({latitude:.4f}, {longitude:.4f})", category="일반")
+        return _place_info(*nearest)
+
+    async def search_place_by_keyword(self, keyword: str, latitude: float = None,
+                                      longitude: float = None) -> Optional[PlaceInfo]:
+        try:
+            await self.faults.inject()
+        except (MockProviderError, asyncio.TimeoutError) as e:
+            logger.error(f"Error searching place by keyword: {e}")
+            return None
+
+        place = get_place_dataset().search(keyword, latitude, longitude)
+        return _place_info(place) if place else None
+
+    async def geocode_address(self, address: str) -> Optional[tuple]:
+        try:
+            await self.faults.inject()
+        except (MockProviderError, asyncio.TimeoutError) as e:
+            logger.error(f"Error geocoding address: {e}")
+            return None
+
+        # 주소 문자열로 결정되는 합성 좌표 (같은 주소는 항상 같은 좌표)
+        seed = int(hashlib.md5(address.encode('utf-8')).hexdigest()[:8], 16)
+        rng = random.Random(seed)
+        _, center_lat, center_lng, spread, _ = CITY_CENTERS[0]
+        return (center_lat + rng.uniform(-spread, spread), center_lng + rng.uniform(-spread, spread))
+
+
+def create_google_vision_mock():
+    from services.vision_service import GoogleVisionService
+
+    class GoogleVisionServiceMock(GoogleVisionService):
+        """Google Vision OCR Mock - 합성 데이터셋의 상호명을 반환"""
+
+        def __init__(self):
+            super().__init__(api_key=None)
+            self.faults = FaultInjector('vision')
+
+        async def extract_korean_text(self, image_bytes: bytes) -> List[Dict[str, str]]:
+            try:
+                await self.faults.inject()
+            except (MockProviderError, asyncio.TimeoutError) as e:
+                logger.error(f"Google Vision API 요청 실패: {e}")
+                return []
+
+            return [
+                {'text': name, 'confidence': 90, 'type': 'word'}
+                for name in get_place_dataset().sample_names(image_bytes, count=5)
+            ]
+
+    return GoogleVisionServiceMock()
+
+
+def create_textract_mock():
+    from services.textract_service import MockTextractService
+
+    class TextractServiceMock(MockTextractService):
+        """AWS Textract Mock - 합성 데이터셋의 상호명을 LINE 블록으로 반환"""
+
+        def __init__(self):
+            self.faults = FaultInjector('textract')
+
+        async def extract_text_from_image(self, image_bytes: bytes) -> List[Dict[str, str]]:
+            try:
+                await self.faults.inject()
+            except (MockProviderError, asyncio.TimeoutError) as e:
+                logger.error(f"Textract 텍스트 추출 실패: {e}")
+                return []
+
+            return [
+                {'text': name, 'confidence': 92.0, 'type': 'line'}
+                for name in get_place_dataset().sample_names(image_bytes, count=3)
+            ]
+
+        def filter_korean_business_names(self, texts: List[Dict[str, str]]) -> List[str]:
+            return [text['text'] for text in texts]
+
+    return TextractServiceMock()
+
+
+def create_genai_mock():
+    from services.genai_vision_service import GenAIVisionService
+
+    class GenAIVisionServiceMock(GenAIVisionService):
+        """GenAI Vision Mock - 기존 시뮬레이션 응답에 지연/오류 주입"""
+
+        def __init__(self):
+            super().__init__(api_key=None)
+            self.faults = FaultInjector('genai')
+
+        async def _mock_genai_analysis(self, image_bytes: bytes, prompt: str) -> Dict[str, Any]:
+            # 오류/타임아웃은 analyze_place_context 의 실패 응답으로 이어짐
+            await self.faults.inject()
+            return await super()._mock_genai_analysis(image_bytes, prompt)
+
+    return GenAIVisionServiceMock()
@@ -1,8 +1,15 @@
-import requests
+import asyncio
+import httpx
 import logging
-from typing import Optional
+from typing import List, Optional, Tuple
 from config import settings
 from models import PlaceInfo
+from services.region_geocoder_service import region_geocoder_service
+from services.http_client_service import http_clients
+from services.geocoding_service import geocoding_service
+from services.upstream_governor_service import UpstreamUnavailableError
+from services.mock_providers import NaverMapServiceMock, mock_enabled
+from utils.geo import haversine_distances
 
 logger = logging.getLogger(__name__)
 
@@ -10,25 +17,28 @@ class NaverMapService:
     def __init__(self):
         self.client_id = settings.NAVER_CLIENT_ID
         self.client_secret = settings.NAVER_CLIENT_SECRET
-        self.geocoding_url = "https://naveropenapi.apigw.ntruss.com/map-geocoding/v2/geocode"
         self.reverse_geocoding_url = "https://naveropenapi.apigw.ntruss.com/map-reversegeocode/v2/gc"
         self.search_url = "https://openapi.naver.com/v1/search/local.json"
         
         self.headers = {
-            "X-NCP-APIGW-API-KEY-ID": self.client_id,
-            "X-NCP-APIGW-API-KEY": self.client_secret
+            "X-NCP-APIGW-API-KEY-ID": self.client_id or "",
+            "X-NCP-APIGW-API-KEY": self.client_secret or ""
         }
         
         # 검색 API용 헤더 (다른 형식)
         self.search_headers = {
-            "X-Naver-Client-Id": self.client_id,
-            "X-Naver-Client-Secret": self.client_secret
+            "X-Naver-Client-Id": self.client_id or "",
+            "X-Naver-Client-Secret": self.client_secret or ""
         }
 
     async def get_place_by_coordinates(self, latitude: float, longitude: float) -> Optional[PlaceInfo]:
         """
         GPS 좌표를 기반으로 장소 정보를 조회합니다.
+        시/도, 시/군/구, 읍/면/동은 로컬 행정구역 인덱스에서, 도로명/지번은 Naver에서 조회합니다.
         """
+        # 행정구역 (네트워크 호출 없음)
+        region = region_geocoder_service.lookup(latitude, longitude)
+        
         try:
             # 좌표 -> 주소 변환 (Reverse Geocoding)
             params = {
@@ -38,7 +48,7 @@ class NaverMapService:
                 "orders": "roadaddr,addr"
             }
             
-            response = requests.get(
+            response = await http_clients.request('naver_reverse', 'GET',
                 self.reverse_geocoding_url, 
                 headers=self.headers, 
                 params=params
@@ -49,23 +59,24 @@ class NaverMapService:
             
             if data.get('status', {}).get('code') != 0:
                 logger.warning(f"Naver API error: {data.get('status', {}).get('name')}")
-                return None
+                return self._region_place_info(region)
             
             results = data.get('results', [])
             if not results:
                 logger.warning(f"No address found for coordinates: {latitude}, {longitude}")
-                return None
+                return self._region_place_info(region)
             
             # 도로명 주소 우선, 없으면 지번 주소 사용
             address_info = results[0]
-            region = address_info.get('region', {})
+            naver_region = address_info.get('region', {})
             land = address_info.get('land', {})
             
-            # 주소 구성
-            area1 = region.get('area1', {}).get('name', '')  # 시/도
-            area2 = region.get('area2', {}).get('name', '')  # 시/군/구
-            area3 = region.get('area3', {}).get('name', '')  # 읍/면/동
-            area4 = region.get('area4', {}).get('name', '')  # 리
+            # 주소 구성 (로컬 행정구역 우선)
+            region = region or {}
+            area1 = region.get('area1') or naver_region.get('area1', {}).get('name', '')  # 시/도
+            area2 = region.get('area2') or naver_region.get('area2', {}).get('name', '')  # 시/군/구
+            area3 = region.get('area3') or naver_region.get('area3', {}).get('name', '')  # 읍/면/동
+            area4 = naver_region.get('area4', {}).get('name', '')  # 리
             
             full_address = f"{area1} {area2} {area3}"
             if area4:
@@ -80,7 +91,9 @@ class NaverMapService:
                         full_address += f"-{land.get('number2')}"
             
             # 주변 장소 검색
-            place_info = await self._search_nearby_places(latitude, longitude)
+            place_info = await self._search_nearby_places(
+                latitude, longitude, region={'area2': area2, 'area3': area3}
+            )
             
             if place_info:
                 place_info.address = full_address.strip()
@@ -93,64 +106,111 @@ class NaverMapService:
                 category="일반"
             )
             
-        except requests.RequestException as e:
+        except (httpx.HTTPError, UpstreamUnavailableError) as e:
             logger.error(f"Naver API request failed: {e}")
-            return None
+            return self._region_place_info(region)
         except Exception as e:
             logger.error(f"Error getting place info: {e}")
             return None
 
-    async def _search_nearby_places(self, latitude: float, longitude: float, radius: int = 500) -> Optional[PlaceInfo]:
+    def _region_place_info(self, region: Optional[dict]) -> Optional[PlaceInfo]:
+        """
+        Naver 조회 실패 시 로컬 행정구역 정보만으로 기본 장소 정보를 만듭니다.
+        """
+        if not region:
+            return None
+        
+        return PlaceInfo(
+            place_name=region.get('area3') or '알 수 없는 장소',
+            address=' '.join(region[area] for area in ('area1', 'area2', 'area3') if region.get(area)),
+            category="일반"
+        )
+
+    async def _search_nearby_places(self, latitude: float, longitude: float, radius: int = 500,
+                                    region: Optional[dict] = None) -> Optional[PlaceInfo]:
         """
         주변 관심 장소를 검색합니다.
+        키워드별 검색을 동시에 실행하고, 결과 좌표(mapx/mapy)로 실제 거리를 계산해 가장 가까운 장소를 반환합니다.
         """
         try:
             # 관광지, 문화시설 등을 검색
             keywords = ["관광지", "박물관", "미술관", "공원", "명소"]
             
-            for keyword in keywords:
-                params = {
-                    "query": keyword,
-                    "display": 5,
-                    "start": 1,
-                    "sort": "random"
-                }
-                
-                response = requests.get(
-                    self.search_url, 
-                    headers=self.search_headers, 
-                    params=params
+            # 검색 API는 위치 파라미터가 없으므로 행정구역명을 검색어에 포함해 지역을 한정
+            area = ' '.join(region[key] for key in ('area2', 'area3') if region and region.get(key))
+            
+            responses = await asyncio.gather(*(
+                http_clients.request('naver_search', 'GET',
+                    self.search_url,
+                    headers=self.search_headers,
+                    params={
+                        "query": f"{area} {keyword}".strip(),
+                        "display": 5,
+                        "start": 1,
+                        "sort": "random"
+                    }
                 )
-                response.raise_for_status()
-                
-                data = response.json()
-                items = data.get('items', [])
-                
-                # 거리 계산하여 가까운 장소 찾기
-                for item in items:
-                    # 네이버 검색 API는 정확한 좌표를 제공하지 않으므로
-                    # 주소 기반으로 대략적인 매칭 수행
-                    if self._is_nearby_address(item.get('address', ''), latitude, longitude):
-                        return PlaceInfo(
-                            place_name=self._clean_html_tags(item.get('title', '')),
-                            address=item.get('address', ''),
-                            category=item.get('category', keyword)
-                        )
+                for keyword in keywords
+            ), return_exceptions=True)
             
-            return None
+            candidates = []
+            seen = set()
+            for keyword, response in zip(keywords, responses):
+                if isinstance(response, BaseException) or response.status_code != 200:
+                    logger.warning(f"Error searching nearby places ({keyword}): {response}")
+                    continue
+            
+                for item in response.json().get('items', []):
+                    key = (item.get('title'), item.get('address'))
+                    if key not in seen:
+                        seen.add(key)
+                        candidates.append((keyword, item))
+            
+            # 좌표 일괄 변환 후 거리 계산 (좌표가 없는 항목은 제외)
+            coordinates = self._convert_coordinates([item for _, item in candidates])
+            located = [
+                (keyword, item, coordinate)
+                for (keyword, item), coordinate in zip(candidates, coordinates) if coordinate
+            ]
+            if not located:
+                return None
+            
+            distances = haversine_distances(latitude, longitude, [coordinate for _, _, coordinate in located])
+            nearest_distance, (keyword, item, _) = min(
+                zip(distances, located), key=lambda candidate: candidate[0]
+            )
+            if nearest_distance > radius:
+                return None
+            
+            return PlaceInfo(
+                place_name=self._clean_html_tags(item.get('title', '')),
+                address=item.get('roadAddress') or item.get('address', ''),
+                category=item.get('category', keyword),
+                distance=round(nearest_distance, 1)
+            )
             
         except Exception as e:
             logger.error(f"Error searching nearby places: {e}")
             return None
 
-    def _is_nearby_address(self, address: str, latitude: float, longitude: float) -> bool:
+    def _convert_coordinates(self, items: List[dict]) -> List[Optional[Tuple[float, float]]]:
         """
-        주소가 주어진 좌표 근처인지 대략적으로 판단합니다.
-        실제 구현에서는 더 정교한 거리 계산이 필요할 수 있습니다.
+        검색 결과의 mapx/mapy를 (위도, 경도)로 일괄 변환합니다.
+        검색 API는 WGS84 경위도에 1e7을 곱한 정수를 반환합니다. (예: mapx=1269770000 -> 126.977)
         """
-        # 간단한 구현: 주소에서 시/군/구 정보를 추출하여 비교
-        # 실제로는 geocoding을 통해 정확한 좌표 비교를 해야 합니다.
-        return True  # 임시로 모든 주소를 허용
+        coordinates = []
+        for item in items:
+            try:
+                lng = int(item.get('mapx')) / 1e7
+                lat = int(item.get('mapy')) / 1e7
+            except (TypeError, ValueError):
+                coordinates.append(None)
+                continue
+            
+            # 구 버전 응답(KATEC 좌표)이나 국외 좌표는 제외
+            coordinates.append((lat, lng) if 33 <= lat <= 39 and 124 <= lng <= 132 else None)
+        
+        return coordinates
 
     def _clean_html_tags(self, text: str) -> str:
         """
@@ -172,7 +232,7 @@ class NaverMapService:
                 "sort": "random"
             }
             
-            response = requests.get(
+            response = await http_clients.request('naver_search', 'GET',
                 self.search_url, 
                 headers=self.search_headers, 
                 params=params
@@ -198,35 +258,17 @@ class NaverMapService:
 
     async def geocode_address(self, address: str) -> Optional[tuple]:
         """
-        주소를 좌표로 변환합니다.
+        주소를 좌표로 변환합니다. (Naver/Kakao 지오코딩 통합 서비스 사용)
         """
-        try:
-            params = {
-                "query": address
-            }
-            
-            response = requests.get(
-                self.geocoding_url, 
-                headers=self.headers, 
-                params=params
-            )
-            response.raise_for_status()
-            
-            data = response.json()
-            
-            if data.get('status') != 'OK':
-                logger.warning(f"Geocoding failed for address: {address}")
-                return None
-            
-            addresses = data.get('addresses', [])
-            if addresses:
-                location = addresses[0]
-                return (float(location['y']), float(location['x']))  # (latitude, longitude)
-            
-            return None
-            
-        except Exception as e:
-            logger.error(f"Error geocoding address: {e}")
+        result = await geocoding_service.geocode(address)
+        if not result:
+            logger.warning(f"Geocoding failed for address: {address}")
             return None
+        
+        return (result['latitude'], result['longitude'])  # (latitude, longitude)
 
-naver_service = NaverMapService()
+# 서비스 인스턴스 (MOCK_PROVIDERS 에 naver 가 포함되면 부하 테스트용 Mock 사용)
+if mock_enabled('naver'):
+    naver_service = NaverMapServiceMock()
+else:
+    naver_service = NaverMapService()
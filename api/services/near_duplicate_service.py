@@ -0,0 +1,114 @@
+"""
+근접 중복 사진 인덱스 - geohash 셀별 dHash BK-트리
+같은 장소에서 거의 같은 구도로 찍은 사진은 이전의 고신뢰 분석 결과를 재사용하고
+Rekognition + Bedrock 파이프라인을 다시 실행하지 않습니다.
+"""
+import json
+import logging
+from typing import Any, Dict, Optional, Tuple
+from config import settings
+from utils.cache import TTLCache
+from utils.geo import geohash_encode
+from utils.image_hash import BKTree
+
+logger = logging.getLogger(__name__)
+
+class NearDuplicateService:
+    """
+    셀(geohash) -> BKTree(dHash -> request_id)
+    분석이 끝나고 신뢰도가 PHASH_MIN_CONFIDENCE 이상인 요청만 인덱스에 등록합니다.
+    """
+
+    def __init__(self):
+        self.max_distance = settings.PHASH_MAX_DISTANCE
+        self.precision = settings.PHASH_GEOHASH_PRECISION
+        self.min_confidence = settings.PHASH_MIN_CONFIDENCE
+
+        self.cells = TTLCache(maxsize=settings.PHASH_INDEX_CELLS, ttl=settings.PHOTO_DEDUP_TTL)
+        # 분석 대기 중인 요청: request_id -> (셀, 해시)
+        self.pending = TTLCache(maxsize=settings.PHOTO_DEDUP_INDEX_SIZE, ttl=settings.PHOTO_DEDUP_TTL)
+
+        self.lookups = 0
+        self.matches = 0
+        self.indexed = 0
+
+    def find(self, phash: Optional[int], latitude: float, longitude: float) -> Optional[Tuple[str, int]]:
+        """
+        같은 셀에서 해밍 거리 max_distance 이내의 가장 가까운 사진을 (request_id, 거리)로 반환합니다.
+        """
+        if phash is None or self.max_distance < 0:
+            return None
+
+        self.lookups += 1
+        tree = self.cells.get(geohash_encode(latitude, longitude, self.precision), _count=False)
+        if tree is None:
+            return None
+
+        matches = tree.search(phash, self.max_distance)
+        if not matches:
+            return None
+
+        self.matches += 1
+        distance, request_id = matches[0]
+        return request_id, distance
+
+    def track(self, request_id: str, phash: Optional[int], latitude: float, longitude: float) -> None:
+        """
+        분석 요청을 등록해 두고, 결과가 고신뢰로 끝나면 index_result 에서 인덱스에 추가합니다.
+        """
+        if phash is None:
+            return
+        self.pending.set(request_id, (geohash_encode(latitude, longitude, self.precision), phash))
+
+    def index_result(self, request_id: str, result: Any) -> bool:
+        """
+        분석 결과의 신뢰도를 확인하고 충분히 높으면 해당 사진을 인덱스에 추가합니다.
+        """
+        entry = self.pending.pop(request_id)
+        if entry is None:
+            return False
+
+        confidence = self._confidence(result)
+        if confidence is None or confidence < self.min_confidence:
+            return False
+
+        cell, phash = entry
+        tree = self.cells.get(cell, _count=False)
+        if tree is None:
+            tree = BKTree()
+            self.cells.set(cell, tree)
+        tree.add(phash, request_id)
+        self.indexed += 1
+        return True
+
+    @staticmethod
+    def _confidence(result: Any) -> Optional[float]:
+        """
+        분석 결과(JSON 문자열 또는 dict)의 confidence_score / confidence (0~100)
+        """
+        if isinstance(result, str):
+            try:
+                result = json.loads(result)
+            except ValueError:
+                return None
+        if not isinstance(result, dict):
+            return None
+
+        for key in ('confidence_score', 'confidence'):
+            value = result.get(key)
+            if isinstance(value, (int, float)):
+                return float(value)
+        return None
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'cells': len(self.cells),
+            'pending': len(self.pending),
+            'indexed': self.indexed,
+            'lookups': self.lookups,
+            'matches': self.matches,
+            'match_ratio': round(self.matches / self.lookups, 3) if self.lookups else 0.0
+        }
+
+# 전역 근접 중복 인덱스 인스턴스
+near_duplicates = NearDuplicateService()
@@ -0,0 +1,58 @@
+"""
+업로드 사진 중복 제거 - 콘텐츠 해시(SHA-256) -> 최초 분석 요청 인덱스
+같은 사진의 재업로드/클라이언트 재시도는 기존 S3 객체와 분석 결과를 재사용하거나
+진행 중인 분석 요청(request_id)에 합류합니다.
+"""
+import logging
+from typing import Any, Dict, Optional
+from config import settings
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+class PhotoDedupService:
+    """
+    해시 -> {request_id, s3_key, s3_url} 인덱스 (인메모리, TTL/LRU)
+    분석 상태 자체는 analysis_status_store(request_id 기준)가 관리합니다.
+    """
+
+    def __init__(self):
+        self.index = TTLCache(maxsize=settings.PHOTO_DEDUP_INDEX_SIZE, ttl=settings.PHOTO_DEDUP_TTL)
+        self.claimed = 0
+        self.deduplicated = 0
+        self.released = 0
+
+    def claim(self, sha256: str, request_id: str, s3_key: str, s3_url: str) -> Optional[Dict[str, Any]]:
+        """
+        해시의 최초 업로드로 등록합니다. 이미 등록된 해시면 기존 항목을 반환합니다.
+        (조회와 등록 사이에 await 가 없으므로 동시 업로드 중 하나만 등록됨)
+        """
+        existing = self.index.get(sha256)
+        if existing is not None:
+            self.deduplicated += 1
+            logger.info(f"Duplicate upload {request_id} -> {existing['request_id']} ({sha256[:12]})")
+            return existing
+
+        self.index.set(sha256, {'request_id': request_id, 's3_key': s3_key, 's3_url': s3_url})
+        self.claimed += 1
+        return None
+
+    def release(self, sha256: str, request_id: str) -> None:
+        """
+        업로드/분석이 실패한 요청의 등록을 해제합니다. (다음 업로드가 다시 분석하도록)
+        """
+        entry = self.index.get(sha256, _count=False)
+        if entry is not None and entry['request_id'] == request_id:
+            self.index.pop(sha256)
+            self.released += 1
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.index.stats(),
+            'claimed': self.claimed,
+            'deduplicated': self.deduplicated,
+            'released': self.released
+        }
+
+# 전역 중복 제거 인덱스 인스턴스
+photo_dedup = PhotoDedupService()
@@ -0,0 +1,155 @@
+"""
+CPU 작업용 프로세스 풀 - 이미지 검사/변환을 이벤트 루프 밖의 워커 프로세스에서 실행
+큰 이미지 하나가 같은 워커의 모든 요청을 멈추지 않도록 합니다.
+
+lifespan 에서 start()/close() 하며, 시작 전(스크립트, 벤치마크)에는 스레드에서 실행합니다.
+CPU_POOL_SHM_THRESHOLD 이상의 바이트 인자는 pickle 파이프 대신 공유 메모리로 전달합니다.
+"""
+import asyncio
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from multiprocessing import shared_memory
+from typing import Any, Callable, Dict, Optional
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+class WorkerCrashedError(Exception):
+    """작업 도중 워커 프로세스가 비정상 종료됨 (OOM, 압축 폭탄 등) - 같은 작업을 다시 실행하지 않음"""
+
+def _run_in_worker(func: Callable, args: tuple, shm_name: Optional[str] = None, shm_size: int = 0):
+    """
+    워커 프로세스에서 실행: (시작 시각, 결과)를 반환합니다.
+    shm_name 이 있으면 공유 메모리의 바이트를 첫 번째 인자로 전달합니다.
+    """
+    started = time.time()
+    if shm_name is not None:
+        shm = shared_memory.SharedMemory(name=shm_name)
+        try:
+            data = bytes(shm.buf[:shm_size])
+        finally:
+            # unlink 는 생성한 부모 프로세스가 담당 (spawn 워커는 부모의 리소스 트래커를 공유)
+            shm.close()
+        args = (data,) + args
+    return started, func(*args)
+
+def _warm_up() -> int:
+    return os.getpid()
+
+class CPUPoolService:
+    """
+    ProcessPoolExecutor 래퍼 + 대기열 지표
+    """
+
+    def __init__(self):
+        self.workers = settings.CPU_POOL_WORKERS or os.cpu_count() or 1
+        self.shm_threshold = settings.CPU_POOL_SHM_THRESHOLD
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+        self.in_flight = 0
+        self.max_queue_depth = 0
+        self.stats = {'submitted': 0, 'completed': 0, 'failed': 0, 'inline': 0, 'shared_memory': 0, 'restarts': 0}
+        self._wait_total = 0.0
+        self._run_total = 0.0
+        self._max_wait = 0.0
+
+    async def start(self) -> None:
+        if self._executor is not None:
+            return
+        # 이벤트 루프/스레드가 있는 프로세스를 fork 하지 않도록 spawn 사용
+        self._executor = ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context('spawn')
+        )
+        # 첫 요청이 프로세스 기동 비용을 내지 않도록 워커를 미리 띄움
+        loop = asyncio.get_running_loop()
+        await asyncio.gather(*(loop.run_in_executor(self._executor, _warm_up) for _ in range(self.workers)))
+        logger.info(f"CPU process pool started: {self.workers} workers")
+
+    async def close(self) -> None:
+        if self._executor is None:
+            return
+        executor, self._executor = self._executor, None
+        await asyncio.to_thread(executor.shutdown, True, cancel_futures=True)
+
+    async def run(self, func: Callable, data: bytes, *args: Any) -> Any:
+        """
+        func(data, *args)를 워커 프로세스에서 실행합니다. func 는 모듈 최상위 함수여야 합니다.
+        """
+        if self._executor is None:
+            self.stats['inline'] += 1
+            return await asyncio.to_thread(func, data, *args)
+
+        self.stats['submitted'] += 1
+        self.in_flight += 1
+        self.max_queue_depth = max(self.max_queue_depth, self.queue_depth)
+
+        shm = None
+        executor = self._executor
+        submitted = time.time()
+        try:
+            loop = asyncio.get_running_loop()
+            if len(data) >= self.shm_threshold:
+                shm = shared_memory.SharedMemory(create=True, size=len(data))
+                shm.buf[:len(data)] = data
+                self.stats['shared_memory'] += 1
+                call = (_run_in_worker, func, args, shm.name, len(data))
+            else:
+                call = (_run_in_worker, func, (data,) + args)
+
+            started, result = await loop.run_in_executor(executor, *call)
+
+            finished = time.time()
+            wait = max(0.0, started - submitted)
+            self._wait_total += wait
+            self._run_total += finished - started
+            self._max_wait = max(self._max_wait, wait)
+            self.stats['completed'] += 1
+            return result
+
+        except BrokenProcessPool:
+            # 워커가 비정상 종료(OOM 등): 풀을 다시 만들고 이번 작업은 실패 처리
+            # (API 프로세스에서 다시 실행하면 같은 입력이 API 프로세스를 죽일 수 있음)
+            self.stats['failed'] += 1
+            if self._executor is executor:
+                logger.error(f"CPU process pool broken by {getattr(func, '__name__', func)}, restarting")
+                self.stats['restarts'] += 1
+                self._executor = None
+                executor.shutdown(wait=False, cancel_futures=True)
+                await self.start()
+            raise WorkerCrashedError(f"worker process died while running {getattr(func, '__name__', func)}")
+        except BaseException:
+            self.stats['failed'] += 1
+            raise
+        finally:
+            self.in_flight -= 1
+            if shm is not None:
+                shm.close()
+                shm.unlink()
+
+    @property
+    def queue_depth(self) -> int:
+        """워커를 기다리는 작업 수"""
+        return max(0, self.in_flight - self.workers)
+
+    def metrics(self) -> Dict[str, Any]:
+        completed = self.stats['completed']
+        return {
+            **self.stats,
+            'running': self._executor is not None,
+            'workers': self.workers,
+            'in_flight': self.in_flight,
+            'queue_depth': self.queue_depth,
+            'max_queue_depth': self.max_queue_depth,
+            'utilization': round(min(self.in_flight, self.workers) / self.workers, 3),
+            'avg_wait_ms': round(self._wait_total / completed * 1000, 2) if completed else 0.0,
+            'max_wait_ms': round(self._max_wait * 1000, 2),
+            'avg_run_ms': round(self._run_total / completed * 1000, 2) if completed else 0.0
+        }
+
+# 전역 CPU 프로세스 풀 인스턴스
+cpu_pool = CPUPoolService()
@@ -0,0 +1,196 @@
+"""
+오프라인 행정구역 역지오코딩 서비스
+행정동 경계 GeoJSON을 격자 + 사전 처리된 폴리곤 인덱스로 적재하여
+좌표 -> 시/도, 시/군/구, 읍/면/동 을 네트워크 호출 없이 조회
+"""
+import json
+import logging
+import math
+import os
+import time
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple
+
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+Ring = List[Tuple[float, float]]  # [(lng, lat), ...]
+
+
+class PreparedPolygon:
+    """
+    포함 판정용으로 미리 가공한 (멀티)폴리곤: 경계 상자 + 링 좌표 튜플
+    """
+    __slots__ = ('region', 'bbox', 'polygons')
+
+    def __init__(self, region: Dict[str, str], polygons: List[List[Ring]]):
+        self.region = region
+        self.polygons = polygons
+
+        xs = [x for polygon in polygons for x, _ in polygon[0]]
+        ys = [y for polygon in polygons for _, y in polygon[0]]
+        self.bbox = (min(xs), min(ys), max(xs), max(ys))
+
+    def contains(self, x: float, y: float) -> bool:
+        min_x, min_y, max_x, max_y = self.bbox
+        if not (min_x <= x <= max_x and min_y <= y <= max_y):
+            return False
+
+        for polygon in self.polygons:
+            # 외곽 링 안에 있고 구멍(hole) 안에는 없어야 함
+            if _ring_contains(polygon[0], x, y) and not any(
+                _ring_contains(hole, x, y) for hole in polygon[1:]
+            ):
+                return True
+
+        return False
+
+
+def _ring_contains(ring: Ring, x: float, y: float) -> bool:
+    """Ray casting point-in-polygon test"""
+    inside = False
+    j = len(ring) - 1
+
+    for i in range(len(ring)):
+        xi, yi = ring[i]
+        xj, yj = ring[j]
+        if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / (yj - yi) + xi:
+            inside = not inside
+        j = i
+
+    return inside
+
+
+class RegionGeocoderService:
+    def __init__(self, boundary_path: Optional[str] = None):
+        self.boundary_path = boundary_path or settings.REGION_BOUNDARY_PATH
+        self.cell_size = settings.REGION_INDEX_CELL_SIZE
+        self.polygons: List[PreparedPolygon] = []
+        self._cells: Dict[Tuple[int, int], List[int]] = {}
+
+    @property
+    def is_loaded(self) -> bool:
+        return len(self.polygons) > 0
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        행정동 경계 GeoJSON(FeatureCollection)을 읽어 인덱스를 구성합니다.
+        """
+        path = path or self.boundary_path
+        if not path or not os.path.exists(path):
+            logger.warning(f"Region boundary file not found: {path}")
+            return 0
+
+        start_time = time.time()
+
+        with open(path, 'r', encoding='utf-8') as f:
+            features = json.load(f).get('features', [])
+
+        polygons = []
+        cells = defaultdict(list)
+
+        for feature in features:
+            prepared = self._prepare_feature(feature)
+            if prepared is None:
+                continue
+
+            polygon_id = len(polygons)
+            polygons.append(prepared)
+
+            # 경계 상자가 걸치는 모든 셀에 등록
+            min_x, min_y, max_x, max_y = prepared.bbox
+            min_row, min_col = self._cell_of(min_y, min_x)
+            max_row, max_col = self._cell_of(max_y, max_x)
+            for row in range(min_row, max_row + 1):
+                for col in range(min_col, max_col + 1):
+                    cells[(row, col)].append(polygon_id)
+
+        self.polygons = polygons
+        self._cells = dict(cells)
+        self.boundary_path = path
+
+        logger.info(
+            f"Region boundaries loaded: {len(polygons)} regions, {len(cells)} cells "
+            f"({time.time() - start_time:.2f}s) from {path}"
+        )
+        return len(polygons)
+
+    def lookup(self, latitude: float, longitude: float) -> Optional[Dict[str, str]]:
+        """
+        좌표가 속한 행정구역을 반환합니다.
+        {'area1': 시/도, 'area2': 시/군/구, 'area3': 읍/면/동, 'code': 행정동코드}
+        """
+        for polygon_id in self._cells.get(self._cell_of(latitude, longitude), ()):
+            polygon = self.polygons[polygon_id]
+            if polygon.contains(longitude, latitude):
+                return dict(polygon.region)
+
+        return None
+
+    def lookup_address(self, latitude: float, longitude: float) -> Optional[str]:
+        """
+        행정구역 수준 주소 문자열 (예: "서울특별시 종로구 사직동")
+        """
+        region = self.lookup(latitude, longitude)
+        if not region:
+            return None
+
+        return ' '.join(region[area] for area in ('area1', 'area2', 'area3') if region.get(area))
+
+    def _cell_of(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (int(math.floor(lat / self.cell_size)), int(math.floor(lng / self.cell_size)))
+
+    def _prepare_feature(self, feature: Dict[str, Any]) -> Optional[PreparedPolygon]:
+        geometry = feature.get('geometry') or {}
+        properties = feature.get('properties') or {}
+
+        if geometry.get('type') == 'Polygon':
+            raw_polygons = [geometry.get('coordinates', [])]
+        elif geometry.get('type') == 'MultiPolygon':
+            raw_polygons = geometry.get('coordinates', [])
+        else:
+            return None
+
+        polygons = [
+            [[(float(x), float(y)) for x, y, *_ in ring] for ring in polygon]
+            for polygon in raw_polygons if polygon and polygon[0]
+        ]
+        if not polygons:
+            return None
+
+        return PreparedPolygon(self._region_properties(properties), polygons)
+
+    def _region_properties(self, properties: Dict[str, Any]) -> Dict[str, str]:
+        """
+        행정동 경계 데이터의 속성명을 area1/area2/area3 로 통일합니다.
+        (adm_nm: "서울특별시 종로구 사직동", sidonm/sggnm 형식 지원)
+        """
+        if properties.get('area1'):
+            return {
+                'area1': properties.get('area1', ''),
+                'area2': properties.get('area2', ''),
+                'area3': properties.get('area3', ''),
+                'code': str(properties.get('code', ''))
+            }
+
+        full_name = properties.get('adm_nm', '')
+        area1 = properties.get('sidonm', '')
+        area2 = properties.get('sggnm', '')
+        area3 = full_name.split(' ')[-1] if full_name else ''
+
+        if not area1 and full_name:
+            parts = full_name.split(' ')
+            area1 = parts[0]
+            area2 = ' '.join(parts[1:-1])
+
+        return {
+            'area1': area1,
+            'area2': area2,
+            'area3': area3,
+            'code': str(properties.get('adm_cd2') or properties.get('adm_cd', ''))
+        }
+
+
+# Service instance
+region_geocoder_service = RegionGeocoderService()
@@ -0,0 +1,295 @@
+"""
+공중화장실 카탈로그 서비스
+공공데이터포털 '전국공중화장실표준데이터' (CSV/JSON)를 로컬 공간 인덱스로 적재
+"""
+import csv
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from config import settings
+from utils.geo import GridIndex
+
+logger = logging.getLogger(__name__)
+
+# 표준데이터 컬럼명 -> 내부 필드명
+STANDARD_COLUMNS = {
+    'name': '화장실명',
+    'road_address': '소재지도로명주소',
+    'lot_address': '소재지지번주소',
+    'latitude': '위도',
+    'longitude': '경도',
+    'manager': '관리기관명',
+    'phone': '전화번호',
+    'open_hours': '개방시간',
+    'open_hours_detail': '개방시간상세',
+    'unisex': '남녀공용화장실여부',
+    'changing_table': '기저귀교환대유무',
+    'emergency_bell': '비상벨설치여부',
+    'data_date': '데이터기준일자',
+}
+
+ACCESSIBLE_COLUMNS = [
+    '남성용-장애인용대변기수',
+    '남성용-장애인용소변기수',
+    '여성용-장애인용대변기수',
+]
+
+CSV_ENCODINGS = ['utf-8-sig', 'cp949', 'euc-kr']
+
+# 편의시설 비트마스크 (레코드별로 인덱스와 함께 저장)
+FACILITY_WHEELCHAIR = 1 << 0
+FACILITY_UNISEX = 1 << 1
+FACILITY_CHANGING_TABLE = 1 << 2
+
+FACILITY_BITS = {
+    'wheelchair_accessible': FACILITY_WHEELCHAIR,
+    'unisex': FACILITY_UNISEX,
+    'changing_table': FACILITY_CHANGING_TABLE,
+}
+
+
+def facility_mask(facilities: Dict[str, Any]) -> int:
+    """
+    facilities dict (또는 필터 조건)를 비트마스크로 변환합니다.
+    """
+    mask = 0
+    for name, bit in FACILITY_BITS.items():
+        if facilities.get(name):
+            mask |= bit
+    return mask
+
+
+class RestroomCatalogService:
+    def __init__(self, data_path: Optional[str] = None):
+        self.data_path = data_path or settings.RESTROOM_DATA_PATH
+        self.index = GridIndex(cell_size=settings.RESTROOM_INDEX_CELL_SIZE)
+        self.records: List[Dict[str, Any]] = []
+        self.facility_masks: List[int] = []
+        self._positions: Dict[str, int] = {}
+        self.loaded_at: Optional[str] = None
+
+    @property
+    def is_loaded(self) -> bool:
+        return len(self.records) > 0
+
+    def load(self, path: Optional[str] = None) -> int:
+        """
+        CSV 또는 JSON 파일을 읽어 인덱스를 새로 구성합니다.
+        """
+        path = path or self.data_path
+        if not path or not os.path.exists(path):
+            logger.warning(f"Restroom data file not found: {path}")
+            return 0
+
+        start_time = time.time()
+
+        if path.lower().endswith('.csv'):
+            rows = self._read_csv(path)
+        else:
+            rows = self._read_json(path)
+
+        index = GridIndex(cell_size=settings.RESTROOM_INDEX_CELL_SIZE)
+        records = []
+        masks = []
+        skipped = 0
+
+        for row in rows:
+            record = self._normalize_row(row, len(records))
+            if record is None:
+                skipped += 1
+                continue
+
+            index.insert(record['latitude'], record['longitude'])
+            records.append(record)
+            masks.append(facility_mask(record['facilities']))
+
+        # 인덱스 교체는 한 번에 (조회 중인 요청이 반쯤 만들어진 인덱스를 보지 않도록)
+        self.index = index
+        self.records = records
+        self.facility_masks = masks
+        self._positions = {record['id']: position for position, record in enumerate(records)}
+        self.data_path = path
+        self.loaded_at = time.strftime('%Y-%m-%dT%H:%M:%S')
+
+        logger.info(
+            f"Restroom catalog loaded: {len(records)} records, {skipped} skipped "
+            f"({time.time() - start_time:.2f}s) from {path}"
+        )
+        return len(records)
+
+    def save(self, path: str) -> None:
+        """
+        정규화된 레코드를 JSON으로 저장합니다. (다음 기동 시 그대로 load 가능)
+        """
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'records': self.records}, f, ensure_ascii=False)
+
+        logger.info(f"Restroom catalog saved: {len(self.records)} records to {path}")
+
+    def update_address(self, record_id: str, address: str) -> None:
+        """
+        역지오코딩으로 얻은 주소를 레코드에 기록합니다. (이후 요청은 외부 호출 없이 응답)
+        """
+        position = self._positions.get(record_id)
+        if position is not None:
+            self.records[position]['address'] = address
+
+    async def resolve_missing_addresses(self) -> int:
+        """
+        주소가 비어 있는 레코드를 일괄 역지오코딩합니다. (가져오기 단계에서 1회 실행)
+        """
+        from services.geocoding_service import geocoding_service
+
+        missing = [record for record in self.records if not record.get('address')]
+        if not missing:
+            return 0
+
+        addresses = await geocoding_service.reverse_geocode_many(
+            [(record['latitude'], record['longitude']) for record in missing]
+        )
+
+        resolved = 0
+        for record, address in zip(missing, addresses):
+            if address:
+                record['address'] = address
+                resolved += 1
+
+        logger.info(f"Resolved {resolved}/{len(missing)} missing restroom addresses")
+        return resolved
+
+    def find_nearby(self, latitude: float, longitude: float, radius: int = 1000,
+                    limit: int = 20, required_facilities: int = 0) -> List[Dict[str, Any]]:
+        """
+        반경 내 화장실을 거리순으로 반환합니다.
+        required_facilities 비트가 모두 설정된 레코드만 포함합니다.
+        """
+        results = []
+        predicate = None
+
+        if required_facilities:
+            masks = self.facility_masks
+            predicate = lambda record_id: masks[record_id] & required_facilities == required_facilities
+
+        for record_id, distance in self.index.query_radius(latitude, longitude, radius, predicate):
+            restroom = dict(self.records[record_id])
+            restroom['distance'] = round(distance)
+            results.append(restroom)
+
+            if len(results) >= limit:
+                break
+
+        return results
+
+    def _read_csv(self, path: str) -> List[Dict[str, Any]]:
+        # 공공데이터 CSV는 대부분 CP949로 배포됨
+        for encoding in CSV_ENCODINGS:
+            try:
+                with open(path, 'r', encoding=encoding, newline='') as f:
+                    return list(csv.DictReader(f))
+            except UnicodeDecodeError:
+                continue
+
+        raise ValueError(f"Unsupported encoding for restroom CSV: {path}")
+
+    def _read_json(self, path: str) -> Iterable[Dict[str, Any]]:
+        with open(path, 'r', encoding='utf-8') as f:
+            data = json.load(f)
+
+        if isinstance(data, dict):
+            # 저장 포맷({'records': [...]}) 또는 공공데이터 API 응답 포맷
+            for key in ('records', 'data', 'items'):
+                if isinstance(data.get(key), list):
+                    return data[key]
+            return data.get('response', {}).get('body', {}).get('items', []) or []
+
+        return data if isinstance(data, list) else []
+
+    def _normalize_row(self, row: Dict[str, Any], position: int) -> Optional[Dict[str, Any]]:
+        """
+        표준데이터 행(또는 이미 정규화된 레코드)을 API 응답 형태로 변환합니다.
+        """
+        # 이미 정규화된 레코드 (save()로 저장된 파일)
+        if 'facilities' in row and 'latitude' in row:
+            try:
+                row['latitude'] = float(row['latitude'])
+                row['longitude'] = float(row['longitude'])
+                return row
+            except (TypeError, ValueError):
+                return None
+
+        def column(field: str) -> str:
+            value = row.get(STANDARD_COLUMNS[field], row.get(field, ''))
+            return str(value).strip() if value is not None else ''
+
+        try:
+            latitude = float(column('latitude'))
+            longitude = float(column('longitude'))
+        except ValueError:
+            return None
+
+        # 좌표 누락(0) 또는 국내 범위 밖 데이터 제외
+        if not (33 <= latitude <= 39 and 124 <= longitude <= 132):
+            return None
+
+        accessible = False
+        for accessible_column in ACCESSIBLE_COLUMNS:
+            try:
+                if int(float(row.get(accessible_column) or 0)) > 0:
+                    accessible = True
+                    break
+            except (TypeError, ValueError):
+                continue
+
+        road_address = column('road_address')
+        lot_address = column('lot_address')
+
+        return {
+            'id': f"publicdata_{position}",
+            'name': column('name') or '공중화장실',
+            'address': road_address or lot_address,
+            'address_en': '',
+            'latitude': latitude,
+            'longitude': longitude,
+            'type': 'public_restroom',
+            'source': 'public_data',
+            'facilities': {
+                'wheelchair_accessible': accessible,
+                'unisex': column('unisex').upper() == 'Y',
+                'changing_table': column('changing_table').upper() == 'Y'
+            },
+            'details': {
+                'lot_address': lot_address,
+                'manager': column('manager'),
+                'phone': column('phone'),
+                'open_hours': column('open_hours'),
+                'open_hours_detail': column('open_hours_detail'),
+                'emergency_bell': column('emergency_bell').upper() == 'Y',
+                'data_date': column('data_date')
+            }
+        }
+
+
+# Service instance
+restroom_catalog_service = RestroomCatalogService()
+
+
+if __name__ == "__main__":
+    # 원본 표준데이터를 정규화된 JSON으로 변환 (누락된 주소는 이 단계에서 채움)
+    #   python -m services.restroom_catalog_service 전국공중화장실표준데이터.csv data/restrooms.json
+    import asyncio
+    import sys
+
+    logging.basicConfig(level=logging.INFO)
+
+    if len(sys.argv) != 3:
+        print("Usage: python -m services.restroom_catalog_service <source.csv|json> <output.json>")
+        sys.exit(1)
+
+    catalog = RestroomCatalogService()
+    if catalog.load(sys.argv[1]) == 0:
+        sys.exit(1)
+    asyncio.run(catalog.resolve_missing_addresses())
+    catalog.save(sys.argv[2])
@@ -1,12 +1,120 @@
+import asyncio
 import boto3
 import uuid
 from datetime import datetime
 from botocore.exceptions import ClientError
 from config import settings
+from typing import Dict, List, Optional
 import logging
 
 logger = logging.getLogger(__name__)
 
+# S3 멀티파트 업로드의 최소 파트 크기 (마지막 파트 제외)
+MIN_MULTIPART_PART_SIZE = 5 * 1024 * 1024
+
+class S3StreamUpload:
+    """
+    청크 단위로 받은 데이터를 S3에 스트리밍 업로드합니다.
+
+    part_size 만큼 모일 때마다 멀티파트 파트로 전송하므로 요청당 메모리는 파트 하나로 제한됩니다.
+    전체 크기가 한 파트보다 작으면 멀티파트 없이 put_object 한 번으로 끝냅니다.
+    metadata 는 첫 전송 전까지 갱신할 수 있습니다 (헤더 파싱 후 GPS 등 기록).
+    """
+
+    def __init__(self, client, bucket_name: str, key: str, content_type: str,
+                 metadata: Optional[Dict[str, str]] = None, part_size: int = MIN_MULTIPART_PART_SIZE):
+        self.client = client
+        self.bucket_name = bucket_name
+        self.key = key
+        self.content_type = content_type
+        self.metadata = metadata or {}
+        self.part_size = max(part_size, MIN_MULTIPART_PART_SIZE)
+        self.size = 0
+
+        self._buffer = bytearray()
+        self._upload_id: Optional[str] = None
+        self._parts: List[Dict] = []
+
+    @property
+    def url(self) -> str:
+        return f"https://{self.bucket_name}.s3.{settings.AWS_REGION}.amazonaws.com/{self.key}"
+
+    async def write(self, chunk: bytes) -> None:
+        self._buffer += chunk
+        self.size += len(chunk)
+        if len(self._buffer) >= self.part_size:
+            await self._upload_part()
+
+    async def _upload_part(self) -> None:
+        if self._upload_id is None:
+            response = await asyncio.to_thread(
+                self.client.create_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=self.key,
+                ContentType=self.content_type,
+                Metadata=self.metadata
+            )
+            self._upload_id = response['UploadId']
+
+        body, self._buffer = self._buffer, bytearray()
+        part_number = len(self._parts) + 1
+        response = await asyncio.to_thread(
+            self.client.upload_part,
+            Bucket=self.bucket_name,
+            Key=self.key,
+            UploadId=self._upload_id,
+            PartNumber=part_number,
+            Body=body
+        )
+        self._parts.append({'ETag': response['ETag'], 'PartNumber': part_number})
+
+    async def complete(self) -> str:
+        """
+        남은 데이터를 전송하고 업로드를 마무리한 뒤 객체 URL을 반환합니다.
+        """
+        if self._upload_id is None:
+            body, self._buffer = self._buffer, bytearray()
+            await asyncio.to_thread(
+                self.client.put_object,
+                Bucket=self.bucket_name,
+                Key=self.key,
+                Body=body,
+                ContentType=self.content_type,
+                Metadata=self.metadata
+            )
+        else:
+            if self._buffer:
+                await self._upload_part()
+            await asyncio.to_thread(
+                self.client.complete_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=self.key,
+                UploadId=self._upload_id,
+                MultipartUpload={'Parts': self._parts}
+            )
+
+        return self.url
+
+    async def abort(self) -> None:
+        """
+        진행 중인 멀티파트 업로드를 취소합니다. (업로드된 파트 정리)
+        """
+        self._buffer = bytearray()
+        if self._upload_id is None:
+            return
+
+        try:
+            await asyncio.to_thread(
+                self.client.abort_multipart_upload,
+                Bucket=self.bucket_name,
+                Key=self.key,
+                UploadId=self._upload_id
+            )
+        except ClientError as e:
+            logger.error(f"Failed to abort multipart upload {self.key}: {e}")
+        finally:
+            self._upload_id = None
+
 class S3Service:
     def __init__(self):
         self.s3_client = boto3.client(
@@ -53,6 +161,43 @@ class S3Service:
             logger.error(f"Failed to upload image to S3: {e}")
             raise Exception(f"S3 upload failed: {str(e)}")
 
+    def open_stream(self, key: str, content_type: str, metadata: Optional[Dict[str, str]] = None) -> S3StreamUpload:
+        """
+        청크 단위 스트리밍 업로드를 시작합니다.
+        """
+        return S3StreamUpload(
+            self.s3_client,
+            self.bucket_name,
+            key,
+            content_type,
+            metadata=metadata,
+            part_size=settings.S3_MULTIPART_PART_SIZE
+        )
+
+    async def read_object(self, key: str) -> Optional[bytes]:
+        """
+        객체 내용을 읽습니다. 객체가 없으면 None 을 반환합니다.
+        """
+        def read() -> Optional[bytes]:
+            try:
+                response = self.s3_client.get_object(Bucket=self.bucket_name, Key=key)
+            except ClientError as e:
+                if e.response.get('Error', {}).get('Code') in ('NoSuchKey', '404'):
+                    return None
+                raise
+            return response['Body'].read()
+
+        return await asyncio.to_thread(read)
+
+    async def write_object(self, key: str, data: bytes, content_type: str, cache_control: Optional[str] = None) -> None:
+        """
+        작은 객체(파생 이미지 등)를 저장합니다.
+        """
+        params = {'Bucket': self.bucket_name, 'Key': key, 'Body': data, 'ContentType': content_type}
+        if cache_control:
+            params['CacheControl'] = cache_control
+        await asyncio.to_thread(self.s3_client.put_object, **params)
+
     def _get_file_extension(self, content_type: str) -> str:
         """
         Content-Type에서 파일 확장자를 추출합니다.
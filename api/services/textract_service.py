@@ -5,6 +5,8 @@ import boto3
 import logging
 from typing import List, Dict, Optional
 from config import settings
+from services.image_derivative_service import image_derivatives
+from services.mock_providers import create_textract_mock, mock_enabled
 
 logger = logging.getLogger(__name__)
 
@@ -22,6 +24,8 @@ class TextractService:
         이미지에서 텍스트 추출
         """
         try:
+            # 방향 보정 + 축소 파생본 (동기 API Bytes 5MB 제한)
+            image_bytes = await image_derivatives.derive(image_bytes, 'textract')
             response = self.client.detect_document_text(
                 Document={'Bytes': image_bytes}
             )
@@ -90,9 +94,12 @@ class MockTextractService:
     def filter_korean_business_names(self, texts: List[Dict[str, str]]) -> List[str]:
         return [text['text'] for text in texts if '카페' in text['text'] or '편의점' in text['text'] or '찌개' in text['text']]
 
-# 서비스 인스턴스 (AWS 설정에 따라 선택)
-try:
-    textract_service = TextractService()
-except:
-    logger.warning("AWS Textract 설정 실패, Mock 서비스 사용")
-    textract_service = MockTextractService()
+# 서비스 인스턴스 (MOCK_PROVIDERS 설정 또는 AWS 설정에 따라 선택)
+if mock_enabled('textract'):
+    textract_service = create_textract_mock()
+else:
+    try:
+        textract_service = TextractService()
+    except:
+        logger.warning("AWS Textract 설정 실패, Mock 서비스 사용")
+        textract_service = MockTextractService()
@@ -0,0 +1,197 @@
+"""
+저장된 사진의 썸네일 / WebP 파생본
+첫 요청 시 생성해 원본 옆에 저장하고(로컬: static/uploads, S3: 같은 prefix) 이후에는 저장본을 사용합니다.
+원본과 파생본은 키가 바뀌지 않으므로 응답은 장기 캐시(immutable)로 제공합니다.
+
+  로컬 업로드: uploads/<파일명>            -> static/uploads/<파일명>.w320.webp
+  S3 업로드:   photos/<request_id>/<파일명> -> photos/<request_id>/<파일명>.w320.webp
+"""
+import asyncio
+import bisect
+import hashlib
+import logging
+import os
+import re
+from typing import Any, Dict, Optional, Tuple
+from PIL import Image
+from config import settings
+from services.image_derivative_service import render_thumbnail
+from services.local_storage_service import local_storage_service
+from services.process_pool_service import WorkerCrashedError, cpu_pool
+from services.s3_service import s3_service
+from utils.cache import TTLCache
+
+logger = logging.getLogger(__name__)
+
+FORMATS = {
+    'webp': ('WEBP', 'image/webp'),
+    'jpeg': ('JPEG', 'image/jpeg'),
+    'jpg': ('JPEG', 'image/jpeg')
+}
+
+LOCAL_PREFIX = 'uploads/'
+S3_PREFIX = 'photos/'
+
+# 파생본 키 (파생본의 파생본을 만들지 않도록 원본 키로 받지 않음)
+DERIVATIVE_SUFFIX = re.compile(r'\.w\d+\.(webp|jpeg)$')
+
+class UnsupportedImageError(Exception):
+    """저장된 원본을 이미지로 디코딩할 수 없음"""
+
+class ThumbnailService:
+    """
+    (키, 너비, 형식) -> 파생본 bytes
+    """
+
+    def __init__(self):
+        self.widths = sorted(settings.THUMBNAIL_WIDTHS)
+        self.quality = settings.THUMBNAIL_QUALITY
+        self.cache = TTLCache(
+            maxsize=settings.THUMBNAIL_CACHE_SIZE,
+            ttl=settings.THUMBNAIL_CACHE_TTL,
+            max_bytes=settings.THUMBNAIL_CACHE_BYTES
+        )
+        # 없는 원본 키: 임의의 키 요청이 매번 저장소(S3 GET)까지 가지 않도록 잠시 기억
+        self.missing = TTLCache(maxsize=4096, ttl=settings.THUMBNAIL_NOT_FOUND_TTL)
+        self._inflight: Dict[Tuple[str, int, str], asyncio.Future] = {}
+        self.stats = {'generated': 0, 'stored_hits': 0, 'not_found': 0, 'failed': 0}
+
+    def snap_width(self, width: int) -> int:
+        """
+        요청 너비를 허용 너비 중 같거나 큰 값으로 맞춥니다. (임의 크기로 파생본이 늘어나는 것 방지)
+        """
+        index = bisect.bisect_left(self.widths, width)
+        return self.widths[min(index, len(self.widths) - 1)]
+
+    @staticmethod
+    def derivative_key(key: str, width: int, fmt: str) -> str:
+        return f"{key}.w{width}.{fmt}"
+
+    @staticmethod
+    def etag(key: str, width: int, fmt: str) -> str:
+        """
+        원본 키는 업로드마다 고유하므로 파생본 키만으로 ETag 를 만들 수 있습니다.
+        """
+        fmt = 'jpeg' if fmt == 'jpg' else fmt
+        return '"' + hashlib.sha1(f"{key}:{width}:{fmt}".encode()).hexdigest()[:16] + '"'
+
+    @staticmethod
+    def validate(key: str, fmt: str) -> str:
+        """
+        키와 형식을 검사하고 정규화된 형식을 반환합니다. 잘못되면 ValueError 를 발생시킵니다.
+        """
+        if fmt not in FORMATS:
+            raise ValueError(f"Unsupported format: {fmt}")
+        parts = key.split('/')
+        if (not key.startswith((LOCAL_PREFIX, S3_PREFIX))
+                or any(part in ('', '.', '..') for part in parts)
+                or DERIVATIVE_SUFFIX.search(key)):
+            raise ValueError(f"Invalid photo key: {key}")
+        return 'jpeg' if fmt == 'jpg' else fmt
+
+    async def get(self, key: str, width: int, fmt: str) -> Optional[Tuple[bytes, str]]:
+        """
+        파생본과 Content-Type 을 반환합니다. 원본이 없으면 None.
+        잘못된 키/형식이면 ValueError, 원본이 이미지가 아니면 UnsupportedImageError 를 발생시킵니다.
+        """
+        fmt = self.validate(key, fmt)
+        if self.missing.get(key):
+            self.stats['not_found'] += 1
+            return None
+
+        cache_key = (key, width, fmt)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached, FORMATS[fmt][1]
+
+        if cache_key in self._inflight:
+            # 먼저 시작한 요청이 실패하면 같은 예외를 받음
+            data = await asyncio.shield(self._inflight[cache_key])
+            return (data, FORMATS[fmt][1]) if data is not None else None
+
+        future = asyncio.get_running_loop().create_future()
+        self._inflight[cache_key] = future
+        try:
+            data = await self._load_or_generate(key, width, fmt)
+        except BaseException as e:
+            future.set_exception(e)
+            # 대기자가 없으면 "exception was never retrieved" 경고가 나지 않도록 소비
+            future.exception()
+            raise
+        else:
+            future.set_result(data)
+            if data is not None:
+                self.cache.set(cache_key, data)
+        finally:
+            self._inflight.pop(cache_key, None)
+
+        return (data, FORMATS[fmt][1]) if data is not None else None
+
+    async def _load_or_generate(self, key: str, width: int, fmt: str) -> Optional[bytes]:
+        derivative_key = self.derivative_key(key, width, fmt)
+
+        stored = await self._read(derivative_key)
+        if stored is not None:
+            self.stats['stored_hits'] += 1
+            return stored
+
+        original = await self._read(key)
+        if original is None:
+            self.stats['not_found'] += 1
+            self.missing.set(key, True)
+            return None
+
+        image_format, content_type = FORMATS[fmt]
+        try:
+            data = await cpu_pool.run(render_thumbnail, original, width, image_format, self.quality)
+        except (OSError, ValueError, Image.DecompressionBombError, WorkerCrashedError) as e:
+            # UnidentifiedImageError / 잘린 파일 / 압축 폭탄 / 워커 비정상 종료
+            self.stats['failed'] += 1
+            raise UnsupportedImageError(f"Cannot render {key}: {e}")
+        await self._write(derivative_key, data, content_type)
+        self.stats['generated'] += 1
+        logger.info(f"Thumbnail generated: {derivative_key} ({len(original)} -> {len(data)} bytes)")
+        return data
+
+    @staticmethod
+    def _local_path(key: str) -> Optional[str]:
+        if not key.startswith(LOCAL_PREFIX):
+            return None
+        return os.path.join(local_storage_service.upload_dir, key[len(LOCAL_PREFIX):])
+
+    async def _read(self, key: str) -> Optional[bytes]:
+        path = self._local_path(key)
+        if path is None:
+            return await s3_service.read_object(key)
+
+        def read() -> Optional[bytes]:
+            if not os.path.isfile(path):
+                return None
+            with open(path, 'rb') as f:
+                return f.read()
+
+        return await asyncio.to_thread(read)
+
+    async def _write(self, key: str, data: bytes, content_type: str) -> None:
+        path = self._local_path(key)
+        if path is None:
+            await s3_service.write_object(
+                key, data, content_type,
+                cache_control=f"public, max-age={settings.THUMBNAIL_MAX_AGE}, immutable"
+            )
+            return
+
+        def write() -> None:
+            # 동시 요청이 쓰는 중인 파일을 읽지 않도록 임시 파일에 쓴 뒤 교체
+            temp_path = f"{path}.{os.getpid()}.tmp"
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+
+        await asyncio.to_thread(write)
+
+    def metrics(self) -> Dict[str, Any]:
+        return {**self.stats, 'cache': self.cache.stats(), 'missing': self.missing.stats()}
+
+# 전역 썸네일 서비스 인스턴스
+thumbnail_service = ThumbnailService()
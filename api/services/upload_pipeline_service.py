@@ -0,0 +1,192 @@
+"""
+사진 업로드 스트리밍 파이프라인
+업로드 파일을 청크 단위로 읽으며 형식 판별, 크기 제한, 콘텐츠 해시, S3 멀티파트 업로드,
+헤더/EXIF 파싱을 한 번의 순회로 처리합니다. 파일 전체를 메모리에 올리지 않으므로
+동시 업로드가 많아도 요청당 메모리는 (읽기 청크 + 헤더 버퍼 + S3 파트 하나)로 제한됩니다.
+"""
+import hashlib
+import logging
+from datetime import datetime
+from typing import Any, Dict, Optional
+from fastapi import HTTPException, UploadFile
+from config import settings
+from services.photo_dedup_service import photo_dedup
+from services.s3_service import MIN_MULTIPART_PART_SIZE, s3_service
+from services.process_pool_service import WorkerCrashedError, cpu_pool
+from utils.image_inspector import inspect_head
+from utils.validators import sniff_image_type, validate_image_dimensions
+
+logger = logging.getLogger(__name__)
+
+# 형식 판별에 필요한 최소 바이트 수 (WEBP/HEIF 는 12바이트)
+SNIFF_BYTES = 12
+
+class UploadPipeline:
+    """
+    UploadFile -> S3 스트리밍 업로드 + 메타데이터 추출
+    """
+
+    def __init__(self):
+        self.chunk_size = max(settings.UPLOAD_CHUNK_SIZE, SNIFF_BYTES)
+        self.head_size = settings.UPLOAD_HEAD_BYTES
+        self.max_size = settings.MAX_FILE_SIZE
+
+        self.active = 0
+        self.peak_active = 0
+        self.stats = {'completed': 0, 'rejected': 0, 'failed': 0, 'bytes': 0, 'multipart': 0, 'deduplicated': 0}
+
+    async def process(self, file: UploadFile, key: str, request_id: Optional[str] = None) -> Dict[str, Any]:
+        """
+        업로드 파일을 청크 단위로 S3에 전송하고 메타데이터를 반환합니다.
+
+        형식이 허용되지 않거나 크기/해상도 제한을 넘으면 남은 데이터를 읽지 않고
+        HTTPException(413/415/400)을 발생시키며, 이미 올라간 멀티파트 파트는 취소합니다.
+
+        request_id 가 주어지면 업로드 확정 전에 콘텐츠 해시로 중복을 확인합니다.
+        이미 업로드된 사진이면 새 객체를 만들지 않고(put_object 생략 / 멀티파트 취소)
+        기존 객체 정보와 최초 요청 ID(duplicate_of)를 반환합니다.
+        """
+        self.active += 1
+        self.peak_active = max(self.peak_active, self.active)
+
+        digest = hashlib.sha256()
+        head = bytearray()
+        size = 0
+        content_type: Optional[str] = None
+        header: Optional[Dict[str, Any]] = None
+        stream = None
+
+        try:
+            while True:
+                chunk = await file.read(self.chunk_size)
+                if not chunk:
+                    break
+
+                size += len(chunk)
+                if size > self.max_size:
+                    raise HTTPException(
+                        status_code=413,
+                        detail=f"File size too large. Maximum size is {self.max_size} bytes"
+                    )
+
+                if content_type is None:
+                    content_type = sniff_image_type(chunk)
+                    if content_type not in settings.ALLOWED_IMAGE_TYPES:
+                        raise HTTPException(
+                            status_code=415,
+                            detail=f"Unsupported file type. Allowed types: {', '.join(settings.ALLOWED_IMAGE_TYPES)}"
+                        )
+                    stream = s3_service.open_stream(key, content_type, {'upload_time': datetime.now().isoformat()})
+
+                digest.update(chunk)
+                if header is None:
+                    head += chunk[:self.head_size - len(head)]
+                    if len(head) >= self.head_size:
+                        header = await self._inspect_head(bytes(head), stream, complete=False)
+                        head = bytearray()
+
+                await stream.write(chunk)
+
+            if stream is None:
+                raise HTTPException(status_code=400, detail="Empty file")
+
+            # 헤더 버퍼보다 작은 파일
+            if header is None:
+                header = await self._inspect_head(bytes(head), stream, complete=True)
+
+            sha256 = digest.hexdigest()
+            duplicate = photo_dedup.claim(sha256, request_id, key, stream.url) if request_id else None
+            if duplicate is not None:
+                await stream.abort()
+                self.stats['deduplicated'] += 1
+                return {
+                    's3_key': duplicate['s3_key'],
+                    's3_url': duplicate['s3_url'],
+                    'content_type': content_type,
+                    'file_size': size,
+                    'sha256': sha256,
+                    'duplicate_of': duplicate['request_id'],
+                    **header
+                }
+
+            try:
+                s3_url = await stream.complete()
+            except BaseException:
+                if request_id:
+                    photo_dedup.release(sha256, request_id)
+                raise
+
+        except HTTPException:
+            self.stats['rejected'] += 1
+            if stream is not None:
+                await stream.abort()
+            raise
+        except BaseException:
+            self.stats['failed'] += 1
+            if stream is not None:
+                await stream.abort()
+            raise
+        finally:
+            self.active -= 1
+
+        self.stats['completed'] += 1
+        self.stats['bytes'] += size
+        if stream.size >= stream.part_size:
+            self.stats['multipart'] += 1
+
+        return {
+            's3_key': key,
+            's3_url': s3_url,
+            'content_type': content_type,
+            'file_size': size,
+            'sha256': sha256,
+            'duplicate_of': None,
+            **header
+        }
+
+    @staticmethod
+    async def _inspect_head(head: bytes, stream, complete: bool) -> Dict[str, Any]:
+        """
+        앞부분 바이트를 한 번 파싱해 해상도를 검증하고 EXIF 메타데이터와 지각 해시를 추출합니다.
+        파싱은 CPU 프로세스 풀에서 실행하며, GPS 좌표는 S3 객체 메타데이터에도 기록합니다.
+        (complete: head 가 파일 전체인지)
+        """
+        try:
+            inspection = await cpu_pool.run(inspect_head, head, complete)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid image file: {str(e)}")
+        except WorkerCrashedError:
+            raise HTTPException(status_code=415, detail="Image could not be processed")
+        validate_image_dimensions(inspection['width'], inspection['height'])
+
+        gps = inspection['gps_coordinates']
+        if gps:
+            stream.metadata.update({
+                'latitude': str(gps['latitude']),
+                'longitude': str(gps['longitude'])
+            })
+
+        return {
+            'width': inspection['width'],
+            'height': inspection['height'],
+            'orientation': inspection['orientation'],
+            'phash': inspection['phash'],
+            'exif_metadata': {
+                'has_exif': inspection['has_exif'],
+                'has_gps': inspection['has_gps'],
+                'gps_coordinates': gps,
+                'camera_info': inspection['camera_info'],
+                'exif_data': inspection['exif_data']
+            }
+        }
+
+    def metrics(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'active': self.active,
+            'peak_active': self.peak_active,
+            'max_buffered_per_upload': self.chunk_size + self.head_size + max(settings.S3_MULTIPART_PART_SIZE, MIN_MULTIPART_PART_SIZE)
+        }
+
+# 전역 업로드 파이프라인 인스턴스
+upload_pipeline = UploadPipeline()
@@ -0,0 +1,412 @@
+"""
+업스트림 거버너 - 업스트림별 속도 제한 / 적응형 동시성 / 서킷 브레이커
+쿼터 초과나 장애 시 빠르게 실패하고, 가능하면 마지막 정상 응답(stale)을 대신 반환
+"""
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional
+
+import httpx
+
+from config import settings
+from utils.cache import TTLCache
+from utils.deadline import remaining
+
+logger = logging.getLogger(__name__)
+
+# 업스트림(정책)별 설정
+#   rate: 초당 허용 요청 수 (제공자 쿼터 기준), burst: 순간 최대 토큰,
+#   max_concurrency: 동시 요청 상한, latency_target: 이 지연(초)을 넘으면 동시성 축소,
+#   hedge: 멱등 요청이 p95 지연을 넘기면 두 번째 요청을 보냄 (쿼터 여유가 있을 때만)
+POLICIES: Dict[str, Dict[str, float]] = {
+    'naver_geocode': {'rate': 20, 'burst': 20, 'max_concurrency': 32, 'latency_target': 0.5, 'hedge': True},
+    'naver_reverse': {'rate': 20, 'burst': 20, 'max_concurrency': 32, 'latency_target': 0.5, 'hedge': True},
+    'naver_search': {'rate': 10, 'burst': 10, 'max_concurrency': 16, 'latency_target': 0.5, 'hedge': True},
+    'kakao_local': {'rate': 30, 'burst': 30, 'max_concurrency': 32, 'latency_target': 0.5, 'hedge': True},
+    'cha': {'rate': 5, 'burst': 10, 'max_concurrency': 8, 'latency_target': 2.0},
+    'kto': {'rate': 10, 'burst': 10, 'max_concurrency': 8, 'latency_target': 1.0, 'hedge': True},
+    'openrestroom': {'rate': 2, 'burst': 4, 'max_concurrency': 4, 'latency_target': 2.0},
+    'google_vision': {'rate': 10, 'burst': 10, 'max_concurrency': 16, 'latency_target': 3.0},
+}
+
+
+class UpstreamUnavailableError(Exception):
+    """서킷이 열려 있거나 쿼터/동시성 대기 시간을 초과해 요청을 보내지 않음"""
+
+    def __init__(self, upstream: str, reason: str):
+        self.upstream = upstream
+        self.reason = reason
+        super().__init__(f"Upstream {upstream} unavailable: {reason}")
+
+
+class TokenBucket:
+    """
+    초당 rate개씩 채워지는 토큰 버킷 (최대 burst개)
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated_at = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+
+    def try_acquire(self) -> bool:
+        """대기 없이 토큰을 가져옵니다. (헤지 요청용 - 쿼터 여유가 없으면 보내지 않음)"""
+        self._refill()
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return True
+        return False
+
+    async def acquire(self, max_wait: float) -> None:
+        self._refill()
+
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return
+
+        wait = (1 - self.tokens) / self.rate
+        if wait > max_wait:
+            raise UpstreamUnavailableError('rate_limiter', f"quota wait {wait:.2f}s exceeds {max_wait:.2f}s")
+
+        # 토큰을 미리 예약(음수 허용)하고 채워질 때까지 대기 - 먼저 온 요청이 먼저 나감
+        self.tokens -= 1
+        try:
+            await asyncio.sleep(wait)
+        except asyncio.CancelledError:
+            self.refund()
+            raise
+
+    def refund(self) -> None:
+        """요청을 보내지 못한 토큰을 돌려줍니다. (동시성 거절, 취소)"""
+        self._refill()
+        self.tokens = min(self.burst, self.tokens + 1)
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD 동시성 제한: 지연이 목표 이내면 한도를 천천히 늘리고(+1/limit),
+    목표를 넘거나 실패하면 빠르게 줄임(x0.7)
+    """
+
+    def __init__(self, max_limit: int, latency_target: float, min_limit: int = 1):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target = latency_target
+        self.limit = float(max(min_limit, max_limit // 2))
+        self.in_flight = 0
+        self._waiters: deque = deque()
+        self._last_decrease = 0.0
+
+    def try_acquire(self) -> bool:
+        """대기 없이 슬롯을 가져옵니다. (헤지 요청용 - 여유 슬롯이 없으면 보내지 않음)"""
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return True
+        return False
+
+    async def acquire(self, timeout: float) -> None:
+        if self.in_flight < int(self.limit) and not self._waiters:
+            self.in_flight += 1
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        try:
+            # 슬롯은 release()에서 넘겨받음
+            # (wait_for 는 완료와 취소가 겹치면 취소를 삼키므로 asyncio.timeout 사용)
+            async with asyncio.timeout(timeout):
+                await future
+        except (asyncio.TimeoutError, asyncio.CancelledError) as e:
+            if future.done() and not future.cancelled():
+                # release()가 슬롯을 넘겨준 직후 시간 초과/취소됨 - 슬롯을 반납해 다음 대기자에게 넘김
+                self.release(0.0, None)
+            elif future in self._waiters:
+                self._waiters.remove(future)
+            if isinstance(e, asyncio.TimeoutError):
+                raise UpstreamUnavailableError('concurrency_limiter', f"no slot within {timeout:.2f}s")
+            raise
+
+    def release(self, latency: float, success: Optional[bool]) -> None:
+        """
+        success=None 은 표본 없음(취소, 요청 데드라인 초과) - 슬롯만 반납하고 한도는 그대로 둠
+        """
+        self.in_flight -= 1
+
+        if success is None:
+            pass
+        elif not success or latency > self.latency_target:
+            # 동시에 끝난 느린 응답들이 한도를 연쇄적으로 깎지 않도록 목표 지연당 1회만 감소
+            now = time.monotonic()
+            if now - self._last_decrease >= self.latency_target:
+                self.limit = max(self.min_limit, self.limit * 0.7)
+                self._last_decrease = now
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        while self._waiters and self.in_flight < int(self.limit):
+            future = self._waiters.popleft()
+            if not future.done():
+                self.in_flight += 1
+                future.set_result(None)
+
+
+class CircuitBreaker:
+    """
+    연속 실패가 failure_threshold에 도달하면 열림(open) -> reset_timeout 후
+    시험 요청 1건만 허용(half-open) -> 성공 시 닫힘(closed)
+    """
+
+    def __init__(self, failure_threshold: int, reset_timeout: float):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+        self._trial_in_flight = False
+
+    def allow(self) -> bool:
+        if self.state == 'closed':
+            return True
+
+        if self.state == 'open' and time.monotonic() - self.opened_at >= self.reset_timeout:
+            self.state = 'half_open'
+            self._trial_in_flight = False
+
+        if self.state == 'half_open' and not self._trial_in_flight:
+            self._trial_in_flight = True
+            return True
+
+        return False
+
+    def cancel_trial(self) -> None:
+        """시험 요청이 업스트림에 도달하지 못한 경우 (쿼터 거절, 취소 등)"""
+        self._trial_in_flight = False
+
+    def record_success(self) -> None:
+        self.state = 'closed'
+        self.failures = 0
+        self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        self.failures += 1
+        self._trial_in_flight = False
+
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            if self.state != 'open':
+                logger.warning(f"Circuit opened after {self.failures} failures")
+            self.state = 'open'
+            self.opened_at = time.monotonic()
+
+
+class UpstreamPolicy:
+    def __init__(self, name: str, config: Dict[str, float]):
+        self.name = name
+        self.bucket = TokenBucket(config['rate'], config['burst'])
+        self.limiter = AdaptiveConcurrencyLimiter(int(config['max_concurrency']), config['latency_target'])
+        self.breaker = CircuitBreaker(settings.CIRCUIT_FAILURE_THRESHOLD, settings.CIRCUIT_RESET_TIMEOUT)
+        self.hedge = bool(config.get('hedge', False))
+        self.latencies: deque = deque(maxlen=settings.HEDGE_SAMPLE_SIZE)
+        self.stats = {
+            'requests': 0, 'failures': 0, 'rejected': 0, 'served_stale': 0,
+            'deadline_exceeded': 0, 'hedged': 0, 'hedge_wins': 0
+        }
+
+    def latency_percentile(self, percentile: float) -> Optional[float]:
+        """최근 성공 응답 지연의 백분위수 (표본이 부족하면 None)"""
+        if len(self.latencies) < settings.HEDGE_MIN_SAMPLES:
+            return None
+        samples = sorted(self.latencies)
+        index = min(len(samples) - 1, int(len(samples) * percentile / 100))
+        return samples[index]
+
+
+class UpstreamGovernor:
+    def __init__(self):
+        self.policies: Dict[str, UpstreamPolicy] = {
+            name: UpstreamPolicy(name, config) for name, config in POLICIES.items()
+        }
+        self.max_wait = settings.UPSTREAM_MAX_WAIT
+        # 마지막 정상 응답 (서킷 open/실패 시 degraded 응답으로 사용)
+        self.stale_responses = TTLCache(
+            maxsize=settings.UPSTREAM_STALE_CACHE_SIZE,
+            ttl=settings.UPSTREAM_STALE_CACHE_TTL
+        )
+
+    async def execute(self, upstream: str, send: Callable[[], Awaitable[httpx.Response]],
+                      cache_key: Optional[Hashable] = None, idempotent: bool = False) -> httpx.Response:
+        """
+        정책을 적용해 요청을 보냅니다.
+        cache_key가 주어지면 (멱등 GET) 정상 응답을 보관했다가 장애 시 대신 반환합니다.
+        idempotent 요청은 p95 지연을 넘기면 헤지 요청을 보내 먼저 온 응답을 사용합니다.
+        요청 데드라인이 설정되어 있으면 쿼터/동시성 대기 시간도 남은 시간 이내로 제한합니다.
+        """
+        policy = self.policies.get(upstream)
+        if policy is None:
+            return await send()
+
+        max_wait = self.max_wait
+        left = remaining()
+        if left is not None:
+            if left <= 0:
+                policy.stats['deadline_exceeded'] += 1
+                return self._degraded(policy, cache_key, UpstreamUnavailableError(upstream, 'deadline exceeded'))
+            max_wait = min(max_wait, left)
+
+        if not policy.breaker.allow():
+            return self._degraded(policy, cache_key, UpstreamUnavailableError(upstream, 'circuit open'))
+
+        token_acquired = False
+        try:
+            await policy.bucket.acquire(max_wait)
+            token_acquired = True
+            await policy.limiter.acquire(max_wait)
+        except UpstreamUnavailableError as e:
+            # 쿼터/동시성 거절은 업스트림 장애가 아니므로 서킷에 반영하지 않음
+            # 동시성 거절이면 쓰지 않은 토큰을 돌려줌
+            if token_acquired:
+                policy.bucket.refund()
+            policy.breaker.cancel_trial()
+            return self._degraded(policy, cache_key, UpstreamUnavailableError(upstream, e.reason))
+        except asyncio.CancelledError:
+            if token_acquired:
+                policy.bucket.refund()
+            policy.breaker.cancel_trial()
+            raise
+
+        policy.stats['requests'] += 1
+        start = time.monotonic()
+        # 동시성 한도에 반영할 결과 (None: 표본 없음 - 취소/데드라인 초과)
+        success: Optional[bool] = None
+
+        try:
+            if idempotent and policy.hedge:
+                response = await self._send_hedged(policy, send)
+            else:
+                response = await send()
+            success = self._is_success(response)
+        except (httpx.TransportError, asyncio.TimeoutError) as e:
+            left = remaining()
+            if isinstance(e, (httpx.TimeoutException, asyncio.TimeoutError)) and left is not None and left < 0.05:
+                # 업스트림 장애가 아니라 요청 예산이 바닥나 끊은 경우 - 서킷에 반영하지 않음
+                policy.breaker.cancel_trial()
+                policy.stats['deadline_exceeded'] += 1
+                return self._degraded(policy, cache_key, UpstreamUnavailableError(upstream, 'deadline exceeded'))
+            success = False
+            policy.breaker.record_failure()
+            policy.stats['failures'] += 1
+            return self._degraded(policy, cache_key, e)
+        except BaseException:
+            policy.breaker.cancel_trial()
+            raise
+        finally:
+            policy.limiter.release(time.monotonic() - start, success)
+
+        if not success:
+            policy.breaker.record_failure()
+            policy.stats['failures'] += 1
+            stale = self.stale_responses.get(cache_key) if cache_key is not None else None
+            if stale is not None:
+                policy.stats['served_stale'] += 1
+                return stale
+            return response
+
+        policy.breaker.record_success()
+        policy.latencies.append(time.monotonic() - start)
+        if cache_key is not None and response.status_code == 200:
+            self.stale_responses.set(cache_key, response)
+        return response
+
+    async def _send_hedged(self, policy: UpstreamPolicy,
+                           send: Callable[[], Awaitable[httpx.Response]]) -> httpx.Response:
+        """
+        첫 요청이 p95 지연 안에 끝나지 않으면 같은 요청을 한 번 더 보내고
+        먼저 도착한 정상 응답을 반환합니다. 남은 요청은 취소합니다.
+        """
+        delay = policy.latency_percentile(settings.HEDGE_PERCENTILE)
+        left = remaining()
+        if delay is None or (left is not None and left <= delay):
+            return await send()
+
+        primary = asyncio.ensure_future(send())
+        hedge = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=delay)
+            if done:
+                return await primary
+
+            # 헤지도 별도의 요청이므로 동시성 슬롯과 쿼터 토큰이 모두 있을 때만 보냄
+            if not policy.limiter.try_acquire():
+                return await primary
+            if not policy.bucket.try_acquire():
+                policy.limiter.release(0.0, None)
+                return await primary
+
+            policy.stats['hedged'] += 1
+            hedge = asyncio.ensure_future(send())
+            hedge.add_done_callback(lambda _: policy.limiter.release(0.0, None))
+            pending = {primary, hedge}
+            fallback = None
+            error: Optional[BaseException] = None
+
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is not None:
+                        error = error or task.exception()
+                        continue
+                    response = task.result()
+                    if self._is_success(response):
+                        if task is hedge:
+                            policy.stats['hedge_wins'] += 1
+                        return response
+                    fallback = fallback or response
+
+            if fallback is not None:
+                return fallback
+            raise error
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    @staticmethod
+    def _is_success(response: httpx.Response) -> bool:
+        return response.status_code < 500 and response.status_code != 429
+
+    def _degraded(self, policy: UpstreamPolicy, cache_key: Optional[Hashable],
+                  error: Exception) -> httpx.Response:
+        stale = self.stale_responses.get(cache_key) if cache_key is not None else None
+        if stale is not None:
+            policy.stats['served_stale'] += 1
+            logger.info(f"Serving stale {policy.name} response: {error}")
+            return stale
+
+        policy.stats['rejected'] += 1
+        raise error
+
+    def metrics(self) -> Dict[str, Dict[str, Any]]:
+        return {
+            name: {
+                'circuit': policy.breaker.state,
+                'consecutive_failures': policy.breaker.failures,
+                'concurrency_limit': round(policy.limiter.limit, 2),
+                'in_flight': policy.limiter.in_flight,
+                'queued': len(policy.limiter._waiters),
+                'tokens': round(policy.bucket.tokens, 2),
+                'latency_p95': policy.latency_percentile(95),
+                **policy.stats
+            }
+            for name, policy in self.policies.items()
+        }
+
+
+# Governor instance
+upstream_governor = UpstreamGovernor()
@@ -2,10 +2,13 @@
 Google Vision API 서비스 - 한글 텍스트 인식에 특화
 """
 import base64
-import requests
 import logging
 from typing import List, Dict, Optional
 
+from services.http_client_service import http_clients
+from services.image_derivative_service import image_derivatives
+from services.mock_providers import create_google_vision_mock, mock_enabled
+
 logger = logging.getLogger(__name__)
 
 class GoogleVisionService:
@@ -22,7 +25,8 @@ class GoogleVisionService:
             return self._mock_korean_text()
         
         try:
-            # 이미지를 base64로 인코딩
+            # 방향 보정 + OCR 최적 해상도 파생본을 base64로 인코딩
+            image_bytes = await image_derivatives.derive(image_bytes, 'google_vision')
             image_base64 = base64.b64encode(image_bytes).decode('utf-8')
             
             # API 요청 데이터
@@ -45,11 +49,12 @@ class GoogleVisionService:
                 ]
             }
             
-            # API 호출
-            response = requests.post(
-                f"{self.base_url}?key={self.api_key}",
-                json=request_data,
-                headers={'Content-Type': 'application/json'}
+            # API 호출 (공유 커넥션 풀, 업스트림 타임아웃 적용)
+            response = await http_clients.request(
+                'google_vision', 'POST',
+                self.base_url,
+                params={'key': self.api_key},
+                json=request_data
             )
             
             if response.status_code == 200:
@@ -119,5 +124,8 @@ class GoogleVisionService:
         
         return list(set(business_names))  # 중복 제거
 
-# Mock 서비스 인스턴스
-google_vision_service = GoogleVisionService()
+# 서비스 인스턴스 (MOCK_PROVIDERS 에 vision 이 포함되면 지연/오류를 주입하는 부하 테스트용 Mock 사용)
+if mock_enabled('vision'):
+    google_vision_service = create_google_vision_mock()
+else:
+    google_vision_service = GoogleVisionService()
@@ -0,0 +1,124 @@
+"""
+마이크로 배처 - 짧은 시간 창 동안 들어온 조회를 모아 중복을 제거하고 한 번에 처리
+"""
+import asyncio
+import contextvars
+from typing import Any, Awaitable, Callable, Dict, Hashable, Set, Tuple
+
+from utils.deadline import remaining
+
+
+class MicroBatcher:
+    """
+    window(초) 동안 submit된 키를 모아 고유 키마다 handler(key, payload)를 한 번씩
+    max_concurrency 한도 내에서 병렬 실행합니다.
+
+    같은 배치 안의 중복 키와, 이전 배치에서 아직 처리 중인 키는 기존 결과를 공유합니다.
+    (완료된 결과의 재사용은 호출 측 캐시가 담당)
+
+    배치는 여러 요청이 공유하므로 특정 요청의 컨텍스트(데드라인 등) 없이 실행하고,
+    각 대기자는 자신의 요청 데드라인까지만 기다립니다. (초과 시 asyncio.TimeoutError)
+    """
+
+    def __init__(self, handler: Callable[[Hashable, Any], Awaitable[Any]], window: float = 0.005,
+                 max_batch: int = 100, max_concurrency: int = 8):
+        self.handler = handler
+        self.window = window
+        self.max_batch = max_batch
+        self.max_concurrency = max_concurrency
+
+        self._pending: Dict[Hashable, Tuple[asyncio.Future, Any]] = {}
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._timer = None
+        self._semaphore = None
+        self._tasks: Set[asyncio.Task] = set()
+
+        self.batches = 0
+        self.submitted = 0
+        self.dispatched = 0
+        self.deduplicated = 0
+        self.max_batch_size = 0
+
+    async def submit(self, key: Hashable, payload: Any = None) -> Any:
+        """
+        키를 현재 배치에 추가하고 결과를 기다립니다.
+        """
+        self.submitted += 1
+
+        existing = self._pending.get(key)
+        future = existing[0] if existing else self._inflight.get(key)
+        if future is not None:
+            self.deduplicated += 1
+            return await self._wait(future)
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending[key] = (future, payload)
+
+        if len(self._pending) >= self.max_batch:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.window, self._flush)
+
+        return await self._wait(future)
+
+    @staticmethod
+    async def _wait(future: asyncio.Future) -> Any:
+        return await asyncio.wait_for(asyncio.shield(future), remaining())
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+
+        batch, self._pending = self._pending, {}
+        if not batch:
+            return
+
+        self.batches += 1
+        self.dispatched += len(batch)
+        self.max_batch_size = max(self.max_batch_size, len(batch))
+
+        for key, (future, _) in batch.items():
+            self._inflight[key] = future
+
+        # 배치를 처음 채운 요청의 contextvar 가 다른 요청의 키에 적용되지 않도록 빈 컨텍스트에서 실행
+        task = contextvars.Context().run(asyncio.ensure_future, self._dispatch(batch))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _dispatch(self, batch: Dict[Hashable, Tuple[asyncio.Future, Any]]) -> None:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run(key: Hashable, future: asyncio.Future, payload: Any) -> None:
+            try:
+                async with self._semaphore:
+                    result = await self.handler(key, payload)
+                if not future.done():
+                    future.set_result(result)
+            except asyncio.CancelledError:
+                future.cancel()
+                raise
+            except Exception as e:
+                if not future.done():
+                    future.set_exception(e)
+                    # 대기자가 없으면 "exception was never retrieved" 경고가 나지 않도록 소비
+                    future.exception()
+            finally:
+                self._inflight.pop(key, None)
+
+        await asyncio.gather(*(run(key, future, payload) for key, (future, payload) in batch.items()))
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            'batches': self.batches,
+            'submitted': self.submitted,
+            'dispatched': self.dispatched,
+            'deduplicated': self.deduplicated,
+            'avg_batch_size': round(self.dispatched / self.batches, 2) if self.batches else 0.0,
+            'max_batch_size': self.max_batch_size,
+            'dedup_ratio': round(self.deduplicated / self.submitted, 3) if self.submitted else 0.0,
+            'pending': len(self._pending),
+            'in_flight': len(self._inflight)
+        }
@@ -0,0 +1,91 @@
+"""
+인메모리 TTL + LRU 캐시
+"""
+import time
+from collections import OrderedDict
+from typing import Any, Hashable, Optional
+
+
+class TTLCache:
+    """
+    만료 시간(ttl, 초)과 최대 크기(maxsize)를 가진 LRU 캐시
+    max_bytes 를 주면 값(bytes)의 총 크기도 제한합니다. (이미지 등 큰 값 캐시용)
+    """
+
+    def __init__(self, maxsize: int = 1024, ttl: float = 3600, max_bytes: Optional[int] = None):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.max_bytes = max_bytes
+        # key -> (만료 시각, 값, 바이트 크기)
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return self.get(key, _count=False) is not None
+
+    def get(self, key: Hashable, default: Any = None, _count: bool = True) -> Any:
+        entry = self._data.get(key)
+        if entry is None:
+            if _count:
+                self.misses += 1
+            return default
+
+        expires_at, value, _ = entry
+        if expires_at < time.monotonic():
+            self._remove(key)
+            if _count:
+                self.misses += 1
+            return default
+
+        self._data.move_to_end(key)
+        if _count:
+            self.hits += 1
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl: Optional[float] = None) -> None:
+        expires_at = time.monotonic() + (self.ttl if ttl is None else ttl)
+        size = len(value) if self.max_bytes is not None and isinstance(value, (bytes, bytearray)) else 0
+        if self.max_bytes is not None and size > self.max_bytes:
+            self._remove(key)
+            return
+
+        self._remove(key)
+        self._data[key] = (expires_at, value, size)
+        self._bytes += size
+
+        while len(self._data) > self.maxsize or (self.max_bytes is not None and self._bytes > self.max_bytes):
+            _, (_, _, evicted) = self._data.popitem(last=False)
+            self._bytes -= evicted
+
+    def pop(self, key: Hashable, default: Any = None) -> Any:
+        entry = self._remove(key)
+        return default if entry is None else entry[1]
+
+    def clear(self) -> None:
+        self._data.clear()
+        self._bytes = 0
+
+    def _remove(self, key: Hashable) -> Optional[tuple]:
+        entry = self._data.pop(key, None)
+        if entry is not None:
+            self._bytes -= entry[2]
+        return entry
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        stats = {
+            'size': len(self._data),
+            'maxsize': self.maxsize,
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_ratio': round(self.hits / total, 3) if total else 0.0
+        }
+        if self.max_bytes is not None:
+            stats['bytes'] = self._bytes
+            stats['max_bytes'] = self.max_bytes
+        return stats
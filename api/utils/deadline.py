@@ -0,0 +1,63 @@
+"""
+요청 단위 데드라인(시간 예산) 유틸리티
+
+엔드포인트에서 설정한 마감 시각을 contextvar로 보관하므로 같은 요청에서
+호출되는 서비스/태스크(asyncio.gather, create_task 포함)가 별도 인자 없이
+남은 시간을 조회할 수 있습니다.
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator, Optional
+
+from fastapi import Request
+
+from config import settings
+
+# time.monotonic() 기준 마감 시각 (None이면 제한 없음)
+_deadline: ContextVar[Optional[float]] = ContextVar('request_deadline', default=None)
+
+
+def remaining() -> Optional[float]:
+    """
+    남은 시간(초)을 반환합니다. 데드라인이 없으면 None.
+    """
+    deadline = _deadline.get()
+    if deadline is None:
+        return None
+    return max(0.0, deadline - time.monotonic())
+
+
+@contextmanager
+def deadline_scope(seconds: float) -> Iterator[float]:
+    """
+    이 블록의 데드라인을 seconds 후로 설정합니다.
+    바깥 데드라인이 더 이르면 바깥 데드라인을 그대로 사용합니다.
+    """
+    deadline = time.monotonic() + seconds
+    outer = _deadline.get()
+    if outer is not None:
+        deadline = min(deadline, outer)
+
+    token = _deadline.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _deadline.reset(token)
+
+
+async def request_deadline(request: Request):
+    """
+    FastAPI 의존성: 요청 처리 시간 예산을 설정합니다.
+    클라이언트가 X-Request-Timeout(초) 헤더로 더 짧은 예산을 요청할 수 있습니다.
+    """
+    seconds = settings.REQUEST_DEADLINE
+    header = request.headers.get('x-request-timeout')
+    if header:
+        try:
+            seconds = min(float(header), settings.REQUEST_DEADLINE_MAX)
+        except ValueError:
+            pass
+
+    with deadline_scope(max(seconds, 0.0)):
+        yield
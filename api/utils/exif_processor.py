@@ -4,6 +4,7 @@ import io
 import logging
 from typing import Optional, Dict, Tuple
 from datetime import datetime
+from utils.exif_reader import read_exif
 
 logger = logging.getLogger(__name__)
 
@@ -16,8 +17,13 @@ class EXIFProcessor:
     def extract_exif_data(image_data: bytes) -> Dict:
         """
         이미지에서 EXIF 데이터를 추출합니다.
+        JPEG/PNG/WebP/HEIF 는 헤더만 스캔하고, 그 외 형식만 PIL 로 엽니다.
         """
         try:
+            exif_data = read_exif(image_data)
+            if exif_data is not None:
+                return exif_data
+            
             image = Image.open(io.BytesIO(image_data))
             exif_data = {}
             
@@ -0,0 +1,326 @@
+"""
+헤더 전용 EXIF 리더 - 이미지 디코딩 없이 컨테이너에서 TIFF(EXIF) 블록만 찾아 필요한 태그를 파싱
+
+  - JPEG: 마커를 따라 APP1 "Exif" 세그먼트 (SOS 이전에서 중단)
+  - PNG: eXIf 청크
+  - WebP: EXIF 청크
+  - HEIF/HEIC: meta 박스의 iinf/iloc 에서 Exif 아이템 위치
+
+결과는 PIL _getexif() 와 같은 형태(태그 이름 -> 값, GPSInfo 는 숫자 키 dict)의 축약본이며
+유리수는 float 로 변환해 JSON 직렬화가 가능합니다.
+"""
+import struct
+from typing import Any, Dict, Optional, Tuple
+
+# 사용하는 태그만 파싱 (IFD0 / Exif IFD)
+IFD0_TAGS = {
+    0x010F: 'Make',
+    0x0110: 'Model',
+    0x0112: 'Orientation',
+    0x0132: 'DateTime'
+}
+EXIF_TAGS = {
+    0x829A: 'ExposureTime',
+    0x829D: 'FNumber',
+    0x8827: 'ISOSpeedRatings',
+    0x9003: 'DateTimeOriginal',
+    0x920A: 'FocalLength',
+    0xA002: 'ExifImageWidth',
+    0xA003: 'ExifImageHeight'
+}
+# GPSLatitudeRef ~ GPSAltitude
+GPS_TAGS = {1, 2, 3, 4, 5, 6}
+
+EXIF_IFD_POINTER = 0x8769
+GPS_IFD_POINTER = 0x8825
+# IFD1 (썸네일) JPEGInterchangeFormat / JPEGInterchangeFormatLength
+THUMBNAIL_TAGS = {0x0201, 0x0202}
+
+# TIFF 타입 -> (struct 포맷, 크기)
+TYPE_FORMATS = {
+    1: ('B', 1),   # BYTE
+    2: ('s', 1),   # ASCII
+    3: ('H', 2),   # SHORT
+    4: ('L', 4),   # LONG
+    5: ('LL', 8),  # RATIONAL
+    7: ('B', 1),   # UNDEFINED
+    9: ('l', 4),   # SLONG
+    10: ('ll', 8)  # SRATIONAL
+}
+
+EXIF_HEADER = b'Exif\x00\x00'
+
+def read_exif(data: bytes) -> Optional[Dict[str, Any]]:
+    """
+    이미지 바이트(앞부분만이어도 됨)에서 EXIF 를 읽습니다.
+    지원하지 않는 형식이면 None, EXIF 가 없으면 빈 dict 를 반환합니다.
+    """
+    try:
+        tiff = find_tiff_block(data)
+        if tiff is None:
+            return None
+        if not tiff:
+            return {}
+        return parse_tiff(tiff)
+    except (struct.error, IndexError, ValueError):
+        # 잘린/손상된 컨테이너(HEIF iloc 등) 또는 TIFF 블록
+        return {}
+
+def read_thumbnail(data: bytes) -> Optional[bytes]:
+    """
+    EXIF IFD1 에 내장된 JPEG 썸네일(휴대폰 사진은 보통 160x120)을 반환합니다. 없으면 None.
+    """
+    try:
+        tiff = find_tiff_block(data)
+        if not tiff:
+            return None
+
+        byte_order = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+        if byte_order is None:
+            return None
+
+        ifd0 = struct.unpack(byte_order + 'I', tiff[4:8])[0]
+        count = struct.unpack(byte_order + 'H', tiff[ifd0:ifd0 + 2])[0]
+        ifd1 = struct.unpack(byte_order + 'I', tiff[ifd0 + 2 + count * 12:ifd0 + 6 + count * 12])[0]
+        if not ifd1:
+            return None
+
+        entries = _read_ifd(tiff, byte_order, ifd1, THUMBNAIL_TAGS)
+        offset, length = entries.get(0x0201), entries.get(0x0202)
+        if not offset or not length:
+            return None
+
+        thumbnail = tiff[offset:offset + length]
+        if len(thumbnail) < length or not thumbnail.startswith(b'\xff\xd8'):
+            return None
+        return thumbnail
+    except (struct.error, IndexError, ValueError):
+        return None
+
+def find_tiff_block(data: bytes) -> Optional[bytes]:
+    """
+    컨테이너 형식에 맞춰 TIFF 블록을 찾습니다. (형식 미지원 None, EXIF 없음 b'')
+    """
+    if data.startswith(b'\xff\xd8'):
+        return _jpeg_tiff(data)
+    if data.startswith(b'\x89PNG\r\n\x1a\n'):
+        return _png_tiff(data)
+    if data[:4] == b'RIFF' and data[8:12] == b'WEBP':
+        return _webp_tiff(data)
+    if data[4:8] == b'ftyp':
+        return _heif_tiff(data)
+    return None
+
+def _jpeg_tiff(data: bytes) -> bytes:
+    pos = 2
+    size = len(data)
+    while pos + 4 <= size:
+        if data[pos] != 0xFF:
+            return b''
+        marker = data[pos + 1]
+        if marker == 0xFF:
+            pos += 1
+            continue
+        # 길이 없는 마커
+        if marker in (0x01, 0xD8) or 0xD0 <= marker <= 0xD7:
+            pos += 2
+            continue
+        # SOS 이후는 압축된 이미지 데이터
+        if marker in (0xDA, 0xD9):
+            return b''
+
+        length = struct.unpack('>H', data[pos + 2:pos + 4])[0]
+        segment = data[pos + 4:pos + 2 + length]
+        if marker == 0xE1 and segment.startswith(EXIF_HEADER):
+            return segment[len(EXIF_HEADER):]
+        pos += 2 + length
+    return b''
+
+def _png_tiff(data: bytes) -> bytes:
+    pos = 8
+    while pos + 8 <= len(data):
+        length, chunk_type = struct.unpack('>I4s', data[pos:pos + 8])
+        if chunk_type == b'eXIf':
+            return data[pos + 8:pos + 8 + length]
+        if chunk_type == b'IEND':
+            break
+        pos += 12 + length
+    return b''
+
+def _webp_tiff(data: bytes) -> bytes:
+    pos = 12
+    while pos + 8 <= len(data):
+        fourcc, length = struct.unpack('<4sI', data[pos:pos + 8])
+        if fourcc == b'EXIF':
+            chunk = data[pos + 8:pos + 8 + length]
+            return chunk[len(EXIF_HEADER):] if chunk.startswith(EXIF_HEADER) else chunk
+        pos += 8 + length + (length & 1)
+    return b''
+
+def _boxes(data: bytes, start: int, end: int):
+    """ISO BMFF 박스 순회: (타입, 본문 시작, 본문 끝)"""
+    pos = start
+    while pos + 8 <= end:
+        size, box_type = struct.unpack('>I4s', data[pos:pos + 8])
+        header = 8
+        if size == 1:
+            size = struct.unpack('>Q', data[pos + 8:pos + 16])[0]
+            header = 16
+        elif size == 0:
+            size = end - pos
+        if size < header:
+            return
+        yield box_type, pos + header, min(pos + size, end)
+        pos += size
+
+def _heif_tiff(data: bytes) -> bytes:
+    meta = next(((s, e) for t, s, e in _boxes(data, 0, len(data)) if t == b'meta'), None)
+    if meta is None:
+        return b''
+
+    # meta 는 FullBox (version/flags 4바이트)
+    children = {t: (s, e) for t, s, e in _boxes(data, meta[0] + 4, meta[1])}
+    if b'iinf' not in children or b'iloc' not in children:
+        return b''
+
+    exif_id = _heif_exif_item(data, *children[b'iinf'])
+    if exif_id is None:
+        return b''
+
+    location = _heif_item_location(data, *children[b'iloc'], exif_id)
+    if location is None:
+        return b''
+
+    offset, length = location
+    item = data[offset:offset + length]
+    if len(item) < 4:
+        return b''
+    # Exif 아이템은 TIFF 헤더까지의 오프셋(4바이트)으로 시작
+    skip = struct.unpack('>I', item[:4])[0]
+    return item[4 + skip:]
+
+def _heif_exif_item(data: bytes, start: int, end: int) -> Optional[int]:
+    version = data[start]
+    pos = start + 4
+    pos += 2 if version == 0 else 4
+    for box_type, s, e in _boxes(data, pos, end):
+        if box_type != b'infe' or data[s] < 2:
+            continue
+        infe_version = data[s]
+        p = s + 4
+        if infe_version == 2:
+            item_id = struct.unpack('>H', data[p:p + 2])[0]
+            p += 2
+        else:
+            item_id = struct.unpack('>I', data[p:p + 4])[0]
+            p += 4
+        item_type = data[p + 2:p + 6]
+        if item_type == b'Exif':
+            return item_id
+    return None
+
+def _read_uint(data: bytes, pos: int, size: int) -> Tuple[int, int]:
+    if size == 0:
+        return 0, pos
+    value = int.from_bytes(data[pos:pos + size], 'big')
+    return value, pos + size
+
+def _heif_item_location(data: bytes, start: int, end: int, target_id: int) -> Optional[Tuple[int, int]]:
+    version = data[start]
+    pos = start + 4
+    offset_size, length_size = data[pos] >> 4, data[pos] & 0x0F
+    base_offset_size = data[pos + 1] >> 4
+    index_size = data[pos + 1] & 0x0F if version in (1, 2) else 0
+    pos += 2
+
+    id_size = 2 if version < 2 else 4
+    item_count, pos = _read_uint(data, pos, id_size)
+
+    for _ in range(item_count):
+        item_id, pos = _read_uint(data, pos, id_size)
+        construction_method = 0
+        if version in (1, 2):
+            construction_method = data[pos + 1] & 0x0F
+            pos += 2
+        pos += 2  # data_reference_index
+        base_offset, pos = _read_uint(data, pos, base_offset_size)
+        extent_count, pos = _read_uint(data, pos, 2)
+
+        extents = []
+        for _ in range(extent_count):
+            _, pos = _read_uint(data, pos, index_size)
+            extent_offset, pos = _read_uint(data, pos, offset_size)
+            extent_length, pos = _read_uint(data, pos, length_size)
+            extents.append((extent_offset, extent_length))
+
+        if item_id == target_id:
+            # 파일 오프셋 기반(construction_method 0)의 단일 extent 만 지원
+            if construction_method != 0 or not extents:
+                return None
+            return base_offset + extents[0][0], extents[0][1]
+    return None
+
+def parse_tiff(tiff: bytes) -> Dict[str, Any]:
+    """
+    TIFF 블록에서 IFD0 / Exif IFD / GPS IFD 의 필요한 태그만 파싱합니다.
+    """
+    byte_order = {b'II': '<', b'MM': '>'}.get(tiff[:2])
+    if byte_order is None:
+        raise ValueError("invalid TIFF header")
+
+    ifd0 = struct.unpack(byte_order + 'I', tiff[4:8])[0]
+    entries = _read_ifd(tiff, byte_order, ifd0, set(IFD0_TAGS) | {EXIF_IFD_POINTER, GPS_IFD_POINTER})
+
+    exif_data = {IFD0_TAGS[tag]: value for tag, value in entries.items() if tag in IFD0_TAGS}
+
+    if EXIF_IFD_POINTER in entries:
+        exif_entries = _read_ifd(tiff, byte_order, entries[EXIF_IFD_POINTER], set(EXIF_TAGS))
+        exif_data.update({EXIF_TAGS[tag]: value for tag, value in exif_entries.items()})
+
+    if GPS_IFD_POINTER in entries:
+        gps_info = _read_ifd(tiff, byte_order, entries[GPS_IFD_POINTER], GPS_TAGS)
+        if gps_info:
+            exif_data['GPSInfo'] = gps_info
+
+    return exif_data
+
+def _read_ifd(tiff: bytes, byte_order: str, offset: int, wanted: set) -> Dict[int, Any]:
+    count = struct.unpack(byte_order + 'H', tiff[offset:offset + 2])[0]
+    values = {}
+
+    for i in range(count):
+        entry = offset + 2 + i * 12
+        tag, value_type, value_count = struct.unpack(byte_order + 'HHI', tiff[entry:entry + 8])
+        if tag not in wanted or value_type not in TYPE_FORMATS:
+            continue
+
+        fmt, size = TYPE_FORMATS[value_type]
+        total = size * value_count
+        if total <= 4:
+            raw = tiff[entry + 8:entry + 8 + total]
+        else:
+            value_offset = struct.unpack(byte_order + 'I', tiff[entry + 8:entry + 12])[0]
+            raw = tiff[value_offset:value_offset + total]
+        if len(raw) < total:
+            continue
+
+        values[tag] = _decode(raw, byte_order, value_type, fmt, value_count)
+
+    return values
+
+def _decode(raw: bytes, byte_order: str, value_type: int, fmt: str, count: int) -> Any:
+    if value_type == 2:
+        return raw.split(b'\x00', 1)[0].decode('ascii', errors='replace').strip()
+    if value_type == 7:
+        return raw
+
+    if value_type in (5, 10):
+        numbers = struct.unpack(byte_order + fmt * count, raw)
+        values = [
+            numbers[i] / numbers[i + 1] if numbers[i + 1] else 0.0
+            for i in range(0, len(numbers), 2)
+        ]
+    else:
+        values = list(struct.unpack(byte_order + fmt * count, raw))
+
+    return values[0] if count == 1 else tuple(values)
@@ -0,0 +1,140 @@
+"""
+좌표 계산 유틸리티 - 거리 계산 및 격자(grid) 공간 인덱스
+"""
+import math
+from collections import defaultdict
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+EARTH_RADIUS_M = 6371000  # Earth's radius in meters
+METERS_PER_DEGREE_LAT = 111320.0
+
+GEOHASH_BASE32 = '0123456789bcdefghjkmnpqrstuvwxyz'
+
+
+def haversine_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
+    """
+    Calculate distance between two points using Haversine formula (in meters)
+    """
+    lat1_rad = math.radians(lat1)
+    lat2_rad = math.radians(lat2)
+    delta_lat = math.radians(lat2 - lat1)
+    delta_lng = math.radians(lng2 - lng1)
+
+    a = (math.sin(delta_lat / 2) * math.sin(delta_lat / 2) +
+         math.cos(lat1_rad) * math.cos(lat2_rad) *
+         math.sin(delta_lng / 2) * math.sin(delta_lng / 2))
+
+    c = 2 * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+    return EARTH_RADIUS_M * c
+
+
+def haversine_distances(lat: float, lng: float, points: Sequence[Tuple[float, float]]) -> List[float]:
+    """
+    기준점에서 여러 (lat, lng) 좌표까지의 거리(미터)를 한 번에 계산합니다.
+    기준점의 라디안/코사인 값은 한 번만 계산합니다.
+    """
+    lat_rad = math.radians(lat)
+    lng_rad = math.radians(lng)
+    cos_lat = math.cos(lat_rad)
+
+    distances = []
+    for point_lat, point_lng in points:
+        point_lat_rad = math.radians(point_lat)
+        sin_dlat = math.sin((point_lat_rad - lat_rad) / 2)
+        sin_dlng = math.sin((math.radians(point_lng) - lng_rad) / 2)
+
+        a = sin_dlat * sin_dlat + cos_lat * math.cos(point_lat_rad) * sin_dlng * sin_dlng
+        distances.append(2 * EARTH_RADIUS_M * math.atan2(math.sqrt(a), math.sqrt(1 - a)))
+
+    return distances
+
+
+def geohash_encode(lat: float, lng: float, precision: int = 7) -> str:
+    """
+    좌표를 geohash 문자열로 변환합니다.
+    (precision 6 ≈ 1.2km x 0.6km, 7 ≈ 153m x 153m, 8 ≈ 38m x 19m)
+    """
+    lat_range = [-90.0, 90.0]
+    lng_range = [-180.0, 180.0]
+    chars = []
+    bits = 0
+    bit_count = 0
+    even = True  # 경도 비트부터 번갈아 사용
+
+    while len(chars) < precision:
+        value, value_range = (lng, lng_range) if even else (lat, lat_range)
+        mid = (value_range[0] + value_range[1]) / 2
+        if value >= mid:
+            bits = (bits << 1) | 1
+            value_range[0] = mid
+        else:
+            bits <<= 1
+            value_range[1] = mid
+        even = not even
+
+        bit_count += 1
+        if bit_count == 5:
+            chars.append(GEOHASH_BASE32[bits])
+            bits = 0
+            bit_count = 0
+
+    return ''.join(chars)
+
+
+class GridIndex:
+    """
+    위경도 격자 기반 공간 인덱스
+
+    각 좌표를 cell_size(도) 크기의 셀에 넣어 두고, 반경 검색 시
+    반경을 덮는 셀들만 확인합니다. 항목은 정수 ID로 저장되며
+    실제 레코드는 호출 측에서 관리합니다.
+    """
+
+    def __init__(self, cell_size: float = 0.01):
+        self.cell_size = cell_size
+        self._cells: Dict[Tuple[int, int], List[int]] = defaultdict(list)
+        self._lats: List[float] = []
+        self._lngs: List[float] = []
+
+    def __len__(self) -> int:
+        return len(self._lats)
+
+    def _cell_of(self, lat: float, lng: float) -> Tuple[int, int]:
+        return (int(math.floor(lat / self.cell_size)), int(math.floor(lng / self.cell_size)))
+
+    def insert(self, lat: float, lng: float) -> int:
+        """좌표를 추가하고 부여된 ID를 반환합니다."""
+        item_id = len(self._lats)
+        self._lats.append(lat)
+        self._lngs.append(lng)
+        self._cells[self._cell_of(lat, lng)].append(item_id)
+        return item_id
+
+    def candidates(self, lat: float, lng: float, radius: float) -> Iterator[int]:
+        """반경(미터)을 덮는 셀에 속한 항목 ID를 순회합니다 (거리 필터 전)."""
+        lat_delta = radius / METERS_PER_DEGREE_LAT
+        lng_delta = radius / (METERS_PER_DEGREE_LAT * max(math.cos(math.radians(lat)), 0.01))
+
+        min_row, min_col = self._cell_of(lat - lat_delta, lng - lng_delta)
+        max_row, max_col = self._cell_of(lat + lat_delta, lng + lng_delta)
+
+        for row in range(min_row, max_row + 1):
+            for col in range(min_col, max_col + 1):
+                yield from self._cells.get((row, col), ())
+
+    def query_radius(self, lat: float, lng: float, radius: float,
+                     predicate: Optional[Callable[[int], bool]] = None) -> List[Tuple[int, float]]:
+        """
+        반경 내 항목을 (ID, 거리) 목록으로 거리순 정렬하여 반환합니다.
+        predicate가 주어지면 거리 계산 전에 ID로 먼저 걸러냅니다.
+        """
+        results = []
+        for item_id in self.candidates(lat, lng, radius):
+            if predicate is not None and not predicate(item_id):
+                continue
+            distance = haversine_distance(lat, lng, self._lats[item_id], self._lngs[item_id])
+            if distance <= radius:
+                results.append((item_id, distance))
+
+        results.sort(key=lambda x: x[1])
+        return results
@@ -0,0 +1,102 @@
+"""
+지각 해시(dHash)와 해밍 거리 검색용 BK-트리
+"""
+import io
+from typing import Any, List, Optional, Tuple
+from PIL import Image
+from utils.exif_reader import read_thumbnail
+
+# 64비트 dHash (8x8 비교)
+HASH_SIZE = 8
+
+def dhash(image: Image.Image, hash_size: int = HASH_SIZE) -> int:
+    """
+    그레이스케일 (hash_size+1) x hash_size 로 축소한 뒤 가로로 이웃한 픽셀의 밝기 차이를 비트로 만듭니다.
+    크기/압축률/약간의 밝기 차이에 강하고 구도 차이에는 민감합니다.
+    """
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = small.tobytes()
+
+    value = 0
+    for row in range(hash_size):
+        offset = row * (hash_size + 1)
+        for col in range(hash_size):
+            value = (value << 1) | (pixels[offset + col] > pixels[offset + col + 1])
+    return value
+
+def hamming(a: int, b: int) -> int:
+    return bin(a ^ b).count('1')
+
+def perceptual_hash(data: bytes, complete: bool = False) -> Optional[int]:
+    """
+    이미지 바이트의 dHash 를 계산합니다. 원본 픽셀을 디코딩하지 않도록 EXIF 내장 썸네일을 우선 사용하고,
+    썸네일이 없으면 data 가 파일 전체일 때(complete)만 원본에서 계산합니다.
+    """
+    source = read_thumbnail(data)
+    if source is None:
+        if not complete:
+            return None
+        source = data
+
+    try:
+        image = Image.open(io.BytesIO(source))
+        # JPEG 는 DCT 축소 디코딩으로 필요한 만큼만 디코딩
+        image.draft('L', (HASH_SIZE * 8, HASH_SIZE * 8))
+        return dhash(image)
+    except Exception:
+        return None
+
+class BKTree:
+    """
+    해밍 거리 기반 BK-트리: 삼각 부등식으로 거리 max_distance 이내 후보만 탐색
+    노드는 [해시, 값, {거리: 자식 노드}] 리스트
+    """
+
+    def __init__(self):
+        self.root: Optional[list] = None
+        self.size = 0
+
+    def __len__(self) -> int:
+        return self.size
+
+    def add(self, item_hash: int, value: Any) -> None:
+        node = [item_hash, value, {}]
+        if self.root is None:
+            self.root = node
+            self.size = 1
+            return
+
+        current = self.root
+        while True:
+            distance = hamming(item_hash, current[0])
+            if distance == 0:
+                # 같은 해시는 최신 값으로 교체
+                current[1] = value
+                return
+            child = current[2].get(distance)
+            if child is None:
+                current[2][distance] = node
+                self.size += 1
+                return
+            current = child
+
+    def search(self, item_hash: int, max_distance: int) -> List[Tuple[int, Any]]:
+        """
+        거리 max_distance 이내 항목을 (거리, 값) 오름차순으로 반환합니다.
+        """
+        if self.root is None:
+            return []
+
+        matches = []
+        stack = [self.root]
+        while stack:
+            node_hash, value, children = stack.pop()
+            distance = hamming(item_hash, node_hash)
+            if distance <= max_distance:
+                matches.append((distance, value))
+            for child_distance, child in children.items():
+                if distance - max_distance <= child_distance <= distance + max_distance:
+                    stack.append(child)
+
+        matches.sort(key=lambda match: match[0])
+        return matches
@@ -0,0 +1,76 @@
+"""
+이미지 검사기 - 컨테이너 헤더를 한 번만 파싱해 형식, 크기, 방향, EXIF, GPS 를 함께 반환
+(검증 / EXIF 추출 / 메타데이터 처리가 같은 바이트를 각각 다시 여는 중복 제거)
+"""
+import io
+import logging
+from typing import Any, Dict
+from PIL import Image
+from utils.exif_processor import EXIFProcessor
+from utils.image_hash import perceptual_hash
+
+logger = logging.getLogger(__name__)
+
+FORMAT_CONTENT_TYPES = {
+    'JPEG': 'image/jpeg',
+    'MPO': 'image/jpeg',
+    'PNG': 'image/png',
+    'WEBP': 'image/webp'
+}
+
+def inspect_image(image_data: bytes) -> Dict[str, Any]:
+    """
+    이미지 헤더를 한 번 열어 메타데이터를 추출합니다. 픽셀 데이터는 디코딩하지 않으므로
+    파일 앞부분(스트리밍 업로드의 헤더 버퍼)만 넘겨도 됩니다.
+
+    이미지로 인식할 수 없으면 ValueError 를 발생시킵니다.
+    """
+    try:
+        image = Image.open(io.BytesIO(image_data))
+    except Exception as e:
+        raise ValueError(f"cannot identify image: {e}")
+
+    result = {
+        'format': image.format,
+        'content_type': FORMAT_CONTENT_TYPES.get(image.format),
+        'width': image.size[0],
+        'height': image.size[1],
+        'orientation': 1,
+        'has_exif': False,
+        'has_gps': False,
+        'gps_coordinates': None,
+        'camera_info': {},
+        'exif_data': {}
+    }
+
+    try:
+        # 컨테이너 헤더에서 EXIF 블록만 스캔 (PIL 의 getexif 는 PNG 등에서 픽셀을 디코딩할 수 있음)
+        exif_data = EXIFProcessor.extract_exif_data(image_data)
+        if not exif_data:
+            return result
+
+        result['has_exif'] = True
+        result['exif_data'] = exif_data
+        result['orientation'] = exif_data.get('Orientation', 1)
+        result['camera_info'] = EXIFProcessor.extract_camera_info(exif_data)
+
+        gps_coords = EXIFProcessor.extract_gps_from_exif(exif_data)
+        if gps_coords:
+            result['has_gps'] = True
+            result['gps_coordinates'] = {
+                'latitude': gps_coords[0],
+                'longitude': gps_coords[1]
+            }
+
+    except Exception as e:
+        logger.error(f"EXIF 파싱 실패: {e}")
+
+    return result
+
+def inspect_head(head: bytes, complete: bool) -> Dict[str, Any]:
+    """
+    업로드 헤더 버퍼 검사 + 지각 해시 (프로세스 풀 워커에서 실행되는 단위 작업)
+    """
+    inspection = inspect_image(head)
+    inspection['phash'] = perceptual_hash(head, complete)
+    return inspection
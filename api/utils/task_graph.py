@@ -0,0 +1,87 @@
+"""
+작은 비동기 작업 그래프(DAG)
+의존성이 없는 단계는 동시에 실행하고, 의존 단계는 입력이 준비되는 즉시 시작합니다.
+
+    graph = TaskGraph()
+    graph.add('texts', lambda: ocr(image))
+    graph.add('places', lambda texts: search(texts), deps=('texts',))
+    results = await graph.run()
+    graph.timings  # {'texts': {'status': 'ok', 'start_ms': 0.1, 'duration_ms': 420.3}, ...}
+"""
+import asyncio
+import logging
+import time
+from typing import Any, Awaitable, Callable, Dict, Iterable, Tuple
+
+logger = logging.getLogger(__name__)
+
+class StageSkipped(Exception):
+    """의존 단계가 실패해 실행하지 않은 단계"""
+
+class TaskGraph:
+    """
+    단계: 이름 -> (코루틴 함수, 의존 단계 이름들)
+    코루틴 함수는 의존 단계의 결과를 deps 순서대로 인자로 받습니다.
+    실패한 단계의 결과는 None 이며, 그 단계에 의존하는 단계는 건너뜁니다.
+    """
+
+    def __init__(self):
+        self._stages: Dict[str, Tuple[Callable[..., Awaitable[Any]], Tuple[str, ...]]] = {}
+        self.timings: Dict[str, Dict[str, Any]] = {}
+
+    def add(self, name: str, func: Callable[..., Awaitable[Any]], deps: Iterable[str] = ()) -> None:
+        deps = tuple(deps)
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+        # 의존 단계는 먼저 등록해야 하므로 순환이 생길 수 없음
+        for dep in deps:
+            if dep not in self._stages:
+                raise ValueError(f"Unknown dependency '{dep}' for stage '{name}'")
+        self._stages[name] = (func, deps)
+
+    async def run(self) -> Dict[str, Any]:
+        """
+        모든 단계를 실행하고 이름 -> 결과를 반환합니다.
+        """
+        started = time.monotonic()
+        tasks: Dict[str, asyncio.Task] = {}
+
+        async def run_stage(name: str, func: Callable[..., Awaitable[Any]], deps: Tuple[str, ...]) -> Any:
+            inputs = []
+            for dep in deps:
+                try:
+                    inputs.append(await tasks[dep])
+                except Exception:
+                    self.timings[name] = {'status': 'skipped', 'start_ms': None, 'duration_ms': 0.0}
+                    raise StageSkipped(name)
+
+            stage_started = time.monotonic()
+            status = 'failed'
+            try:
+                result = await func(*inputs)
+                status = 'ok'
+                return result
+            except Exception as e:
+                logger.warning(f"분석 단계 '{name}' 실패: {e}")
+                raise
+            finally:
+                self.timings[name] = {
+                    'status': status,
+                    'start_ms': round((stage_started - started) * 1000, 1),
+                    'duration_ms': round((time.monotonic() - stage_started) * 1000, 1)
+                }
+
+        for name, (func, deps) in self._stages.items():
+            tasks[name] = asyncio.create_task(run_stage(name, func, deps))
+
+        try:
+            await asyncio.gather(*tasks.values(), return_exceptions=True)
+        finally:
+            # 호출자가 취소되면 남은 단계도 취소
+            for task in tasks.values():
+                task.cancel()
+
+        return {
+            name: task.result() if not task.cancelled() and task.exception() is None else None
+            for name, task in tasks.items()
+        }
@@ -1,6 +1,7 @@
 from fastapi import HTTPException, UploadFile
 from PIL import Image
 import io
+from typing import Optional
 from config import settings
 
 def validate_image_file(file: UploadFile) -> None:
@@ -43,6 +44,30 @@ def validate_image_content(image_data: bytes) -> None:
             detail=f"Invalid image file: {str(e)}"
         )
 
+def sniff_image_type(head: bytes) -> Optional[str]:
+    """
+    파일 앞부분의 매직 바이트로 실제 이미지 형식을 판별합니다. (클라이언트 Content-Type 과 무관)
+    """
+    if head.startswith(b'\xff\xd8\xff'):
+        return 'image/jpeg'
+    if head.startswith(b'\x89PNG\r\n\x1a\n'):
+        return 'image/png'
+    if head[:4] == b'RIFF' and head[8:12] == b'WEBP':
+        return 'image/webp'
+    if head[4:8] == b'ftyp' and head[8:12] in (b'heic', b'heix', b'mif1', b'msf1'):
+        return 'image/heic'
+    return None
+
+def validate_image_dimensions(width: int, height: int) -> None:
+    """
+    이미지 해상도 제한을 검사합니다.
+    """
+    if width > 4096 or height > 4096:
+        raise HTTPException(
+            status_code=413,
+            detail="Image dimensions too large. Maximum size is 4096x4096 pixels"
+        )
+
 def validate_gps_coordinates(latitude: float, longitude: float) -> None:
     """
     GPS 좌표의 유효성을 검사합니다.